@@ -0,0 +1,104 @@
+"""
+    A burst of --clients concurrent password checks against a route hashing with bcrypt in the
+    password hashing pool, with and without the adaptive admission control in front of it.
+    A cheap route is called during the burst, admission control keeps its latency and the one of
+    the admitted password checks low and rejects the excess with 503 instead of queueing it
+    in the worker pool.
+
+    Usage: python -m benchmarks.bench_admission_control [--clients 200] [--workers 4] [--rounds 10]
+                                                          [--latency-target 0.5]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List, Tuple
+
+import bcrypt
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+
+from src.infrastructure.implementations.admission_control import AdaptiveConcurrencyLimiter
+from src.infrastructure.implementations.password_manager import PasswordHashingPool
+
+
+def create_app(pool: PasswordHashingPool, hashed_password: bytes,
+               limiter: AdaptiveConcurrencyLimiter | None) -> FastAPI:
+    auth = APIRouter(prefix='/auth')
+    other = APIRouter()
+
+    @auth.post('/login/')
+    async def login() -> bool:
+        return await pool.run(bcrypt.checkpw, b'password', hashed_password)
+
+    @other.get('/ping/')
+    async def ping() -> bool:
+        return True
+
+    app = FastAPI()
+    app.include_router(auth, dependencies=[Depends(limiter.admit)] if limiter else [])
+    app.include_router(other)
+    return app
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    return statistics.quantiles(latencies, n=100)[int(fraction * 100) - 1] if len(latencies) > 1 else 0.0
+
+
+async def measure(name: str, app: FastAPI, clients: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as client:
+        async def login() -> Tuple[int, float]:
+            started_at = time.perf_counter()
+            response = await client.post('/auth/login/')
+            return response.status_code, time.perf_counter() - started_at
+
+        async def ping() -> List[float]:
+            latencies = []
+            while not burst.done():
+                started_at = time.perf_counter()
+                await client.get('/ping/')
+                latencies.append(time.perf_counter() - started_at)
+                await asyncio.sleep(0.01)
+            return latencies
+
+        started_at = time.perf_counter()
+        burst = asyncio.ensure_future(asyncio.gather(*(login() for _ in range(clients))))
+        ping_latencies = await ping()
+        results = await burst
+        seconds = time.perf_counter() - started_at
+
+    admitted = [latency for status_code, latency in results if status_code == 200]
+    rejected = sum(1 for status_code, _ in results if status_code == 503)
+    print(f'{name:<20} {seconds:>6.2f} s  {len(admitted):>5} ok  {rejected:>5} rejected  '
+          f'login p50 {percentile(admitted, 0.5) * 1000:>7.0f} ms  p99 {percentile(admitted, 0.99) * 1000:>7.0f} ms  '
+          f'ping p99 {percentile(ping_latencies, 0.99) * 1000:>6.1f} ms')
+
+
+async def main(clients: int, workers: int, rounds: int, latency_target: float) -> None:
+    # Every rejection is logged as a warning, the summary lines count them
+    logging.getLogger('app').setLevel(logging.ERROR)
+    hashed_password = bcrypt.hashpw(b'password', bcrypt.gensalt(rounds))
+    print(f'{clients} concurrent logins, bcrypt with {rounds} rounds on {workers} workers')
+
+    pool = PasswordHashingPool(executor='thread', workers=workers, max_queue_size=clients)
+    await measure('no admission', create_app(pool, hashed_password, None), clients)
+
+    limiter = AdaptiveConcurrencyLimiter(name='benchmark', min_limit=1, max_limit=64, initial_limit=workers * 2,
+                                         max_queue_size=workers * 4, max_queue_wait_seconds=latency_target * 2,
+                                         latency_target_seconds=latency_target, backoff_ratio=0.9)
+    await measure('adaptive admission', create_app(pool, hashed_password, limiter), clients)
+    print(f'limit after the burst {limiter.current_limit}')
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--latency-target', type=float, default=0.5)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.clients, arguments.workers, arguments.rounds, arguments.latency_target))
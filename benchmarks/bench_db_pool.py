@@ -0,0 +1,58 @@
+"""
+    Requests/sec of the create/update endpoints with the long-lived pooled engine
+    compared to disposing the engine after every request (the previous behaviour).
+
+    Usage: python -m benchmarks.bench_db_pool [--requests 500] [--concurrency 10]
+"""
+import argparse
+import asyncio
+from typing import AsyncGenerator, List
+
+from benchmarks.common import BenchmarkResult, app_client, auth_headers, create_admin, create_schema, run_requests
+
+from src.db.database import db_helper
+from src.main import app
+
+
+async def get_session_disposing_engine() -> AsyncGenerator:
+    async with db_helper.session_factory() as session:
+        yield session
+    await db_helper.engine.dispose()
+
+
+async def run_scenario(label: str, requests: int, concurrency: int) -> List[BenchmarkResult]:
+    async with app_client() as client:
+        await create_schema()
+        headers = auth_headers(await create_admin())
+
+        async def create_task(number: int):
+            return await client.post('/task_tracker/create_task/', headers=headers, json={
+                'name': f'task {number}', 'description': 'benchmark task', 'responsible_person_id': 1,
+                'status': 'TODO', 'priority': 'Medium', 'assignees_ids': []})
+
+        async def update_task(number: int):
+            return await client.put(f'/task_tracker/update_task/{number + 1}', headers=headers,
+                                    json={'description': f'updated {number}', 'status': 'In Progress'})
+
+        return [await run_requests(f'{label}: create_task', create_task, requests, concurrency),
+                await run_requests(f'{label}: update_task', update_task, requests, concurrency)]
+
+
+async def main(requests: int, concurrency: int) -> None:
+    app.dependency_overrides[db_helper.get_session] = get_session_disposing_engine
+    before = await run_scenario('dispose per request', requests, concurrency)
+
+    app.dependency_overrides.clear()
+    after = await run_scenario('pooled engine', requests, concurrency)
+
+    for result in before + after:
+        print(result)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=10)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.requests, arguments.concurrency))
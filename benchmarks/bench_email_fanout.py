@@ -0,0 +1,96 @@
+"""
+    Throughput of sending one notification to many recipients through a local aiosmtpd server:
+    a new SMTP connection per message compared to the connection pool, with and without PIPELINING.
+
+    Usage: python -m benchmarks.bench_email_fanout [--recipients 10000] [--pool-size 10]
+"""
+import argparse
+import asyncio
+import socket
+import time
+from typing import List
+
+from aiosmtpd.controller import Controller
+
+from benchmarks.common import BenchmarkResult
+
+from src.infrastructure.implementations.email import SMTPEmailManager
+from src.infrastructure.implementations.smtp import SMTPConnection, SMTPConnectionPool
+
+
+class SinkHandler:
+
+    def __init__(self, pipelining: bool):
+        self.pipelining: bool = pipelining
+        self.messages: int = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        if self.pipelining:
+            responses.insert(-1, '250-PIPELINING')
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return '250 OK'
+
+
+def get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+async def run_scenario(name: str, recipients: int, pool_size: int,
+                       pipelining: bool, max_messages_per_connection: int) -> BenchmarkResult:
+    handler = SinkHandler(pipelining)
+    controller = Controller(handler, hostname='127.0.0.1', port=get_free_port())
+    controller.start()
+
+    pool = SMTPConnectionPool(lambda: SMTPConnection(controller.hostname, controller.port, timeout_seconds=30),
+                              size=pool_size, max_messages_per_connection=max_messages_per_connection)
+    email_manager = SMTPEmailManager('benchmark@example.com', pool, max_concurrency=pool_size)
+
+    latencies: List[float] = []
+    send_email = email_manager.send_email
+
+    async def timed_send_email(to: str, subject: str, body: str) -> None:
+        started_at = time.perf_counter()
+        await send_email(to, subject, body)
+        latencies.append(time.perf_counter() - started_at)
+
+    email_manager.send_email = timed_send_email
+    try:
+        started_at = time.perf_counter()
+        failed_receivers = await email_manager.send_emails(
+            [f'user{number}@example.com' for number in range(recipients)], 'Task Changed!', 'Task: "fan-out" updated!')
+        seconds = time.perf_counter() - started_at
+        await email_manager.close()
+    finally:
+        controller.stop()
+
+    if failed_receivers or handler.messages != recipients:
+        raise RuntimeError(f'{name}: {len(failed_receivers)} failed, {handler.messages} delivered')
+    return BenchmarkResult(f'{name} ({pool.connections_opened} connections)', recipients, seconds, latencies)
+
+
+async def main(recipients: int, pool_size: int) -> None:
+    results = [
+        await run_scenario('connection per message', recipients, pool_size,
+                           pipelining=False, max_messages_per_connection=1),
+        await run_scenario('pooled', recipients, pool_size,
+                           pipelining=False, max_messages_per_connection=recipients),
+        await run_scenario('pooled + pipelining', recipients, pool_size,
+                           pipelining=True, max_messages_per_connection=recipients),
+    ]
+    for result in results:
+        print(result)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recipients', type=int, default=10_000)
+    parser.add_argument('--pool-size', type=int, default=10)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.recipients, arguments.pool_size))
@@ -0,0 +1,93 @@
+"""
+    Throughput and memory of the streamed tasks export (/task_tracker/export_tasks/) on a seeded database,
+    in every format with and without gzip.
+
+    The resident memory is sampled after every received chunk, its growth during an export has to stay
+    flat whatever the number of tasks is.
+
+    Usage: python -m benchmarks.bench_export [--users 1000] [--tasks 200000] [--assignees-per-task 3]
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.common import app_client, auth_headers, create_admin, create_schema
+
+from src.cli.seed import seed
+from src.main import app
+
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def get_rss_megabytes() -> float:
+    """ Current resident memory, ru_maxrss only keeps the peak which seeding already pushed up """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+
+
+async def export_tasks(headers: Dict[str, str], params: Dict[str, str]) -> Tuple[int, float]:
+    """
+        Calls the app without httpx, its ASGI transport collects the whole body before returning it.
+        Returns the number of bytes received and the peak RSS growth
+    """
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'root_path': '/api/v1', 'path': '/api/v1/task_tracker/export_tasks/', 'raw_path': b'',
+             'query_string': urlencode(params).encode(), 'server': ('benchmark', 80), 'client': ('benchmark', 1),
+             'headers': [(name.lower().encode(), value.encode()) for name, value in headers.items()]}
+    rss_at_start = peak_rss = get_rss_megabytes()
+    received = 0
+    request_sent = False
+    response_finished = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await response_finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal received, peak_rss
+        if message['type'] == 'http.response.start' and message['status'] != 200:
+            raise RuntimeError(f'export failed with status {message["status"]}')
+        if message['type'] == 'http.response.body':
+            received += len(message.get('body', b''))
+            peak_rss = max(peak_rss, get_rss_megabytes())
+            if not message.get('more_body', False):
+                response_finished.set()
+
+    await app(scope, receive, send)
+    return received, peak_rss - rss_at_start
+
+
+async def run_benchmarks(users: int, tasks: int, assignees_per_task: int) -> None:
+    async with app_client():
+        await create_schema()
+        headers = auth_headers(await create_admin())
+        await seed(users, 0, tasks, assignees_per_task, ['not-a-real-hash'])
+
+        for export_format in ('ndjson', 'csv'):
+            for compressed in (False, True):
+                request_headers = {**headers, 'Accept-Encoding': 'gzip' if compressed else 'identity'}
+                started_at = time.perf_counter()
+                received, rss_growth = await export_tasks(request_headers, {'export_format': export_format})
+                seconds = time.perf_counter() - started_at
+
+                name = f'{export_format}{" gzip" if compressed else ""}'
+                print(f'{name:<12} {tasks / seconds:>10.0f} tasks/s  {received / 1024 / 1024:>8.1f} MB sent  '
+                      f'RSS growth {rss_growth:>6.1f} MB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=200_000)
+    parser.add_argument('--assignees-per-task', type=int, default=3)
+    arguments = parser.parse_args()
+
+    asyncio.run(run_benchmarks(arguments.users, arguments.tasks, arguments.assignees_per_task))
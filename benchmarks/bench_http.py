@@ -0,0 +1,135 @@
+"""
+    End-to-end latency and throughput of the register, login, create, update and delete endpoints
+    against a seeded database, driving the app in-process through the ASGI transport.
+
+    The results are written as JSON, pass a previous results file as --baseline to fail
+    (exit code 1) when a latency percentile grows or the throughput drops by more than --threshold.
+
+    Usage: python -m benchmarks.bench_http [--users 1000] [--tasks 10000] [--assignees-per-task 3]
+                                           [--requests 200] [--concurrency 10]
+                                           [--output benchmarks/results/benchmark_results.json]
+                                           [--baseline previous_results.json] [--threshold 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, UTC
+from typing import Dict, List
+
+from benchmarks.common import BenchmarkResult, app_client, auth_headers, create_admin, create_schema
+from benchmarks.common import run_requests
+
+from src.cli.seed import SeededDataset, seed
+from src.infrastructure.implementations.password_manager import PasswordManager
+
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+async def run_benchmarks(users: int, tasks: int, assignees_per_task: int,
+                         requests: int, concurrency: int) -> List[BenchmarkResult]:
+    if requests > tasks:
+        raise ValueError('--requests must not be greater than --tasks, every delete removes a seeded task')
+
+    async with app_client() as client:
+        await create_schema()
+        admin_id = await create_admin()
+        headers = auth_headers(admin_id)
+        dataset: SeededDataset = await seed(users, 0, tasks, assignees_per_task,
+                                            [PasswordManager.hash_password(BENCHMARK_PASSWORD)])
+        first_user_id, first_task_id = dataset.first_user_id, dataset.first_task_id
+
+        async def register(number: int):
+            return await client.post('/auth/register/', data={
+                'username': f'new_user_{number}', 'password': BENCHMARK_PASSWORD,
+                'email': f'new_user_{number}@example.com'})
+
+        async def login(number: int):
+            return await client.post('/auth/login/', data={
+                'username': f'user_{first_user_id + number % users}', 'password': BENCHMARK_PASSWORD})
+
+        async def create_task(number: int):
+            return await client.post('/task_tracker/create_task/', headers=headers, json={
+                'name': f'new_task_{number}', 'description': 'benchmark task', 'responsible_person_id': admin_id,
+                'status': 'TODO', 'priority': 'Medium',
+                'assignees_ids': [first_user_id + (number + offset) % users for offset in range(assignees_per_task)]})
+
+        async def update_task(number: int):
+            return await client.put(f'/task_tracker/update_task/{first_task_id + number % tasks}', headers=headers,
+                                    json={'description': f'updated {number}', 'status': 'In Progress'})
+
+        async def delete_task(number: int):
+            return await client.delete(f'/task_tracker/delete_task/{first_task_id + number}', headers=headers)
+
+        return [await run_requests(name, send_request, requests, concurrency)
+                for name, send_request in (('register', register), ('login', login), ('create_task', create_task),
+                                           ('update_task', update_task), ('delete_task', delete_task))]
+
+
+def find_regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    regressions: List[str] = []
+    for name, summary in results.items():
+        baseline_summary = baseline.get(name)
+        if not baseline_summary:
+            continue
+
+        for metric in LATENCY_METRICS:
+            if summary[metric] > baseline_summary[metric] * (1 + threshold):
+                regressions.append(f'{name}: {metric} {baseline_summary[metric]} -> {summary[metric]}')
+
+        if summary['requests_per_second'] < baseline_summary['requests_per_second'] * (1 - threshold):
+            regressions.append(f'{name}: requests_per_second {baseline_summary["requests_per_second"]} '
+                               f'-> {summary["requests_per_second"]}')
+    return regressions
+
+
+def main(arguments: argparse.Namespace) -> int:
+    benchmark_results: List[BenchmarkResult] = asyncio.run(run_benchmarks(
+        arguments.users, arguments.tasks, arguments.assignees_per_task, arguments.requests, arguments.concurrency))
+    for result in benchmark_results:
+        print(result)
+
+    results = {result.name: result.summary() for result in benchmark_results}
+    os.makedirs(os.path.dirname(arguments.output) or '.', exist_ok=True)
+    with open(arguments.output, 'w') as output_file:
+        json.dump({
+            'created_at': datetime.now(UTC).isoformat(),
+            'dataset': {'users': arguments.users, 'tasks': arguments.tasks,
+                        'assignees_per_task': arguments.assignees_per_task},
+            'load': {'requests': arguments.requests, 'concurrency': arguments.concurrency},
+            'results': results,
+        }, output_file, indent=4)
+    print(f'Results are written to {arguments.output}')
+
+    if not arguments.baseline:
+        return 0
+
+    with open(arguments.baseline) as baseline_file:
+        baseline = json.load(baseline_file)['results']
+
+    regressions = find_regressions(results, baseline, arguments.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        print(f'{len(regressions)} metrics are worse than the baseline by more than {arguments.threshold:.0%}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--assignees-per-task', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    # The results directory is ignored by git
+    parser.add_argument('--output', default='benchmarks/results/benchmark_results.json')
+    parser.add_argument('--baseline', help='results file of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative regression of every metric, 0.2 means 20%%')
+
+    sys.exit(main(parser.parse_args()))
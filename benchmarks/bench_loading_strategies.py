@@ -0,0 +1,104 @@
+"""
+    Rows returned and latency of user and task lookups for a user assigned to many tasks,
+    with the previous global `lazy='joined'` relationships compared to the per-query
+    loading strategies used by the repositories.
+
+    Usage: python -m benchmarks.bench_loading_strategies [--tasks 10000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from benchmarks.common import create_schema
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.db.database import db_helper
+from src.db.enums import UserRole
+from src.db.models import Task, TaskUser, Team, User
+from src.infrastructure.implementations.cache import NoTaskCache
+from src.repositories.task.repositories import TaskRepository
+from src.repositories.user.repositories import UserRepository
+
+
+HEAVY_USERNAME = 'heavy_user'
+
+
+async def seed(tasks: int) -> None:
+    async with db_helper.engine.begin() as connection:
+        await connection.execute(insert(Team), [{'name': 'benchmark team'}])
+        await connection.execute(insert(User), [
+            {'username': username, 'email': f'{username}@example.com', 'password': 'not-a-real-hash',
+             'role': UserRole.DEVELOPER, 'team_id': 1}
+            for username in (HEAVY_USERNAME, 'second_assignee', 'third_assignee')])
+        await connection.execute(insert(Task), [
+            {'name': f'task {number}', 'description': 'benchmark task', 'responsible_person': 1}
+            for number in range(tasks)])
+        await connection.execute(insert(TaskUser), [
+            {'task_id': task_id, 'user_id': user_id}
+            for task_id in range(1, tasks + 1) for user_id in (1, 2, 3)])
+
+
+async def count_rows(query: Select) -> int:
+    async with db_helper.engine.connect() as connection:
+        result = await connection.execute(query)
+        return len(result.all())
+
+
+async def measure(name: str, rows: int, lookup: Callable[[AsyncSession], Awaitable], repeat: int) -> None:
+    latencies = []
+    for _ in range(repeat):
+        async with db_helper.session_factory() as session:
+            started_at = time.perf_counter()
+            await lookup(session)
+            latencies.append(time.perf_counter() - started_at)
+    print(f'{name:<45} {rows:>8} rows  median {statistics.median(latencies) * 1000:>9.2f} ms')
+
+
+async def main(tasks: int, repeat: int) -> None:
+    db_helper.connect()
+    await create_schema()
+    await seed(tasks)
+
+    # The options below reproduce what the global lazy='joined' relationships emitted
+    eager_user_query = select(User).filter_by(username=HEAVY_USERNAME).options(
+        joinedload(User.team), joinedload(User.tasks).joinedload(Task.assignees))
+    eager_task_query = select(Task).filter_by(id=1).options(
+        joinedload(Task.assignees).joinedload(User.tasks), joinedload(Task.assignees).joinedload(User.team))
+
+    async def eager_user_lookup(session):
+        return (await session.execute(eager_user_query)).unique().scalars().first()
+
+    async def eager_task_lookup(session):
+        return (await session.execute(eager_task_query)).unique().scalars().first()
+
+    async def user_lookup(session):
+        return await UserRepository(session).get_user_model_by(username=HEAVY_USERNAME)
+
+    async def task_lookup(session):
+        return await TaskRepository(session, NoTaskCache()).get_task_by({'id': 1})
+
+    user_query = select(User).filter_by(username=HEAVY_USERNAME)
+    task_rows = await count_rows(select(Task).filter_by(id=1)) + await count_rows(
+        select(TaskUser).filter_by(task_id=1))
+
+    print(f'user assigned to {tasks} tasks, {repeat} lookups each')
+    await measure('user by username, lazy=joined', await count_rows(eager_user_query), eager_user_lookup, repeat)
+    await measure('user by username, raiseload', await count_rows(user_query), user_lookup, repeat)
+    await measure('task with assignees, lazy=joined', await count_rows(eager_task_query), eager_task_lookup, repeat)
+    await measure('task with assignees, selectinload', task_rows, task_lookup, repeat)
+
+    await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.tasks, arguments.repeat))
@@ -0,0 +1,94 @@
+"""
+    Per-request cost of the DEBUG logs on the update_task path (current_user, the service and the repository):
+    logging disabled, a file handler writing from the event loop, and the same handler behind
+    the QueueHandler/QueueListener pipeline with text and JSON output.
+    Also compares an eager f-string debug call to a lazy %s one when DEBUG is disabled.
+
+    Usage: python -m benchmarks.bench_logging [--requests 1000] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import timeit
+from typing import List, Optional
+
+from benchmarks.common import BENCHMARK_DIR, BenchmarkResult, app_client, auth_headers, create_admin, create_schema
+from benchmarks.common import run_requests
+
+from src.cli.seed import seed
+from src.config import settings
+from src.infrastructure.implementations.logging_queue import JSONFormatter, queue_logging
+
+
+DETAILED_FORMAT = '[%(levelname)s|%(module)s|L%(lineno)d] %(asctime)s: %(message)s'
+
+
+def configure_app_logger(level: int, formatter: Optional[logging.Formatter]) -> None:
+    logger = logging.getLogger('app')
+    logger.setLevel(level)
+    logger.handlers = []
+    if formatter:
+        handler = logging.FileHandler(os.path.join(BENCHMARK_DIR, 'app.log'))
+        handler.setFormatter(formatter)
+        logger.handlers = [handler]
+
+
+async def run_scenario(name: str, requests: int, concurrency: int, level: int,
+                       formatter: Optional[logging.Formatter], use_queue: bool) -> BenchmarkResult:
+    configure_app_logger(level, formatter)
+    if use_queue:
+        queue_logging.start(['app'])
+
+    try:
+        async with app_client() as client:
+            await create_schema()
+            headers = auth_headers(await create_admin())
+            dataset = await seed(users=10, teams=0, tasks=requests, assignees_per_task=0,
+                                 password_hashes=['not-a-real-hash'])
+
+            async def update_task(number: int):
+                return await client.put(f'/task_tracker/update_task/{dataset.first_task_id + number}',
+                                        headers=headers, json={'description': f'updated {number}'})
+
+            return await run_requests(name, update_task, requests, concurrency)
+    finally:
+        queue_logging.stop()
+
+
+def compare_disabled_calls() -> None:
+    logger = logging.getLogger('app')
+    logger.setLevel(logging.INFO)
+    data_for_update = {'description': 'updated', 'status': 'In Progress', 'priority': 'High'}
+    calls = 100_000
+
+    eager = timeit.timeit(lambda: logger.debug(f'data_for_update = {data_for_update}'), number=calls)
+    lazy = timeit.timeit(lambda: logger.debug('data_for_update = %s', data_for_update), number=calls)
+    print(f'{"disabled debug, eager f-string":<40} {eager / calls * 1e9:>10.0f} ns/call')
+    print(f'{"disabled debug, lazy %s":<40} {lazy / calls * 1e9:>10.0f} ns/call')
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # The benchmark sets up the queue itself instead of the application lifespan
+    settings.global_settings.log_queue = False
+    detailed = logging.Formatter(DETAILED_FORMAT)
+
+    results: List[BenchmarkResult] = [
+        await run_scenario('logging disabled (WARNING)', requests, concurrency, logging.WARNING, None, False),
+        await run_scenario('DEBUG, file handler on the loop', requests, concurrency, logging.DEBUG, detailed, False),
+        await run_scenario('DEBUG, queue + file handler', requests, concurrency, logging.DEBUG, detailed, True),
+        await run_scenario('DEBUG, queue + JSON file handler', requests, concurrency,
+                           logging.DEBUG, JSONFormatter(), True),
+    ]
+    for result in results:
+        print(result)
+    compare_disabled_calls()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.requests, arguments.concurrency))
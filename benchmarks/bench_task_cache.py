@@ -0,0 +1,90 @@
+"""
+    Task lookups by id and by name through `TaskRepository.get_task_by`, each in its own session
+    like a request, with the in-process LRU task cache compared to the uncached path.
+    The lookups pick tasks at random among the first --hot tasks, a --cache-size smaller
+    than --hot shows the evictions of a bounded cache.
+
+    Usage: python -m benchmarks.bench_task_cache [--tasks 10000] [--hot 1000] [--cache-size 10000]
+                                                   [--max-mb 32] [--lookups 5000]
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Tuple
+
+from benchmarks.common import create_schema
+
+from sqlalchemy import insert
+
+from src.db.database import db_helper
+from src.db.enums import UserRole
+from src.db.models import Task, TaskUser, User
+from src.infrastructure.implementations.cache import LRUTaskCache, NoTaskCache
+from src.repositories.task.repositories import TaskRepository
+from src.services.task_tracker.interfaces import AbstractTaskCache
+
+
+ASSIGNEES_PER_TASK = 3
+
+
+async def seed(tasks: int) -> None:
+    async with db_helper.engine.begin() as connection:
+        await connection.execute(insert(User), [
+            {'username': f'user {number}', 'email': f'user{number}@example.com', 'password': 'not-a-real-hash',
+             'role': UserRole.DEVELOPER} for number in range(ASSIGNEES_PER_TASK)])
+        await connection.execute(insert(Task), [
+            {'name': f'task {number}', 'description': 'benchmark task ' * 10, 'responsible_person': 1}
+            for number in range(1, tasks + 1)])
+        await connection.execute(insert(TaskUser), [
+            {'task_id': task_id, 'user_id': user_id}
+            for task_id in range(1, tasks + 1) for user_id in range(1, ASSIGNEES_PER_TASK + 1)])
+
+
+async def measure(name: str, cache: AbstractTaskCache, lookups: List[Tuple[str, object]]) -> float:
+    started_at = time.perf_counter()
+    for column, value in lookups:
+        async with db_helper.session_factory() as session:
+            task = await TaskRepository(session, cache).get_task_by({column: value})
+            assert task is not None
+    seconds = time.perf_counter() - started_at
+
+    stats = cache.stats()
+    lookups_per_second = len(lookups) / seconds
+    print(f'{name:<12} {lookups_per_second:>9.0f} lookups/s  by id: {stats.by_id.hits:>6} hits '
+          f'{stats.by_id.misses:>6} misses {stats.by_id.evictions:>6} evictions  '
+          f'by name: {stats.by_name.hits:>6} hits  cached {stats.by_id.size:>6} tasks '
+          f'{stats.by_id.weight / 1024 / 1024:>6.2f} MB')
+    return lookups_per_second
+
+
+async def main(tasks: int, hot: int, cache_size: int, max_mb: float, lookups_count: int) -> None:
+    db_helper.connect()
+    await create_schema()
+    await seed(tasks)
+
+    randomizer = random.Random(0)
+    lookups: List[Tuple[str, object]] = []
+    for _ in range(lookups_count):
+        task_id = randomizer.randint(1, hot)
+        lookups.append(('id', task_id) if randomizer.random() < 0.5 else ('name', f'task {task_id}'))
+
+    print(f'{tasks} tasks with {ASSIGNEES_PER_TASK} assignees, {lookups_count} lookups among {hot} tasks')
+    uncached = await measure('uncached', NoTaskCache(), lookups)
+    cached = await measure('lru cache', LRUTaskCache(cache_size, ttl_seconds=60,
+                                                    max_bytes=int(max_mb * 1024 * 1024)), lookups)
+    print(f'speedup x{cached / uncached:.1f}')
+
+    await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--hot', type=int, default=1000)
+    parser.add_argument('--cache-size', type=int, default=10_000)
+    parser.add_argument('--max-mb', type=float, default=32)
+    parser.add_argument('--lookups', type=int, default=5000)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.tasks, arguments.hot, arguments.cache_size, arguments.max_mb, arguments.lookups))
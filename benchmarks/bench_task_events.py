@@ -0,0 +1,138 @@
+"""
+    Delivery of task events (/task_tracker/events/) to many connected clients.
+
+    Every client is assigned to its own task and keeps one Server-Sent Events connection open while
+    the tasks are updated through the API. Prints the delivery latency of the events, then the cost of
+    the polling requests (/task_tracker/tasks/?assignee_id=) the open connections replace.
+
+    Usage: python -m benchmarks.bench_task_events [--clients 200] [--updates 1000] [--poll-interval 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.common import app_client, auth_headers, create_admin, create_schema, run_requests
+
+from sqlalchemy import insert
+
+from src.db.database import db_helper
+from src.db.enums import UserRole
+from src.db.models import Task, TaskUser, User
+from src.main import app
+
+
+class EventsClient:
+    """ Keeps an events stream open by calling the app without httpx, its ASGI transport buffers the body """
+
+    def __init__(self, headers: Dict[str, str], sent_at: Dict[Tuple[int, int], float]):
+        self.headers: Dict[str, str] = headers
+        self.sent_at: Dict[Tuple[int, int], float] = sent_at
+        self.latencies: List[float] = []
+        self.resyncs: int = 0
+        self.connected: asyncio.Event = asyncio.Event()
+        self.disconnected: asyncio.Event = asyncio.Event()
+
+    async def run(self) -> None:
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                 'scheme': 'http', 'root_path': '/api/v1', 'path': '/api/v1/task_tracker/events/', 'raw_path': b'',
+                 'query_string': b'', 'server': ('benchmark', 80), 'client': ('benchmark', 1),
+                 'headers': [(name.lower().encode(), value.encode()) for name, value in self.headers.items()]}
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await self.disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start' and message['status'] != 200:
+                raise RuntimeError(f'events stream failed with status {message["status"]}')
+            if message['type'] == 'http.response.body':
+                self.receive_chunk(message.get('body', b'').decode())
+
+        await app(scope, receive, send)
+
+    def receive_chunk(self, chunk: str) -> None:
+        received_at = time.perf_counter()
+        if chunk.startswith('retry:'):
+            self.connected.set()
+        for line in chunk.splitlines():
+            if line == 'event: resync':
+                self.resyncs += 1
+            elif line.startswith('data:'):
+                data = json.loads(line.removeprefix('data:'))
+                if 'version' in data:
+                    self.latencies.append(received_at - self.sent_at[data['task_id'], data['version']])
+
+
+async def seed(clients: int, admin_id: int) -> List[int]:
+    async with db_helper.engine.begin() as connection:
+        result = await connection.execute(insert(User).returning(User.id), [
+            {'username': f'client {number}', 'email': f'client{number}@example.com',
+             'password': 'not-a-real-hash', 'role': UserRole.DEVELOPER} for number in range(clients)])
+        users_ids: List[int] = list(result.scalars())
+        result = await connection.execute(insert(Task).returning(Task.id), [
+            {'name': f'task {number}', 'description': 'benchmark task', 'responsible_person': admin_id}
+            for number in range(clients)])
+        tasks_ids: List[int] = list(result.scalars())
+        await connection.execute(insert(TaskUser), [{'task_id': task_id, 'user_id': user_id}
+                                                    for task_id, user_id in zip(tasks_ids, users_ids)])
+    return users_ids
+
+
+async def run_benchmark(clients_count: int, updates: int, poll_interval: float) -> None:
+    async with app_client() as client:
+        await create_schema()
+        admin_id: int = await create_admin()
+        admin_headers = auth_headers(admin_id)
+        users_ids: List[int] = await seed(clients_count, admin_id)
+
+        # Every task gets updated updates / clients times, its version tells which update an event is about
+        sent_at: Dict[Tuple[int, int], float] = {}
+        clients = [EventsClient(auth_headers(user_id), sent_at) for user_id in users_ids]
+        streams = [asyncio.create_task(events_client.run()) for events_client in clients]
+        await asyncio.gather(*(events_client.connected.wait() for events_client in clients))
+
+        async def update_task(request_number: int):
+            task_id = request_number % clients_count + 1
+            sent_at[task_id, request_number // clients_count + 2] = time.perf_counter()
+            return await client.put(f'/task_tracker/update_task/{task_id}', headers=admin_headers,
+                                    json={'description': f'update {request_number}'})
+
+        updates_result = await run_requests('update_task', update_task, updates, concurrency=1)
+        await asyncio.sleep(0.1)
+        for events_client in clients:
+            events_client.disconnected.set()
+        await asyncio.gather(*streams)
+
+        latencies: List[float] = [latency for events_client in clients for latency in events_client.latencies]
+        print(f'{clients_count} clients connected, {updates} updates at {updates_result.requests_per_second:.0f}/s')
+        print(f'events delivered {len(latencies)}  resyncs {sum(c.resyncs for c in clients)}  '
+              f'latency p50 {statistics.median(latencies) * 1000:.2f} ms  '
+              f'max {max(latencies) * 1000:.2f} ms')
+
+        async def poll_tasks(request_number: int):
+            return await client.get('/task_tracker/tasks/', headers=clients[request_number % clients_count].headers,
+                                    params={'assignee_id': users_ids[request_number % clients_count]})
+
+        polls_result = await run_requests('poll tasks', poll_tasks, clients_count * 5, concurrency=10)
+        polls_per_minute = clients_count * 60 / poll_interval
+        print(f'polling instead: {polls_per_minute:.0f} requests/min at one per {poll_interval:g} s per client, '
+              f'{polls_result.requests_per_second:.0f} polls/s served, '
+              f'{polls_per_minute / 60 / polls_result.requests_per_second * 100:.0f}% of the server time')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--poll-interval', type=float, default=5)
+    arguments = parser.parse_args()
+
+    asyncio.run(run_benchmark(arguments.clients, arguments.updates, arguments.poll_interval))
@@ -0,0 +1,82 @@
+"""
+    Dashboard numbers of tasks by status, priority, responsible person and assignee, counted with
+    GROUP BY over task / task_user compared to reading the task counters, as the tables grow.
+    A database is seeded for each of --tasks in turn, then the counters are rebuilt (the time of the rebuild
+    is printed too) and both ways are checked to give the same numbers.
+
+    Usage: python -m benchmarks.bench_task_stats [--tasks 10000 100000 300000] [--users 1000]
+                                                 [--assignees-per-task 3] [--reads 20]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from benchmarks.common import create_schema
+
+from sqlalchemy import select, func
+
+from src.cli.rebuild_task_counters import rebuild_task_counters
+from src.cli.seed import seed
+from src.db.database import db_helper
+from src.db.models import Task, TaskUser
+from src.repositories.task.repositories import TaskRepository
+from src.services.task_tracker.dto import TaskStats
+
+
+async def count_with_group_by() -> TaskStats:
+    async with db_helper.session_factory() as session:
+        task_stats = TaskStats(total=await session.scalar(select(func.count()).select_from(Task)))
+        for status, count in await session.execute(select(Task.status, func.count()).group_by(Task.status)):
+            task_stats.by_status[status] = count
+        for priority, count in await session.execute(select(Task.priority, func.count()).group_by(Task.priority)):
+            task_stats.by_priority[priority] = count
+        for user_id, count in await session.execute(
+                select(Task.responsible_person, func.count()).group_by(Task.responsible_person)):
+            task_stats.by_responsible_person[user_id] = count
+        for user_id, count in await session.execute(
+                select(TaskUser.user_id, func.count()).group_by(TaskUser.user_id)):
+            task_stats.by_assignee[user_id] = count
+        return task_stats
+
+
+async def read_counters() -> TaskStats:
+    async with db_helper.session_factory() as session:
+        return await TaskRepository(session).get_task_stats()
+
+
+async def measure(read_stats: Callable[[], Awaitable[TaskStats]], reads: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(reads):
+        await read_stats()
+    return (time.perf_counter() - started_at) / reads * 1000
+
+
+async def main(tasks_sizes: List[int], users: int, assignees_per_task: int, reads: int) -> None:
+    db_helper.connect()
+
+    for tasks in sorted(tasks_sizes):
+        await create_schema()
+        await seed(users, 1, tasks, assignees_per_task, ['not-a-real-hash'], chunk_size=50_000)
+
+        started_at = time.perf_counter()
+        await rebuild_task_counters()
+        rebuild_seconds = time.perf_counter() - started_at
+        assert await read_counters() == await count_with_group_by()
+
+        group_by_ms, counters_ms = await measure(count_with_group_by, reads), await measure(read_counters, reads)
+        print(f'{tasks:>9} tasks  group by {group_by_ms:>9.2f} ms  counters {counters_ms:>6.2f} ms  '
+              f'x{group_by_ms / counters_ms:>7.1f}  rebuild {rebuild_seconds:>6.2f} s')
+
+    await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, nargs='+', default=[10_000, 100_000, 300_000])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--assignees-per-task', type=int, default=3)
+    parser.add_argument('--reads', type=int, default=20)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.tasks, arguments.users, arguments.assignees_per_task, arguments.reads))
@@ -0,0 +1,108 @@
+"""
+    Shared helpers for the benchmarks.
+
+    Importing this module points the application at a throwaway SQLite database,
+    so it has to be imported before anything from `src`.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+BENCHMARK_DIR = tempfile.mkdtemp(prefix='task_tracker_benchmark_')
+os.environ['DB_NAME'] = os.path.join(BENCHMARK_DIR, 'benchmark.db')
+
+import httpx
+from sqlalchemy import insert
+
+from src.db.database import db_helper
+from src.db.enums import UserRole
+from src.db.models import Base, User
+from src.infrastructure.dto import CredentialsToEncodeToken, TokenPayload
+from src.infrastructure.implementations.jwt_manager import JWTManager, TokenType
+from src.main import app
+
+logging.getLogger('app').setLevel(logging.WARNING)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    requests: int
+    seconds: float
+    latencies: List[float]
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds
+
+    def percentile(self, percent: int) -> float:
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[percent - 1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'requests': self.requests,
+            'requests_per_second': round(self.requests_per_second, 2),
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p95_ms': round(self.percentile(95) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+        }
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        return (f'{self.name:<40} {summary["requests_per_second"]:>10.1f} req/s  '
+                f'p50 {summary["p50_ms"]:>8.2f} ms  p95 {summary["p95_ms"]:>8.2f} ms  '
+                f'p99 {summary["p99_ms"]:>8.2f} ms')
+
+
+async def create_schema() -> None:
+    async with db_helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+async def create_admin(username: str = 'benchmark_admin') -> int:
+    async with db_helper.engine.begin() as connection:
+        result = await connection.execute(insert(User).returning(User.id),
+                                          [{'username': username, 'email': f'{username}@example.com',
+                                            'password': 'not-a-real-hash', 'role': UserRole.ADMIN}])
+        return result.scalar_one()
+
+
+def auth_headers(user_id: int) -> Dict[str, str]:
+    token = JWTManager.encode_token(CredentialsToEncodeToken(
+        payload=TokenPayload(sub=user_id, type=TokenType.ACCESS.value), expire_minutes=60))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@asynccontextmanager
+async def app_client() -> AsyncIterator[httpx.AsyncClient]:
+    """ Runs the application lifespan and yields a client talking to it in-process """
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark/api/v1') as client:
+            yield client
+
+
+async def run_requests(name: str, send_request: Callable[[int], Awaitable[httpx.Response]],
+                       requests: int, concurrency: int) -> BenchmarkResult:
+    """ Calls send_request(0..requests-1) from `concurrency` workers and records every latency """
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for request_number in counter:
+            started_at = time.perf_counter()
+            response = await send_request(request_number)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name}: {response.status_code} {response.text}')
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return BenchmarkResult(name, requests, time.perf_counter() - started_at, latencies)
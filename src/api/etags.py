@@ -0,0 +1,19 @@
+import re
+from typing import List, Optional
+
+
+ETAG_PATTERN = re.compile(r'(W/)?"(\d+)"')
+
+
+def format_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_etags(header: Optional[str], weak: bool = False) -> Optional[List[int]]:
+    """
+        Versions listed in an If-Match / If-None-Match header, None when there is no condition (no header or *).
+        If-Match uses the strong comparison, so weak tags (W/"3") only count with weak=True
+    """
+    if header is None or header.strip() == '*':
+        return None
+    return [int(version) for weak_prefix, version in ETAG_PATTERN.findall(header) if weak or not weak_prefix]
@@ -0,0 +1,80 @@
+import logging
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.db.database import QueryCounter, count_queries
+from src.infrastructure.implementations.metrics import http_request_duration_seconds, http_requests_in_flight
+
+
+logger = logging.getLogger('app')
+
+
+class MetricsMiddleware:
+    """
+        Pure ASGI middleware recording the in-flight requests and the latency of every route.
+        An event stream stays open for as long as the client listens, its latency is the time to the first byte
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope['method']
+        status_code: int = 500
+        first_byte_at: Optional[float] = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, first_byte_at
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                if is_event_stream(message):
+                    first_byte_at = time.perf_counter()
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope, its path template keeps the label cardinality low
+            route = scope.get('route')
+            http_request_duration_seconds.labels(method, route.path if route else 'unmatched', str(status_code)) \
+                .observe((first_byte_at or time.perf_counter()) - started_at)
+
+
+def is_event_stream(response_start: Message) -> bool:
+    return any(name.lower() == b'content-type' and value.startswith(b'text/event-stream')
+               for name, value in response_start.get('headers', ()))
+
+
+class QueryCounterMiddleware:
+    """ Counts the SQL statements of every request, logs (or raises on) a blown budget and repeated statements """
+
+    def __init__(self, app: ASGIApp, budget: int, repeated_statement_threshold: int, raise_on_violation: bool = False):
+        self.app: ASGIApp = app
+        self.budget: int = budget
+        self.repeated_statement_threshold: int = repeated_statement_threshold
+        self.raise_on_violation: bool = raise_on_violation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        query_counter = QueryCounter(self.budget, self.repeated_statement_threshold, self.raise_on_violation)
+        with count_queries(query_counter):
+            await self.app(scope, receive, send)
+
+        violations = query_counter.get_violations()
+        if violations:
+            route = scope.get('route')
+            logger.warning('%s %s exceeded the query budget: %s', scope['method'],
+                           route.path if route else scope['path'], '; '.join(violations))
@@ -19,7 +19,7 @@ logger = logging.getLogger('app')
 @auth.post('/register/', response_model=RegisteredUser)
 async def register_user(user_repository: UserRepositoryDep, user_register_form: UserRegisterFormDep) -> RegisteredUser:
     logger.debug('def register_user')
-    logger.debug(f'user_register_form = {user_register_form}')
+    logger.debug('user_register_form = %s', user_register_form)
 
     register_service: RegisterService = RegisterService(user_repository,
                                                         user_register_form,
@@ -27,18 +27,18 @@ async def register_user(user_repository: UserRepositoryDep, user_register_form:
                                                         )
     registered_user: RegisteredUser = await register_service.register()
 
-    logger.debug(f'registered_user = {registered_user}')
+    logger.debug('registered_user = %s', registered_user)
     return registered_user
 
 @auth.post('/login/', response_model=JWTTokens)
 async def auth_user(user_repository: UserRepositoryDep, user_login_form: UserLoginFormDep) -> JWTTokens:
     logger.debug('def auth_user')
-    logger.debug(f'user_login_form = {user_login_form}')
+    logger.debug('user_login_form = %s', user_login_form)
 
     login_service: LoginService = LoginService(user_repository,
                                                user_login_form,
                                                JWTManager(), PasswordManager())
     tokens: JWTTokens = await login_service.login()
 
-    logger.debug(f'token value = {tokens.__dict__}')
+    logger.debug('token value = %s', tokens)
     return tokens
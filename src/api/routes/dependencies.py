@@ -3,12 +3,13 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.domain.auth.entities import UserBase
 from src.exceptions import get_exception_404_not_found_with_detail
 from src.infrastructure.dto import CredentialsToDecodeToken, TokenPayload
 from src.infrastructure.implementations.jwt_manager import JWTManager
+from src.infrastructure.implementations.cache import user_cache
 
 from src.db.database import db_helper
 from src.repositories.user.repositories import UserRepository
@@ -27,6 +28,14 @@ def get_user_repository(session: SessionDep) -> UserRepository:
 UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
 
 
+def get_session_factory() -> async_sessionmaker:
+    """ For streamed responses, the request session is closed before the response body is sent """
+    return db_helper.session_factory
+
+
+SessionFactoryDep = Annotated[async_sessionmaker, Depends(get_session_factory)]
+
+
 async def validate_token(token: TokenDep) -> TokenPayload | HTTPException:
 
     token_payload: TokenPayload = JWTManager.decode_token(CredentialsToDecodeToken(encoded_token=token))
@@ -40,12 +49,16 @@ ValidateToken = Annotated[TokenPayload, Depends(validate_token)]
 async def current_user(validated_token: ValidateToken, user_repository: UserRepositoryDep) -> UserBase | HTTPException:
     user_id = validated_token.sub
     logger.debug('def current_user')
-    logger.debug(f'user_id = {user_id}')
-    try:
-        user: UserBase = await user_repository.get_user_by(id=user_id)
-    except Exception as e:
-        logger.error(e)
-    logger.debug(f'user = {user}')
+    logger.debug('user_id = %s', user_id)
+    user: UserBase | None = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = await user_repository.get_user_by(id=user_id)
+        except Exception as e:
+            logger.error(e)
+        if user:
+            user_cache.set(user_id, user)
+    logger.debug('user = %s', user)
 
     if not user:
         return get_exception_404_not_found_with_detail('User not found')
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.infrastructure.implementations.metrics import metrics_registry
+
+
+metrics = APIRouter()
+
+
+@metrics.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics_registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
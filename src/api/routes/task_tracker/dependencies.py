@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 
 from src.repositories.task.repositories import TaskRepository
+from src.repositories.notification.repositories import NotificationRepository
 from src.api.routes.dependencies import SessionDep
 
 
@@ -10,4 +11,9 @@ def get_task_repository(session: SessionDep) -> TaskRepository:
     return TaskRepository(session)
 
 
+def get_notification_repository(session: SessionDep) -> NotificationRepository:
+    return NotificationRepository(session)
+
+
 TaskRepositoryDep = Annotated[TaskRepository, Depends(get_task_repository)]
+NotificationRepositoryDep = Annotated[NotificationRepository, Depends(get_notification_repository)]
@@ -1,9 +1,11 @@
 from typing import Optional, List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.db.enums import TaskStatus, TaskPriority
 from src.services.task_tracker.interfaces import AbstractAPICreateTask, AbstractAPIUpdateTask
+from src.services.task_tracker.interfaces import AbstractAPIBulkCreateTasks, AbstractAPIBulkUpdateTasks
+from src.services.task_tracker.dto import TaskFilter
 
 
 class APICreateTask(BaseModel, AbstractAPICreateTask):
@@ -15,6 +17,10 @@ class APICreateTask(BaseModel, AbstractAPICreateTask):
     assignees_ids: List[int]
 
 
+class APIBulkCreateTasks(BaseModel, AbstractAPIBulkCreateTasks):
+    tasks: List[APICreateTask] = Field(min_length=1, max_length=5000)
+
+
 class APIUpdateTask(BaseModel, AbstractAPIUpdateTask):
     model_config = ConfigDict(arbitrary_types_allowed=True, extra='forbid')
 
@@ -24,3 +30,13 @@ class APIUpdateTask(BaseModel, AbstractAPIUpdateTask):
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
     assignees_ids: Optional[List[int]] = None
+
+
+class APIBulkUpdateTasks(BaseModel, AbstractAPIBulkUpdateTasks):
+    model_config = ConfigDict(extra='forbid')
+
+    tasks_ids: Optional[List[int]] = Field(default=None, max_length=5000)
+    filter: Optional[TaskFilter] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    responsible_person_id: Optional[int] = None
@@ -1,81 +1,247 @@
+import io
 import logging
-from typing import Sequence
+from typing import Optional, AsyncIterator, List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Header, UploadFile, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import User
+from src.db.enums import TaskStatus, TaskPriority
 from src.api.routes.task_tracker.dto import APIUpdateTask
-from src.services.task_tracker.dto import CreatedTask, UpdatedTask, DeletedTask, CreateTask
-from src.infrastructure.implementations.email import EmailManager
+from src.services.task_tracker.dto import CreatedTask, UpdatedTask, DeletedTask
+from src.services.task_tracker.dto import TaskFilter, TasksPage, BulkCreatedTasks, BulkUpdatedTasks, TasksFileFormat
+from src.services.task_tracker.dto import ImportedTasks, ListedTask, TasksChanges, TaskStats, NotModifiedTask
 
 from src.services.task_tracker.services import CreateTaskService, UpdateTaskService, DeleteTaskService
-
-
-from src.api.routes.task_tracker.dependencies import TaskRepositoryDep
-from src.api.routes.dependencies import CurrentUser, UserRepositoryDep
-from src.api.routes.task_tracker.dto import APICreateTask
+from src.services.task_tracker.services import ListTasksService, BulkCreateTaskService, BulkUpdateTaskService
+from src.services.task_tracker.services import ExportTasksService, ImportTasksService, GetTaskService
+from src.services.task_tracker.services import StreamTaskEventsService, SyncTasksService, GetTaskStatsService
+from src.services.task_tracker.services import ListMyTasksService
+
+
+from src.api.routes.task_tracker.dependencies import TaskRepositoryDep, NotificationRepositoryDep
+from src.api.routes.dependencies import CurrentUser, UserRepositoryDep, SessionFactoryDep
+from src.api.streaming import accepts_gzip, gzip_stream, stream_in_session
+from src.api.etags import format_etag, parse_etags
+from src.repositories.task.repositories import TaskRepository
+from src.infrastructure.implementations.task_events import task_events_broker
+from src.config import settings
+from src.db.database import uncounted_queries
+from src.api.routes.task_tracker.dto import APICreateTask, APIBulkCreateTasks, APIBulkUpdateTasks
 
 task_tracker = APIRouter(prefix='/task_tracker')
 logger = logging.getLogger('app')
 
+EXPORT_MEDIA_TYPES = {TasksFileFormat.NDJSON: 'application/x-ndjson', TasksFileFormat.CSV: 'text/csv'}
+
+
+@task_tracker.get('/tasks/', response_model=TasksPage,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'Tasks are ordered by the names of priority and status (alphabetical: HIGH, LOW, '
+                              'MEDIUM and DONE, IN_PROGRESS, TODO), then by id. '
+                              'Pass next_cursor of the previous page as cursor to get the next one')
+async def list_tasks(current_user: CurrentUser, task_repository: TaskRepositoryDep,
+                     status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                     responsible_person_id: Optional[int] = None, assignee_id: Optional[int] = None,
+                     cursor: Optional[str] = None, limit: int = Query(default=50, ge=1, le=500)) -> TasksPage:
+
+    task_filter = TaskFilter(status=status, priority=priority,
+                             responsible_person_id=responsible_person_id, assignee_id=assignee_id)
+    list_tasks_service = ListTasksService(current_user, task_repository, task_filter, cursor, limit)
+    tasks_page: TasksPage = await list_tasks_service.list_tasks()
+
+    return tasks_page
+
+
+@task_tracker.get('/my_tasks/', response_model=TasksPage,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'The tasks the current user is responsible for or assigned to in id order. '
+                              'Pass next_cursor of the previous page as cursor to get the next one')
+async def list_my_tasks(current_user: CurrentUser, task_repository: TaskRepositoryDep,
+                        cursor: Optional[str] = None, limit: int = Query(default=50, ge=1, le=500)) -> TasksPage:
+
+    list_my_tasks_service = ListMyTasksService(current_user, task_repository, cursor, limit)
+    tasks_page: TasksPage = await list_my_tasks_service.list_my_tasks()
+
+    return tasks_page
+
+
+@task_tracker.get('/sync/', response_model=TasksChanges,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'The tasks created, updated or deleted after the cursor, oldest change first. '
+                              'Start without a cursor, then send next_cursor of the previous response, '
+                              'ask again right away while has_more is true')
+async def sync_tasks(current_user: CurrentUser, task_repository: TaskRepositoryDep,
+                     cursor: Optional[str] = None, limit: int = Query(default=500, ge=1, le=5000)) -> TasksChanges:
+
+    sync_tasks_service = SyncTasksService(current_user, task_repository, cursor, limit)
+    tasks_changes: TasksChanges = await sync_tasks_service.sync_tasks()
+
+    return tasks_changes
+
+
+@task_tracker.get('/stats/', response_model=TaskStats,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'Numbers of tasks by status, priority, responsible person and assignee, '
+                              'with user_id the people counters only contain this user')
+async def get_task_stats(current_user: CurrentUser, task_repository: TaskRepositoryDep,
+                         user_id: Optional[int] = None) -> TaskStats:
+
+    get_task_stats_service = GetTaskStatsService(current_user, task_repository, user_id)
+    task_stats: TaskStats = await get_task_stats_service.get_task_stats()
+
+    return task_stats
+
+
+@task_tracker.get('/tasks/{task_id}', response_model=ListedTask,
+                  responses={304: {'description': 'The version from If-None-Match is the current one'}},
+                  description='Allowed user roles: all roles except GUEST. '
+                              'The ETag of the response is the version of the task, send it back as If-None-Match '
+                              'to get 304 without a body when the task is unchanged, or as If-Match of an update')
+async def get_task(task_id: int, current_user: CurrentUser, task_repository: TaskRepositoryDep, response: Response,
+                   if_none_match: Optional[str] = Header(default=None)):
+
+    known_versions: Optional[List[int]] = parse_etags(if_none_match, weak=True)
+    known_any_version: bool = if_none_match is not None and if_none_match.strip() == '*'
+    get_task_service = GetTaskService(current_user, task_repository, task_id, known_versions, known_any_version)
+    task: ListedTask | NotModifiedTask = await get_task_service.get_task()
+    if isinstance(task, NotModifiedTask):
+        return Response(status_code=304, headers={'ETag': format_etag(task.version)})
+
+    response.headers['ETag'] = format_etag(task.version)
+    return task
+
+
+@task_tracker.get('/export_tasks/', response_class=StreamingResponse,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'Streams all tasks matching the filter as NDJSON or CSV, '
+                              'gzip compressed when the client sends Accept-Encoding: gzip')
+async def export_tasks(current_user: CurrentUser, session_factory: SessionFactoryDep,
+                       export_format: TasksFileFormat = TasksFileFormat.NDJSON,
+                       status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                       responsible_person_id: Optional[int] = None, assignee_id: Optional[int] = None,
+                       accept_encoding: str = Header(default='')) -> StreamingResponse:
+
+    task_filter = TaskFilter(status=status, priority=priority,
+                             responsible_person_id=responsible_person_id, assignee_id=assignee_id)
+    session: AsyncSession = session_factory()
+    export_tasks_service = ExportTasksService(current_user, TaskRepository(session), task_filter, export_format)
+    content: AsyncIterator[bytes] = stream_in_session(session, export_tasks_service.export_tasks())
+
+    headers = {'Content-Disposition': f'attachment; filename="tasks.{export_format.value}"',
+               'Vary': 'Accept-Encoding'}
+    if accepts_gzip(accept_encoding):
+        content = gzip_stream(content)
+        headers['Content-Encoding'] = 'gzip'
+
+    return StreamingResponse(content, media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
+
+
+@task_tracker.get('/events/', response_class=StreamingResponse,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'Server-Sent Events with the id, name and version of the tasks you are responsible '
+                              'for or assigned to, each time one is created, updated or deleted. A resync event '
+                              'means events were missed (slow connection or reconnect), reload the tasks then')
+async def stream_task_events(current_user: CurrentUser,
+                             last_event_id: Optional[str] = Header(default=None)) -> StreamingResponse:
+
+    stream_task_events_service = StreamTaskEventsService(current_user, task_events_broker,
+                                                         settings.task_events.heartbeat_seconds, last_event_id)
+    content: AsyncIterator[str] = stream_task_events_service.stream_events()
+
+    return StreamingResponse(content, media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 
 @task_tracker.post('/create_task/', description='Allowed user roles: (ADMIN, TEAM_LEAD, PROJECT_MANAGER)')
 async def create_task(current_user: CurrentUser, task: APICreateTask,
-                      user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep):
+                      user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep,
+                      notification_repository: NotificationRepositoryDep):
 
-    create_task_service = CreateTaskService(current_user, user_repository, task_repository, task)
+    create_task_service = CreateTaskService(current_user, user_repository, task_repository,
+                                            notification_repository, task)
     created_task: CreatedTask = await create_task_service.create_task()
 
-    created_task_assignees = created_task.__dict__.pop('assignees')
-
-    try:
-        email_manager: EmailManager = EmailManager()
-        assignees_emails = [assignee.email for assignee in created_task_assignees]
-        await email_manager.send_emails(assignees_emails, 'Task Created!', f'Task: {created_task.name} has been created!')
-    except Exception as e:
-        logger.error(e)
     return created_task
 
 
-@task_tracker.put('/update_task/{task_id}', description='Allowed user roles: all roles except GUEST')
-async def update_task(task_id: int, current_user: CurrentUser, task: APIUpdateTask,
-                      user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep):
+@task_tracker.post('/create_tasks/', description='Allowed user roles: (ADMIN, TEAM_LEAD, PROJECT_MANAGER). '
+                                                'Creates up to 5000 tasks in one transaction')
+async def create_tasks(current_user: CurrentUser, tasks: APIBulkCreateTasks,
+                       user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep,
+                       notification_repository: NotificationRepositoryDep):
 
-    update_task_service = UpdateTaskService(current_user, user_repository,
-                                            task_repository, task, task_id)
-    updated_task: UpdatedTask = await update_task_service.update_task()
-    logger.debug(f'updated_task = {updated_task}')
+    bulk_create_task_service = BulkCreateTaskService(current_user, user_repository, task_repository,
+                                                     notification_repository, tasks)
+    created_tasks: BulkCreatedTasks = await bulk_create_task_service.create_tasks()
+
+    return created_tasks
 
-    updated_task_dict = updated_task.__dict__
 
-    updated_task_responsible_person: User = updated_task_dict.pop('responsible_person')
-    updated_task_assignees: Sequence[User] = updated_task_dict.pop('assignees')
+@task_tracker.post('/import_tasks/', response_model=ImportedTasks,
+                   description='Allowed user roles: (ADMIN, TEAM_LEAD, PROJECT_MANAGER). '
+                               'Imports a CSV or NDJSON file of tasks with the columns name, description, '
+                               'responsible_username, assignees_usernames (separated by spaces in CSV), status, '
+                               'priority. Every chunk of records is committed on its own and tasks whose name '
+                               'already exists are skipped, so a failed import can be resumed by sending the file '
+                               'again, with start_from from the error to skip the records imported before')
+async def import_tasks(current_user: CurrentUser, tasks_file: UploadFile,
+                       user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep,
+                       file_format: TasksFileFormat = TasksFileFormat.NDJSON,
+                       start_from: int = Query(default=0, ge=0)) -> ImportedTasks:
 
-    email_manager: EmailManager = EmailManager()
-    if updated_task_assignees:
-        emails_to_notify = [assignee.email for assignee in updated_task_assignees]
-        emails_to_notify.append(updated_task_responsible_person.email)
+    # utf-8-sig drops the byte order mark spreadsheet programs put at the start of CSV files
+    text_file = io.TextIOWrapper(tasks_file.file, encoding='utf-8-sig', newline='')
+    import_tasks_service = ImportTasksService(current_user, user_repository, task_repository,
+                                              text_file, file_format, start_from)
+    # The number of statements grows with the size of the file by design
+    with uncounted_queries():
+        imported_tasks: ImportedTasks = await import_tasks_service.import_tasks()
+    logger.info('imported_tasks = %s', imported_tasks)
 
-        await email_manager.send_emails(emails_to_notify, 'Task Changed!', f'Task: "{updated_task.name}" updated!')
+    return imported_tasks
 
+
+@task_tracker.put('/update_task/{task_id}', response_model=UpdatedTask,
+                  description='Allowed user roles: all roles except GUEST. '
+                              'With If-Match the task is only updated if its version is still the one from '
+                              'the ETag, otherwise 412 is returned. The ETag of the response is the new version')
+async def update_task(task_id: int, current_user: CurrentUser, task: APIUpdateTask,
+                      user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep,
+                      notification_repository: NotificationRepositoryDep, response: Response,
+                      if_match: Optional[str] = Header(default=None)):
+
+    update_task_service = UpdateTaskService(current_user, user_repository, task_repository, notification_repository,
+                                            task, task_id, parse_etags(if_match))
+    updated_task: UpdatedTask = await update_task_service.update_task()
+    logger.debug('updated_task = %s', updated_task)
+
+    response.headers['ETag'] = format_etag(updated_task.version)
     return updated_task
 
 
-@task_tracker.delete('/delete_task/{task_id}', description='Allowed user roles: (ADMIN, TEAM_LEAD, PROJECT_MANAGER)')
-async def delete_task(task_id: int, current_user: CurrentUser, user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep):
+@task_tracker.put('/update_tasks/', description='Allowed user roles: all roles except GUEST. '
+                                               'Changes status/priority/responsible person of the tasks '
+                                               'selected by tasks_ids or by a non-empty filter, up to 5000 tasks, '
+                                               'in one transaction')
+async def update_tasks(current_user: CurrentUser, tasks: APIBulkUpdateTasks,
+                       user_repository: UserRepositoryDep, task_repository: TaskRepositoryDep,
+                       notification_repository: NotificationRepositoryDep):
 
-    delete_task_service = DeleteTaskService(current_user, user_repository,
-                                            task_repository, task_id)
+    bulk_update_task_service = BulkUpdateTaskService(current_user, user_repository, task_repository,
+                                                     notification_repository, tasks)
+    updated_tasks: BulkUpdatedTasks = await bulk_update_task_service.update_tasks()
 
-    deleted_task: DeletedTask = await delete_task_service.delete_task()
+    return updated_tasks
 
 
-    email_manager: EmailManager = EmailManager()
-    deleted_task_assignees = deleted_task.__dict__.pop('assignees')
+@task_tracker.delete('/delete_task/{task_id}', description='Allowed user roles: (ADMIN, TEAM_LEAD, PROJECT_MANAGER)')
+async def delete_task(task_id: int, current_user: CurrentUser, user_repository: UserRepositoryDep,
+                      task_repository: TaskRepositoryDep, notification_repository: NotificationRepositoryDep):
 
-    emails_to_notify = [assignee.email for assignee in deleted_task_assignees]
+    delete_task_service = DeleteTaskService(current_user, user_repository,
+                                            task_repository, notification_repository, task_id)
 
-    await email_manager.send_emails(emails_to_notify, 'Task Changed!', f'Task: "{deleted_task.name}" deleted!')
+    deleted_task: DeletedTask = await delete_task_service.delete_task()
 
     return deleted_task
-
@@ -0,0 +1,49 @@
+import zlib
+from typing import AsyncIterator, Dict
+
+import anyio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import uncounted_queries
+
+
+GZIP_COMPRESS_LEVEL = 6
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """ Whether Accept-Encoding allows gzip, a coding with q=0 is refused and * stands for the ones not listed """
+    qualities: Dict[str, float] = {}
+    for encoding in accept_encoding.split(','):
+        coding, *parameters = [part.strip() for part in encoding.split(';')]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+async def gzip_stream(content: AsyncIterator[bytes], compress_level: int = GZIP_COMPRESS_LEVEL) -> AsyncIterator[bytes]:
+    """ Compresses the content chunk by chunk into one gzip member, nothing is buffered besides the zlib window """
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in content:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def stream_in_session(session: AsyncSession, content: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """ Sends content read with its own session and closes it at the end, also when the client disconnects """
+    try:
+        with uncounted_queries():
+            async for chunk in content:
+                yield chunk
+    finally:
+        with anyio.CancelScope(shield=True):
+            await session.close()
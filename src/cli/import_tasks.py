@@ -0,0 +1,77 @@
+"""
+    Imports tasks from a CSV or NDJSON file into the database from .env, the same way as
+    POST /task_tracker/import_tasks/ but without uploading the file first.
+
+    The file is read record by record and every chunk is committed on its own, the progress is printed after
+    each chunk. Tasks whose name already exists are skipped, so an interrupted import can be run again as is,
+    pass the last printed number of records as --start-from to skip them without checking.
+
+    Columns / keys: name, description, responsible_username, assignees_usernames (separated by spaces in CSV),
+    status, priority.
+
+    Usage: python -m src.cli.import_tasks tasks.csv --username admin [--format csv] [--start-from 0]
+                                                     [--chunk-size 5000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi import HTTPException
+
+from src.db.database import db_helper
+from src.repositories.task.repositories import TaskRepository
+from src.repositories.user.repositories import UserRepository
+from src.services.task_tracker.dto import ImportedTasks, TasksFileFormat
+from src.services.task_tracker.services import IMPORT_CHUNK_SIZE, ImportTasksService
+
+
+def get_file_format(path: str) -> TasksFileFormat:
+    return TasksFileFormat.CSV if path.lower().endswith('.csv') else TasksFileFormat.NDJSON
+
+
+async def main(arguments: argparse.Namespace) -> int:
+    db_helper.connect()
+    try:
+        async with db_helper.session_factory() as session:
+            user_repository = UserRepository(session)
+            user = await user_repository.get_user_by(username=arguments.username)
+            if user is None:
+                print(f'User "{arguments.username}" not found')
+                return 1
+
+            started_at = time.perf_counter()
+
+            def print_progress(imported_tasks: ImportedTasks) -> None:
+                records = imported_tasks.records - arguments.start_from
+                print(f'records: {imported_tasks.records}, imported: {imported_tasks.imported}, '
+                      f'already exist: {imported_tasks.already_exist}, '
+                      f'{records / (time.perf_counter() - started_at):.0f} records/s')
+
+            with open(arguments.path, encoding='utf-8-sig', newline='') as tasks_file:
+                import_tasks_service = ImportTasksService(
+                    user, user_repository, TaskRepository(session), tasks_file,
+                    TasksFileFormat(arguments.format) if arguments.format else get_file_format(arguments.path),
+                    arguments.start_from, arguments.chunk_size, on_chunk_imported=print_progress)
+                try:
+                    imported_tasks = await import_tasks_service.import_tasks()
+                except HTTPException as e:
+                    print(e.detail)
+                    return 1
+
+            print(f'Imported in {time.perf_counter() - started_at:.1f}s: {imported_tasks}')
+            return 0
+    finally:
+        await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--username', required=True, help='the tasks are imported on behalf of this user')
+    parser.add_argument('--format', choices=[file_format.value for file_format in TasksFileFormat],
+                        help='by default csv for .csv files and ndjson for the others')
+    parser.add_argument('--start-from', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
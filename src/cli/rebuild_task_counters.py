@@ -0,0 +1,38 @@
+"""
+    Recounts the task counters behind GET /task_tracker/stats/ from the tasks of the database from .env.
+
+    The counters are kept up to date by every write of the tasks, a rebuild is only needed after the tasks
+    were written around the app, e.g. by src.cli.seed (which runs it at the end) or by hand in SQL.
+    Everything is recounted in one transaction with one GROUP BY per counted column.
+
+    Usage: python -m src.cli.rebuild_task_counters
+"""
+import argparse
+import asyncio
+import time
+
+from src.db.database import db_helper
+from src.repositories.task.repositories import TaskRepository
+from src.services.task_tracker.dto import TaskStats
+from src.services.task_tracker.services import RebuildTaskCountersService
+
+
+async def rebuild_task_counters() -> TaskStats:
+    async with db_helper.session_factory() as session:
+        return await RebuildTaskCountersService(TaskRepository(session)).rebuild_task_counters()
+
+
+async def main() -> None:
+    db_helper.connect()
+    try:
+        started_at = time.perf_counter()
+        task_stats: TaskStats = await rebuild_task_counters()
+        print(f'Rebuilt in {time.perf_counter() - started_at:.1f}s: {task_stats.total} tasks, '
+              f'{len(task_stats.by_responsible_person)} responsible persons, {len(task_stats.by_assignee)} assignees')
+    finally:
+        await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    asyncio.run(main())
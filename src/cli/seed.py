@@ -0,0 +1,148 @@
+"""
+    Fills the database from .env with synthetic teams, users, tasks and task_user links.
+
+    Rows are generated lazily and inserted in fixed-size chunks with executemany, every chunk is
+    committed on its own, so memory use does not depend on the size of the dataset. Passwords are
+    hashed only `--password-templates` times and the hashes are reused, all users can log in with `--password`.
+    The task counters are rebuilt at the end, see src.cli.rebuild_task_counters.
+
+    Usage: python -m src.cli.seed [--users 1000000] [--teams 1000] [--tasks 2000000] [--assignees-per-task 3]
+                                  [--chunk-size 10000] [--password seed-password] [--password-templates 8]
+                                  [--random-seed 0]
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import Table, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.cli.rebuild_task_counters import rebuild_task_counters
+from src.db.database import db_helper
+from src.db.enums import TaskPriority, TaskStatus, UserRole
+from src.db.models import Task, TaskUser, Team, User
+from src.infrastructure.implementations.password_manager import PasswordManager
+
+
+Row = Dict[str, object]
+
+
+@dataclass
+class SeededDataset:
+    first_team_id: int
+    first_user_id: int
+    first_task_id: int
+
+
+def chunked(rows: Iterable[Row], chunk_size: int) -> Iterator[List[Row]]:
+    rows_iterator = iter(rows)
+    while chunk := list(itertools.islice(rows_iterator, chunk_size)):
+        yield chunk
+
+
+def generate_teams(first_id: int, count: int) -> Iterator[Row]:
+    for team_id in range(first_id, first_id + count):
+        yield {'id': team_id, 'name': f'team_{team_id}'}
+
+
+def generate_users(first_id: int, count: int, teams_ids: Sequence[int],
+                   password_hashes: Sequence[str], rng: random.Random) -> Iterator[Row]:
+    roles = [role for role in UserRole if role != UserRole.ADMIN]
+    for user_id in range(first_id, first_id + count):
+        yield {'id': user_id, 'username': f'user_{user_id}', 'email': f'user_{user_id}@example.com',
+               'password': password_hashes[user_id % len(password_hashes)], 'role': rng.choice(roles),
+               'team_id': rng.choice(teams_ids) if teams_ids else None}
+
+
+def generate_tasks(first_id: int, count: int, users_ids: Sequence[int], rng: random.Random) -> Iterator[Row]:
+    statuses, priorities = list(TaskStatus), list(TaskPriority)
+    for task_id in range(first_id, first_id + count):
+        yield {'id': task_id, 'name': f'task_{task_id}', 'description': f'Synthetic task {task_id}',
+               'responsible_person': rng.choice(users_ids), 'status': rng.choice(statuses),
+               'priority': rng.choice(priorities)}
+
+
+def generate_tasks_users(tasks_ids: Sequence[int], users_ids: Sequence[int], assignees_per_task: int,
+                         rng: random.Random) -> Iterator[Row]:
+    assignees_per_task = min(assignees_per_task, len(users_ids))
+    for task_id in tasks_ids:
+        for user_id in rng.sample(users_ids, assignees_per_task):
+            yield {'task_id': task_id, 'user_id': user_id}
+
+
+async def insert_chunks(connection: AsyncConnection, table: Table, rows: Iterable[Row], chunk_size: int) -> int:
+    inserted, started_at = 0, time.perf_counter()
+    for chunk in chunked(rows, chunk_size):
+        await connection.execute(insert(table), chunk)
+        await connection.commit()
+        inserted += len(chunk)
+        print(f'{table.name}: {inserted} rows, {inserted / (time.perf_counter() - started_at):.0f} rows/s')
+    return inserted
+
+
+async def get_next_id(connection: AsyncConnection, table: Table) -> int:
+    return (await connection.scalar(select(func.max(table.c.id))) or 0) + 1
+
+
+async def seed(users: int, teams: int, tasks: int, assignees_per_task: int, password_hashes: Sequence[str],
+               chunk_size: int = 10_000, random_seed: int = 0) -> SeededDataset:
+    """ Appends the dataset after the rows that already exist, ids of the new rows are consecutive """
+    rng = random.Random(random_seed)
+
+    async with db_helper.engine.connect() as connection:
+        dataset = SeededDataset(first_team_id=await get_next_id(connection, Team.__table__),
+                                first_user_id=await get_next_id(connection, User.__table__),
+                                first_task_id=await get_next_id(connection, Task.__table__))
+        teams_ids = range(dataset.first_team_id, dataset.first_team_id + teams)
+        users_ids = range(dataset.first_user_id, dataset.first_user_id + users)
+        tasks_ids = range(dataset.first_task_id, dataset.first_task_id + tasks)
+
+        await insert_chunks(connection, Team.__table__, generate_teams(dataset.first_team_id, teams), chunk_size)
+        await insert_chunks(connection, User.__table__,
+                            generate_users(dataset.first_user_id, users, teams_ids, password_hashes, rng), chunk_size)
+        if users:
+            await insert_chunks(connection, Task.__table__,
+                                generate_tasks(dataset.first_task_id, tasks, users_ids, rng), chunk_size)
+            await insert_chunks(connection, TaskUser.__table__,
+                                generate_tasks_users(tasks_ids, users_ids, assignees_per_task, rng), chunk_size)
+
+    return dataset
+
+
+def hash_password_templates(password: str, templates: int) -> List[str]:
+    return [PasswordManager.hash_password(password) for _ in range(max(templates, 1))]
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    db_helper.connect()
+    try:
+        started_at = time.perf_counter()
+        dataset = await seed(arguments.users, arguments.teams, arguments.tasks, arguments.assignees_per_task,
+                             hash_password_templates(arguments.password, arguments.password_templates),
+                             arguments.chunk_size, arguments.random_seed)
+        print(f'Seeded in {time.perf_counter() - started_at:.1f}s, first ids: {dataset}')
+
+        # The rows were inserted around the repository, so the task counters are recounted
+        started_at = time.perf_counter()
+        await rebuild_task_counters()
+        print(f'Task counters rebuilt in {time.perf_counter() - started_at:.1f}s')
+    finally:
+        await db_helper.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--teams', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=2_000_000)
+    parser.add_argument('--assignees-per-task', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--password', default='seed-password')
+    parser.add_argument('--password-templates', type=int, default=8)
+    parser.add_argument('--random-seed', type=int, default=0)
+
+    asyncio.run(main(parser.parse_args()))
@@ -1,7 +1,7 @@
 import logging.config
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
@@ -17,15 +17,18 @@ class DefaultModelConfig:
 
 class GlobalSettings(BaseSettings, DefaultModelConfig):
     start_setting: str = Field(alias='START_SETTING')
+    log_format: Literal['text', 'json'] = Field(default='text', alias='LOG_FORMAT')
+    log_queue: bool = Field(default=True, alias='LOG_QUEUE')
     logger_config: Dict = {}
 
     @field_validator('logger_config')
     def get_logger_config(cls, v, info: FieldValidationInfo):
-        logger_config = cls.get_logger_config_by_setting(info.data['start_setting'])
+        logger_config = cls.get_logger_config_by_setting(info.data['start_setting'], info.data['log_format'])
         return logger_config
 
     @classmethod
-    def get_logger_config_by_setting(cls, start_setting: str) -> Dict:
+    def get_logger_config_by_setting(cls, start_setting: str, log_format: str = 'text') -> Dict:
+        formatter = 'json' if log_format == 'json' else 'detailed'
         if start_setting == 'PRODUCTION':
             LOGGER_CONFIG = {
                 "version": 1,
@@ -37,13 +40,16 @@ class GlobalSettings(BaseSettings, DefaultModelConfig):
                     "detailed": {
                         "format": "[%(levelname)s|%(module)s|L%(lineno)d] %(asctime)s: %(message)s",
                         "datefmt": "%Y-%m-%dT%H:%M:%S%z"
+                    },
+                    "json": {
+                        "()": "src.infrastructure.implementations.logging_queue.JSONFormatter"
                     }
                 },
                 "handlers": {
                     'console': {
                         'level': 'WARNING',
                         'class': 'logging.StreamHandler',
-                        'formatter': 'verbose'
+                        'formatter': formatter
                     },
                     'file': {
                         'level': 'INFO',
@@ -51,7 +57,7 @@ class GlobalSettings(BaseSettings, DefaultModelConfig):
                         'filename': 'app.log',
                         'when': 'W0',
                         'utc': True,
-                        'formatter': 'verbose',
+                        'formatter': formatter,
                     },
                 },
                 "loggers": {
@@ -72,13 +78,16 @@ class GlobalSettings(BaseSettings, DefaultModelConfig):
                     "detailed": {
                         "format": "[%(levelname)s|%(module)s|L%(lineno)d] %(asctime)s: %(message)s",
                         "datefmt": "%Y-%m-%dT%H:%M:%S%z"
+                    },
+                    "json": {
+                        "()": "src.infrastructure.implementations.logging_queue.JSONFormatter"
                     }
                 },
                 "handlers": {
                     "console": {
                         "class": "logging.StreamHandler",
                         "level": "DEBUG",
-                        "formatter": "detailed",
+                        "formatter": formatter,
                         "stream": "ext://sys.stderr"
                     },
                     # "file": {
@@ -106,6 +115,10 @@ class GlobalSettings(BaseSettings, DefaultModelConfig):
 
 class SqliteSettings(BaseSettings, DefaultModelConfig):
     db_name: str = Field(alias='DB_NAME')
+    pool_size: int = Field(default=5, alias='DB_POOL_SIZE')
+    max_overflow: int = Field(default=10, alias='DB_MAX_OVERFLOW')
+    pool_pre_ping: bool = Field(default=True, alias='DB_POOL_PRE_PING')
+    pool_recycle: int = Field(default=3600, alias='DB_POOL_RECYCLE')
     url: str = ''
 
     @field_validator('url')
@@ -122,6 +135,76 @@ class AuthJWT(BaseSettings, DefaultModelConfig):
     refresh_token_expire_days: int = 30
 
 
+class PasswordHashingSettings(BaseSettings, DefaultModelConfig):
+    executor: Literal['thread', 'process'] = Field(default='thread', alias='PASSWORD_HASHING_EXECUTOR')
+    workers: int = Field(default=4, alias='PASSWORD_HASHING_WORKERS')
+    max_queue_size: int = Field(default=100, alias='PASSWORD_HASHING_MAX_QUEUE_SIZE')
+
+
+class AuthAdmissionSettings(BaseSettings, DefaultModelConfig):
+    enabled: bool = Field(default=True, alias='AUTH_ADMISSION_ENABLED')
+    min_limit: int = Field(default=1, alias='AUTH_ADMISSION_MIN_LIMIT')
+    max_limit: int = Field(default=64, alias='AUTH_ADMISSION_MAX_LIMIT')
+    initial_limit: int = Field(default=8, alias='AUTH_ADMISSION_INITIAL_LIMIT')
+    max_queue_size: int = Field(default=100, alias='AUTH_ADMISSION_MAX_QUEUE_SIZE')
+    max_queue_wait_seconds: float = Field(default=2, alias='AUTH_ADMISSION_MAX_QUEUE_WAIT_SECONDS')
+    latency_target_seconds: float = Field(default=1, alias='AUTH_ADMISSION_LATENCY_TARGET_SECONDS')
+    backoff_ratio: float = Field(default=0.9, alias='AUTH_ADMISSION_BACKOFF_RATIO')
+
+
+class UserCacheSettings(BaseSettings, DefaultModelConfig):
+    ttl_seconds: float = Field(default=60, alias='USER_CACHE_TTL_SECONDS')
+    max_size: int = Field(default=10_000, alias='USER_CACHE_MAX_SIZE')
+
+
+class TaskCacheSettings(BaseSettings, DefaultModelConfig):
+    enabled: bool = Field(default=True, alias='TASK_CACHE_ENABLED')
+    ttl_seconds: float = Field(default=60, alias='TASK_CACHE_TTL_SECONDS')
+    max_size: int = Field(default=10_000, alias='TASK_CACHE_MAX_SIZE')
+    max_bytes: int = Field(default=32 * 1024 * 1024, alias='TASK_CACHE_MAX_BYTES')
+
+
+class TaskEventsSettings(BaseSettings, DefaultModelConfig):
+    buffer_size: int = Field(default=100, alias='TASK_EVENTS_BUFFER_SIZE')
+    max_subscribers: int = Field(default=1000, alias='TASK_EVENTS_MAX_SUBSCRIBERS')
+    heartbeat_seconds: float = Field(default=15, alias='TASK_EVENTS_HEARTBEAT_SECONDS')
+
+
+class NotificationSettings(BaseSettings, DefaultModelConfig):
+    batch_size: int = Field(default=100, alias='NOTIFICATION_BATCH_SIZE')
+    poll_interval_seconds: float = Field(default=1, alias='NOTIFICATION_POLL_INTERVAL_SECONDS')
+    lease_seconds: float = Field(default=60, alias='NOTIFICATION_LEASE_SECONDS')
+    max_attempts: int = Field(default=5, alias='NOTIFICATION_MAX_ATTEMPTS')
+    backoff_base_seconds: float = Field(default=2, alias='NOTIFICATION_BACKOFF_BASE_SECONDS')
+    backoff_max_seconds: float = Field(default=600, alias='NOTIFICATION_BACKOFF_MAX_SECONDS')
+
+
+class EmailSettings(BaseSettings, DefaultModelConfig):
+    backend: Literal['mock', 'smtp'] = Field(default='mock', alias='EMAIL_BACKEND')
+    sender: str = Field(default='task-tracker@localhost', alias='EMAIL_SENDER')
+    max_concurrency: int = Field(default=20, alias='EMAIL_MAX_CONCURRENCY')
+    smtp_host: str = Field(default='localhost', alias='SMTP_HOST')
+    smtp_port: int = Field(default=25, alias='SMTP_PORT')
+    smtp_username: Optional[str] = Field(default=None, alias='SMTP_USERNAME')
+    smtp_password: Optional[str] = Field(default=None, alias='SMTP_PASSWORD')
+    smtp_use_tls: bool = Field(default=False, alias='SMTP_USE_TLS')
+    smtp_start_tls: bool = Field(default=False, alias='SMTP_START_TLS')
+    smtp_timeout_seconds: float = Field(default=30, alias='SMTP_TIMEOUT_SECONDS')
+    smtp_pool_size: int = Field(default=5, alias='SMTP_POOL_SIZE')
+    smtp_max_messages_per_connection: int = Field(default=1000, alias='SMTP_MAX_MESSAGES_PER_CONNECTION')
+
+
+class MetricsSettings(BaseSettings, DefaultModelConfig):
+    enabled: bool = Field(default=True, alias='METRICS_ENABLED')
+
+
+class QueryCounterSettings(BaseSettings, DefaultModelConfig):
+    enabled: bool = Field(default=True, alias='QUERY_COUNTER_ENABLED')
+    budget: int = Field(default=20, alias='QUERY_BUDGET')
+    repeated_statement_threshold: int = Field(default=5, alias='QUERY_REPEATED_STATEMENT_THRESHOLD')
+    action: Literal['log', 'raise'] = Field(default='log', alias='QUERY_BUDGET_ACTION')
+
+
 class Test(BaseSettings):
     model_config = default_config
     username: str = Field(alias='TEST_USERNAME')
@@ -133,6 +216,15 @@ class Settings(BaseSettings):
     global_settings: GlobalSettings = GlobalSettings()
     sqlite_settings: SqliteSettings = SqliteSettings()
     authJWT: AuthJWT = AuthJWT()
+    password_hashing: PasswordHashingSettings = PasswordHashingSettings()
+    auth_admission: AuthAdmissionSettings = AuthAdmissionSettings()
+    user_cache: UserCacheSettings = UserCacheSettings()
+    task_cache: TaskCacheSettings = TaskCacheSettings()
+    task_events: TaskEventsSettings = TaskEventsSettings()
+    notifications: NotificationSettings = NotificationSettings()
+    email: EmailSettings = EmailSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    query_counter: QueryCounterSettings = QueryCounterSettings()
     tests: Test = Test()
 
 
@@ -1,17 +1,190 @@
-from typing import AsyncGenerator
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config import settings
+from src.infrastructure.implementations.metrics import db_statement_duration_seconds, db_statement_rows_total
+from src.infrastructure.implementations.metrics import db_pool_checkout_wait_seconds, db_pool_connections_checked_out
+
+
+STATEMENT_TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE)\s+["`]?(\w+)', re.IGNORECASE)
+DML_OPERATIONS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+PLACEHOLDERS_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*')
+
+
+@lru_cache(maxsize=2048)
+def get_statement_labels(statement: str) -> Tuple[str, str]:
+    """ (operation, first table) of a statement, SQLAlchemy reuses the same strings so the result is cached """
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    table = STATEMENT_TABLE_PATTERN.search(statement)
+    return operation, table.group(1) if table else ''
+
+
+@lru_cache(maxsize=2048)
+def get_statement_shape(statement: str) -> str:
+    """ Statement with the expanded IN lists and multi-row VALUES collapsed, so they don't count as distinct shapes """
+    return PLACEHOLDERS_PATTERN.sub('(?)', ' '.join(statement.split()))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryCounter:
+    """ Counts the statements of one unit of work (a request, a test) and the repeats of every statement shape """
+
+    def __init__(self, budget: int, repeated_statement_threshold: int, raise_on_violation: bool = False):
+        self.budget: int = budget
+        self.repeated_statement_threshold: int = repeated_statement_threshold
+        self.raise_on_violation: bool = raise_on_violation
+        self.statements: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def record(self, statement: str) -> None:
+        shape = get_statement_shape(statement)
+        self.statements[shape] += 1
+        if self.raise_on_violation and (self.count > self.budget
+                                        or self.statements[shape] >= self.repeated_statement_threshold):
+            raise QueryBudgetExceeded('; '.join(self.get_violations()))
+
+    def get_repeated_statements(self) -> Dict[str, int]:
+        """ Shapes executed at least repeated_statement_threshold times, the usual sign of an N+1 """
+        return {shape: count for shape, count in self.statements.items()
+                if count >= self.repeated_statement_threshold}
+
+    def get_violations(self) -> List[str]:
+        violations: List[str] = []
+        if self.count > self.budget:
+            violations.append(f'{self.count} statements, budget is {self.budget}')
+        for shape, count in self.get_repeated_statements().items():
+            violations.append(f'{count} x {shape}')
+        return violations
+
+    def check(self) -> None:
+        violations = self.get_violations()
+        if violations:
+            raise QueryBudgetExceeded('; '.join(violations))
+
+
+# Counters nest (a test wrapping a request), every active one records the statement
+active_query_counters: ContextVar[Tuple[QueryCounter, ...]] = ContextVar('active_query_counters', default=())
+
+
+@contextmanager
+def count_queries(query_counter: QueryCounter) -> Iterator[QueryCounter]:
+    token = active_query_counters.set(active_query_counters.get() + (query_counter,))
+    try:
+        yield query_counter
+    finally:
+        active_query_counters.reset(token)
+
+
+@contextmanager
+def uncounted_queries() -> Iterator[None]:
+    """ For work whose number of statements grows with the data by design, like an export read chunk by chunk """
+    token = active_query_counters.set(())
+    try:
+        yield
+    finally:
+        active_query_counters.reset(token)
+
+
+def _count_query(connection, cursor, statement, parameters, context, executemany) -> None:
+    for query_counter in active_query_counters.get():
+        query_counter.record(statement)
+
+
+def count_engine_queries(engine: Engine) -> None:
+    """ SQLAlchemy runs the sync events inside the calling task, so the context variable reaches them """
+    if not event.contains(engine, 'before_cursor_execute', _count_query):
+        event.listen(engine, 'before_cursor_execute', _count_query)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """ Records how long a checkout waited for a connection, including opening a new one """
+
+    def _do_get(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait_seconds.labels().observe(time.perf_counter() - started_at)
+
+
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+    connection.info.setdefault('statements_started_at', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - connection.info['statements_started_at'].pop()
+    operation, table = get_statement_labels(statement)
+    db_statement_duration_seconds.labels(operation, table).observe(duration)
+    if operation in DML_OPERATIONS and cursor.rowcount > 0:
+        db_statement_rows_total.labels(operation, table).inc(cursor.rowcount)
+
+
+def _handle_error(exception_context) -> None:
+    started_at = exception_context.connection.info.get('statements_started_at') \
+        if exception_context.connection is not None else None
+    if started_at:
+        started_at.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    event.listen(engine.pool, 'checkout', lambda *args: db_pool_connections_checked_out.labels().inc())
+    event.listen(engine.pool, 'checkin', lambda *args: db_pool_connections_checked_out.labels().dec())
 
 
 class DatabaseHelper:
-    def __init__(self, url: str, echo: bool):
+    """ Owns the engine and its connection pool, connected on app startup and disposed on shutdown """
+
+    def __init__(self, url: str, echo: bool,
+                 pool_size: int, max_overflow: int,
+                 pool_pre_ping: bool, pool_recycle: int, instrument: bool = False, count_queries: bool = False):
+        self.url: str = url
+        self.echo: bool = echo
+        self.pool_size: int = pool_size
+        self.max_overflow: int = max_overflow
+        self.pool_pre_ping: bool = pool_pre_ping
+        self.pool_recycle: int = pool_recycle
+        self.instrument: bool = instrument
+        self.count_queries: bool = count_queries
+
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[async_sessionmaker] = None
+
+    def connect(self) -> None:
+        if self.engine is not None:
+            return
+
         self.engine = create_async_engine(
-            url=url,
-            echo=echo
+            url=self.url,
+            echo=self.echo,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            pool_recycle=self.pool_recycle,
+            poolclass=InstrumentedAsyncAdaptedQueuePool if self.instrument else AsyncAdaptedQueuePool,
         )
+        if self.instrument:
+            instrument_engine(self.engine.sync_engine)
+        if self.count_queries:
+            count_engine_queries(self.engine.sync_engine)
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
@@ -19,13 +192,29 @@ class DatabaseHelper:
             expire_on_commit=False,
         )
 
+    async def dispose(self) -> None:
+        if self.engine is None:
+            return
+
+        await self.engine.dispose()
+        self.engine = None
+        self.session_factory = None
+
     async def get_session(self) -> AsyncGenerator:
+        if self.session_factory is None:
+            raise RuntimeError('DatabaseHelper is not connected, call connect() on application startup')
+
         async with self.session_factory() as session:
             yield session
-        await self.engine.dispose()
 
 
 db_helper = DatabaseHelper(
     url=settings.sqlite_settings.url,
-    echo=False
+    echo=False,
+    pool_size=settings.sqlite_settings.pool_size,
+    max_overflow=settings.sqlite_settings.max_overflow,
+    pool_pre_ping=settings.sqlite_settings.pool_pre_ping,
+    pool_recycle=settings.sqlite_settings.pool_recycle,
+    instrument=settings.metrics.enabled,
+    count_queries=settings.query_counter.enabled,
 )
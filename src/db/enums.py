@@ -24,3 +24,19 @@ class TaskPriority(Enum):
     LOW = 'Low'
     MEDIUM = 'Medium'
     HIGH = 'High'
+
+
+class NotificationStatus(Enum):
+    """ Delivery status of a notification in the outbox """
+    PENDING = 'Pending'
+    SENT = 'Sent'
+    DEAD = 'Dead'
+
+
+class TaskCounterDimension(Enum):
+    """ What the tasks of a counter have in common """
+    TOTAL = 'Total'
+    STATUS = 'Status'
+    PRIORITY = 'Priority'
+    RESPONSIBLE_PERSON = 'Responsible person'
+    ASSIGNEE = 'Assignee'
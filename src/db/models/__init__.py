@@ -1,4 +1,5 @@
 from .base import *
+from .notification import *
 from .task import *
 from .task_user import *
 from .team import *
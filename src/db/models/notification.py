@@ -0,0 +1,31 @@
+import datetime
+
+from .base import Base
+
+from sqlalchemy import func, Enum, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.sqlite import TIMESTAMP
+
+from src.db.enums import NotificationStatus
+
+
+class Notification(Base):
+    """ Outbox of notifications, written in the same transaction as the change they are about """
+    __tablename__ = 'notification'
+    __table_args__ = (
+        Index('ix_notification_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    recipient: Mapped[str] = mapped_column(nullable=False)
+    subject: Mapped[str] = mapped_column(String(150), nullable=False)
+    body: Mapped[str] = mapped_column(nullable=False)
+    status: Mapped[NotificationStatus] = mapped_column(Enum(NotificationStatus),
+                                                       default=NotificationStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+    last_error: Mapped[str] = mapped_column(nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
@@ -1,14 +1,24 @@
 from .base import Base
 
-from sqlalchemy import ForeignKey, String, Enum
+from sqlalchemy import ForeignKey, String, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.db.enums import TaskStatus, TaskPriority
+from src.db.enums import TaskStatus, TaskPriority, TaskCounterDimension
 
 
 class Task(Base):
     """ Model for storing information about the task """
     __tablename__ = 'task'
+    __table_args__ = (
+        # Keyset pagination indexes, the leading columns match equality filters of the listing
+        Index('ix_task_priority_status_id', 'priority', 'status', 'id'),
+        Index('ix_task_status_priority_id', 'status', 'priority', 'id'),
+        Index('ix_task_responsible_person_priority_status_id', 'responsible_person', 'priority', 'status', 'id'),
+        # The tasks of a responsible person in id order, for the "my tasks" pages
+        Index('ix_task_responsible_person_id', 'responsible_person', 'id'),
+        # Incremental sync reads the tasks changed after a (change_seq, id) cursor
+        Index('ix_task_change_seq_id', 'change_seq', 'id'),
+    )
 
     name: Mapped[str] = mapped_column(String(150), nullable=False, unique=True)
     description: Mapped[str] = mapped_column(nullable=False)
@@ -16,9 +26,39 @@ class Task(Base):
 
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), default=TaskStatus.TODO)
     priority: Mapped[TaskPriority] = mapped_column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
+    # Incremented by every update, exposed as the ETag of the task for conditional requests
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default='1')
+    # Position of the last change of the task in the sequence shared with the tombstones of deleted tasks
+    change_seq: Mapped[int] = mapped_column(nullable=False, default=0, server_default='0')
 
     assignees: Mapped[list['User']] = relationship(
         secondary='task_user',
-        back_populates='tasks',
-        lazy='joined'
+        back_populates='tasks'
     )
+
+
+class TaskTombstone(Base):
+    """ Left by a deleted task, so the clients syncing their tasks learn about the deletion """
+    __tablename__ = 'task_tombstone'
+    __table_args__ = (
+        Index('ix_task_tombstone_change_seq_task_id', 'change_seq', 'task_id'),
+    )
+
+    task_id: Mapped[int] = mapped_column(nullable=False, unique=True)
+    change_seq: Mapped[int] = mapped_column(nullable=False)
+
+
+class TaskCounter(Base):
+    """
+        Number of tasks sharing a value of a dimension, e.g. the tasks with the status DONE or assigned to a user.
+        Kept up to date by every write of the tasks in the same transaction
+    """
+    __tablename__ = 'task_counter'
+    __table_args__ = (
+        UniqueConstraint('dimension', 'value', name='uq_task_counter_dimension_value'),
+    )
+
+    dimension: Mapped[TaskCounterDimension] = mapped_column(Enum(TaskCounterDimension), nullable=False)
+    # Name of the status / priority, id of the user, empty for the total
+    value: Mapped[str] = mapped_column(String(50), nullable=False)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -1,11 +1,17 @@
 from .base import Base
 
-from sqlalchemy import  ForeignKey
+from sqlalchemy import  ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class TaskUser(Base):
     __tablename__ = 'task_user'
+    __table_args__ = (
+        # A user is assigned to a task once, the index also serves the lookups of the assignees of tasks
+        Index('uq_task_user_task_id_user_id', 'task_id', 'user_id', unique=True),
+        # Covers the lookups of the tasks of an assignee without reading the table
+        Index('ix_task_user_user_id_task_id', 'user_id', 'task_id'),
+    )
 
     task_id: Mapped[int] = mapped_column(ForeignKey('task.id'))
     user_id: Mapped[int] =  mapped_column(ForeignKey('user.id'))
@@ -2,7 +2,7 @@ import datetime
 from typing import List
 
 from .base import Base
-from sqlalchemy import func, ForeignKey, Enum
+from sqlalchemy import func, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.sqlite import TIMESTAMP
 
@@ -12,6 +12,11 @@ from src.db.enums import UserRole
 class User(Base):
     """ Model for storing information about the user """
     __tablename__ = 'user'
+    __table_args__ = (
+        # Login looks the user up by username, the registration checks both
+        Index('uq_user_username', 'username', unique=True),
+        Index('uq_user_email', 'email', unique=True),
+    )
 
     username: Mapped[str] = mapped_column(nullable=False)
     email: Mapped[str] = mapped_column(nullable=False)
@@ -23,10 +28,9 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.GUEST)
     team_id: Mapped[int] = mapped_column(ForeignKey('team.id'), nullable=True)
 
-    team: Mapped['Team'] = relationship(back_populates='users', lazy='joined')
+    team: Mapped['Team'] = relationship(back_populates='users')
 
     tasks: Mapped[List['Task']] = relationship(
         secondary='task_user',
-        back_populates='assignees',
-        lazy='joined'
+        back_populates='assignees'
     )
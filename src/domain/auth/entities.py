@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 from pydantic import BaseModel, EmailStr, ConfigDict, Field
 
@@ -15,8 +15,6 @@ class UserBase(BaseModel):
     register_at: datetime | None = None
     last_login: datetime | None = None
     role: UserRole = UserRole.USER
-    team_id: Optional[int]
-    team: Optional[str]
-    tasks: Optional[List]
+    team_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
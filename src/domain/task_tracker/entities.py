@@ -5,6 +5,13 @@ from pydantic import BaseModel, ConfigDict
 from src.db.enums import TaskStatus, TaskPriority
 
 
+class TaskAssignee(BaseModel):
+    """ The part of an assigned user kept with a task """
+    id: int
+    email: str
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TaskBase(BaseModel):
     """ User entity """
     id: int | None = None
@@ -14,4 +21,5 @@ class TaskBase(BaseModel):
     status: TaskStatus
     priority: TaskPriority
     assignees: Optional[List[Any]]
+    version: int | None = None
     model_config = ConfigDict(from_attributes=True)
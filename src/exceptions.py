@@ -26,3 +26,16 @@ def get_exception_404_not_found_with_detail(detail: str) -> HTTPException:
         status_code=status.HTTP_404_NOT_FOUND,
         detail=detail
     )
+
+def get_exception_412_precondition_failed_with_detail(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=detail
+    )
+
+def get_exception_503_service_unavailable_with_detail(detail: str, retry_after: int = 1) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={'Retry-After': str(retry_after)}
+    )
@@ -39,3 +39,32 @@ class CredentialsToDecodeToken(BaseModel):
     encoded_token: str
     key: str = settings.authJWT.key
     algorithm: str = settings.authJWT.algorithm
+
+
+class PasswordHashingStats(BaseModel):
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    average_wait_seconds: float
+    max_wait_seconds: float
+
+
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    weight: int = 0
+
+
+class TaskEventsStats(BaseModel):
+    subscribers: int
+    published: int
+    dropped: int
+
+
+class TaskCacheStats(BaseModel):
+    by_id: CacheStats
+    by_name: CacheStats
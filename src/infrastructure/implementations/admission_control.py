@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import AsyncIterator, Deque
+
+from fastapi import HTTPException
+
+from src.exceptions import get_exception_503_service_unavailable_with_detail
+from src.infrastructure.implementations.metrics import (admission_concurrency_limit, admission_in_flight,
+                                                        admission_queue_depth, admission_queue_wait_seconds,
+                                                        admission_rejected_total)
+
+
+logger = logging.getLogger('app')
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Admission control for a group of CPU-heavy routes, at most `limit` requests run at once and the others wait
+    in a bounded FIFO queue. The limit follows the latency of the admitted requests (AIMD): every request finished
+    within `latency_target_seconds` while the limit was in use adds 1 / limit, so the limit grows by one per window
+    of requests, and a slower one multiplies it by `backoff_ratio`, at most once per round trip
+    """
+
+    def __init__(self, name: str, min_limit: int, max_limit: int, initial_limit: int, max_queue_size: int,
+                 max_queue_wait_seconds: float, latency_target_seconds: float, backoff_ratio: float):
+        self.name: str = name
+        self.min_limit: int = max(1, min_limit)
+        self.max_limit: int = max(self.min_limit, max_limit)
+        self.max_queue_size: int = max_queue_size
+        self.max_queue_wait_seconds: float = max_queue_wait_seconds
+        self.latency_target_seconds: float = latency_target_seconds
+        self.backoff_ratio: float = backoff_ratio
+
+        self.limit: float = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.in_flight: int = 0
+        self.average_latency_seconds: float = latency_target_seconds
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease_at: float = 0.0
+
+        self._limit_gauge = admission_concurrency_limit.labels(name)
+        self._in_flight_gauge = admission_in_flight.labels(name)
+        self._queue_depth_gauge = admission_queue_depth.labels(name)
+        self._queue_wait_histogram = admission_queue_wait_seconds.labels(name)
+        self._limit_gauge.set(self.current_limit)
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None | HTTPException:
+        """ Waits for a free slot, raises 503 when the queue is full or the wait is longer than allowed """
+        if self.in_flight < self.current_limit and not self._waiters:
+            self._take_slot()
+            self._queue_wait_histogram.observe(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            raise self._reject('queue_full')
+
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queue_depth_gauge.set(len(self._waiters))
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_wait_seconds)
+        except asyncio.TimeoutError:
+            self._leave_queue(waiter)
+            raise self._reject('timeout')
+        except asyncio.CancelledError:
+            # The client went away
+            self._leave_queue(waiter)
+            raise
+        self._queue_wait_histogram.observe(time.perf_counter() - queued_at)
+
+    def release(self, latency_seconds: float) -> None:
+        """ Frees the slot and adjusts the limit to the latency of the request holding it """
+        saturated = self.in_flight >= self.current_limit
+        self._adjust_limit(latency_seconds, saturated)
+        self._free_slot()
+
+    async def admit(self) -> AsyncIterator[None]:
+        """ Router dependency, holds a slot for the whole request """
+        await self.acquire()
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started_at)
+
+    def _adjust_limit(self, latency_seconds: float, saturated: bool) -> None:
+        self.average_latency_seconds += 0.1 * (latency_seconds - self.average_latency_seconds)
+        now = time.monotonic()
+        if latency_seconds > self.latency_target_seconds:
+            # Requests admitted before the decrease finish slow as well, they must not shrink the limit again
+            if now - self._last_decrease_at >= latency_seconds:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease_at = now
+        elif saturated:
+            # An idle route says nothing about the load it can take, only a used up limit grows
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._limit_gauge.set(self.current_limit)
+
+    def _take_slot(self) -> None:
+        self.in_flight += 1
+        self._in_flight_gauge.set(self.in_flight)
+
+    def _free_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+        self._in_flight_gauge.set(self.in_flight)
+        self._queue_depth_gauge.set(len(self._waiters))
+
+    def _leave_queue(self, waiter: asyncio.Future) -> None:
+        """ A slot handed over just before the wait ended goes to the next one in the queue """
+        if waiter.done() and not waiter.cancelled():
+            self._free_slot()
+        else:
+            self._remove_waiter(waiter)
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._queue_depth_gauge.set(len(self._waiters))
+
+    def _reject(self, reason: str) -> HTTPException:
+        admission_rejected_total.labels(self.name, reason).inc()
+        logger.warning('%s admission rejected a request (%s), limit %s, %s requests are waiting',
+                       self.name, reason, self.current_limit, len(self._waiters))
+        # The time the queue needs to drain at the current limit and latency
+        retry_after = math.ceil((len(self._waiters) + 1) * self.average_latency_seconds / self.current_limit)
+        return get_exception_503_service_unavailable_with_detail('Server is busy, try again later',
+                                                                 retry_after=max(1, retry_after))
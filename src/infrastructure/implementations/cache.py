@@ -0,0 +1,207 @@
+import math
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Sequence, Tuple, TypeVar
+
+from src.config import settings, TaskCacheSettings
+from src.domain.auth.entities import UserBase
+from src.domain.task_tracker.entities import TaskBase
+from src.infrastructure.dto import CacheStats, TaskCacheStats
+from src.infrastructure.implementations.metrics import (cache_entries, cache_evictions_total, cache_hits_total,
+                                                        cache_misses_total, metrics_registry)
+from src.services.task_tracker.interfaces import AbstractTaskCache
+
+
+Key = TypeVar('Key', bound=Hashable)
+Value = TypeVar('Value')
+
+# Measured with tracemalloc for a cached task and for each of its assignees, strings excluded
+TASK_ENTRY_BYTES = 1250
+ASSIGNEE_ENTRY_BYTES = 450
+
+
+class LRUCache(Generic[Key, Value]):
+    """
+        In-process cache with a time to live per entry and least recently used eviction.
+        With a weigher the entries are also evicted while their total weight is above max_weight
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, max_weight: float = math.inf,
+                 weigher: Optional[Callable[[Value], int]] = None):
+        self.max_size: int = max_size
+        self.ttl_seconds: float = ttl_seconds
+        self.max_weight: float = max_weight
+        self.weigher: Optional[Callable[[Value], int]] = weigher
+
+        self._entries: OrderedDict[Key, Tuple[float, Value, int]] = OrderedDict()
+        self.weight: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Key) -> Optional[Value]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Key, value: Value) -> None:
+        self.delete(key)
+        weight: int = self.weigher(value) if self.weigher else 0
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, weight)
+        self.weight += weight
+
+        while self._entries and (len(self._entries) > self.max_size or self.weight > self.max_weight):
+            _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+            self.weight -= evicted_weight
+            self.evictions += 1
+
+    def delete(self, key: Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.weight = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(size=len(self._entries), max_size=self.max_size,
+                          hits=self.hits, misses=self.misses, evictions=self.evictions, weight=self.weight)
+
+
+def get_task_size(task: TaskBase) -> int:
+    """ Approximate bytes held by a cached task, the strings are the only part of a variable size """
+    return (TASK_ENTRY_BYTES + sys.getsizeof(task.name) + sys.getsizeof(task.description)
+            + sum(ASSIGNEE_ENTRY_BYTES + sys.getsizeof(assignee.email) for assignee in task.assignees or ()))
+
+
+class LRUTaskCache(AbstractTaskCache):
+    """ Tasks by id, bounded by count and by approximate size, with an index of their ids by name """
+
+    def __init__(self, max_size: int, ttl_seconds: float, max_bytes: int):
+        self.tasks: LRUCache[int, TaskBase] = LRUCache(max_size, ttl_seconds, max_weight=max_bytes,
+                                                       weigher=get_task_size)
+        self.ids_by_name: LRUCache[str, int] = LRUCache(max_size, ttl_seconds)
+
+        # Generation of the last invalidation of each task id and name, a bounded number of them. A read started
+        # before one of them may hold the old row, and the forgotten ones raise the floor no read may be older than
+        self.max_invalidations: int = max_size
+        self._generation: int = 0
+        self._generations_floor: int = 0
+        self._invalidations: OrderedDict[Tuple[str, Hashable], int] = OrderedDict()
+
+    def get(self, task_id: int) -> Optional[TaskBase]:
+        return self.tasks.get(task_id)
+
+    def get_by_name(self, name: str) -> Optional[TaskBase]:
+        task_id: Optional[int] = self.ids_by_name.get(name)
+        if task_id is None:
+            return None
+
+        # Invalidating a task by id leaves its name in the index, the task must still have this name
+        task: Optional[TaskBase] = self.tasks.get(task_id)
+        return task if task and task.name == name else None
+
+    def get_generation(self) -> int:
+        return self._generation
+
+    def set(self, task: TaskBase, generation: Optional[int] = None) -> None:
+        """ A task read before the last invalidation of its id or name is not stored, it may be the old row """
+        if generation is not None and generation < max(self._generations_floor,
+                                                       self._invalidations.get(('id', task.id), 0),
+                                                       self._invalidations.get(('name', task.name), 0)):
+            return
+        self.tasks.set(task.id, task)
+        self.ids_by_name.set(task.name, task.id)
+
+    def invalidate(self, tasks_ids: Sequence[int] = (), names: Sequence[str] = ()) -> None:
+        self._generation += 1
+        for task_id in tasks_ids:
+            self.tasks.delete(task_id)
+            self._record_invalidation(('id', task_id))
+        for name in names:
+            self.ids_by_name.delete(name)
+            self._record_invalidation(('name', name))
+
+    def _record_invalidation(self, key: Tuple[str, Hashable]) -> None:
+        self._invalidations.pop(key, None)
+        self._invalidations[key] = self._generation
+        while len(self._invalidations) > self.max_invalidations:
+            _, generation = self._invalidations.popitem(last=False)
+            self._generations_floor = max(self._generations_floor, generation)
+
+    def clear(self) -> None:
+        self.tasks.clear()
+        self.ids_by_name.clear()
+        self._generation += 1
+        self._generations_floor = self._generation
+        self._invalidations.clear()
+
+    def stats(self) -> TaskCacheStats:
+        return TaskCacheStats(by_id=self.tasks.stats(), by_name=self.ids_by_name.stats())
+
+
+class NoTaskCache(AbstractTaskCache):
+    """ Every read goes to the database """
+
+    def get(self, task_id: int) -> Optional[TaskBase]:
+        return None
+
+    def get_by_name(self, name: str) -> Optional[TaskBase]:
+        return None
+
+    def get_generation(self) -> int:
+        return 0
+
+    def set(self, task: TaskBase, generation: Optional[int] = None) -> None:
+        pass
+
+    def invalidate(self, tasks_ids: Sequence[int] = (), names: Sequence[str] = ()) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> TaskCacheStats:
+        empty_stats = CacheStats(size=0, max_size=0, hits=0, misses=0, evictions=0)
+        return TaskCacheStats(by_id=empty_stats, by_name=empty_stats)
+
+
+def get_task_cache(task_cache_settings: TaskCacheSettings) -> AbstractTaskCache:
+    if not task_cache_settings.enabled:
+        return NoTaskCache()
+    return LRUTaskCache(task_cache_settings.max_size, task_cache_settings.ttl_seconds, task_cache_settings.max_bytes)
+
+
+user_cache: LRUCache[int, UserBase] = LRUCache(max_size=settings.user_cache.max_size,
+                                               ttl_seconds=settings.user_cache.ttl_seconds)
+task_cache: AbstractTaskCache = get_task_cache(settings.task_cache)
+
+
+def export_cache_stats(cache: str, stats: CacheStats) -> None:
+    cache_entries.labels(cache).set(stats.size)
+    cache_hits_total.labels(cache).set(stats.hits)
+    cache_misses_total.labels(cache).set(stats.misses)
+    cache_evictions_total.labels(cache).set(stats.evictions)
+
+
+def collect_cache_metrics() -> None:
+    export_cache_stats('user', user_cache.stats())
+    task_cache_stats: TaskCacheStats = task_cache.stats()
+    export_cache_stats('task_by_id', task_cache_stats.by_id)
+    export_cache_stats('task_by_name', task_cache_stats.by_name)
+
+
+metrics_registry.add_collector(collect_cache_metrics)
@@ -1,13 +1,81 @@
-from typing import List
 import asyncio
+import logging
+from email import policy
+from email.message import EmailMessage
+from typing import List, Iterator
 
-class EmailManager:
+from src.config import settings, EmailSettings
+from src.infrastructure.implementations.smtp import SMTPConnection, SMTPConnectionPool
+from src.services.notifications.interfaces import AbstractEmailBackend
+
+
+logger = logging.getLogger('app')
+
+
+class EmailManager(AbstractEmailBackend):
+    """ Mock backend, prints emails instead of sending them """
+
+    def __init__(self, max_concurrency: int = settings.email.max_concurrency):
+        self.max_concurrency: int = max_concurrency
 
     async def send_email(self, to: str, subject: str, body: str):
         print(f'Mock email sent to: {to} | Subject: {subject} | Body: {body}')
 
-    async def send_emails(self, receivers: List[str], subject: str, body: str):
-        tasks = []
-        for receiver in receivers:
-            tasks.append(asyncio.create_task(self.send_email(receiver, subject, body)))
-        await asyncio.gather(*tasks)
+    async def send_emails(self, receivers: List[str], subject: str, body: str) -> List[str]:
+        """ Sends with at most max_concurrency emails in flight, returns the receivers that failed """
+        failed_receivers: List[str] = []
+        receivers_iterator: Iterator[str] = iter(receivers)
+
+        async def worker() -> None:
+            for receiver in receivers_iterator:
+                try:
+                    await self.send_email(receiver, subject, body)
+                except Exception as e:
+                    logger.error('Email to %s was not sent: %r', receiver, e)
+                    failed_receivers.append(receiver)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(receivers)))))
+        return failed_receivers
+
+    async def close(self) -> None:
+        pass
+
+
+class SMTPEmailManager(EmailManager):
+    """ Sends emails through a pool of persistent SMTP connections """
+
+    def __init__(self, sender: str, pool: SMTPConnectionPool, max_concurrency: int = settings.email.max_concurrency):
+        super().__init__(max_concurrency)
+        self.sender: str = sender
+        self.pool: SMTPConnectionPool = pool
+
+    async def send_email(self, to: str, subject: str, body: str):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = to
+        message['Subject'] = subject
+        message.set_content(body)
+
+        async with self.pool.connection() as connection:
+            await connection.send_message(self.sender, to, message.as_bytes(policy=policy.SMTP))
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+def get_email_manager(email_settings: EmailSettings) -> EmailManager:
+    if email_settings.backend == 'mock':
+        return EmailManager(email_settings.max_concurrency)
+
+    def connection_factory() -> SMTPConnection:
+        return SMTPConnection(email_settings.smtp_host, email_settings.smtp_port,
+                              timeout_seconds=email_settings.smtp_timeout_seconds,
+                              use_tls=email_settings.smtp_use_tls, start_tls=email_settings.smtp_start_tls,
+                              username=email_settings.smtp_username, password=email_settings.smtp_password)
+
+    pool = SMTPConnectionPool(connection_factory, size=email_settings.smtp_pool_size,
+                              max_messages_per_connection=email_settings.smtp_max_messages_per_connection)
+    return SMTPEmailManager(email_settings.sender, pool, email_settings.max_concurrency)
+
+
+email_manager: EmailManager = get_email_manager(settings.email)
@@ -0,0 +1,90 @@
+import json
+import logging
+import queue
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Sequence
+
+
+# Attributes every LogRecord has, anything else was passed through `extra=` and goes to the JSON output
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """ One JSON object per line, fields passed with `extra=` are added to it """
+
+    def format(self, record: logging.LogRecord) -> str:
+        log: Dict = {
+            'timestamp': datetime.fromtimestamp(record.created, UTC).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            log['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            log['stack'] = self.formatStack(record.stack_info)
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and key not in log:
+                log[key] = value
+
+        return json.dumps(log, default=str, ensure_ascii=False)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+        Only merges the message arguments on the calling thread, since they may change after the call returns.
+        Formatting (timestamps, JSON, tracebacks) and writing are left to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class QueueLogging:
+    """ Moves the handlers of the given loggers behind a queue served by a QueueListener thread """
+
+    def __init__(self):
+        self._listener: Optional[QueueListener] = None
+        self._original_handlers: Dict[str, List[logging.Handler]] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._listener is not None
+
+    def start(self, logger_names: Sequence[str]) -> None:
+        if self.is_running:
+            return
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        handlers: List[logging.Handler] = []
+
+        for logger_name in logger_names:
+            logger = logging.getLogger(logger_name)
+            if not logger.handlers:
+                continue
+            self._original_handlers[logger_name] = list(logger.handlers)
+            handlers.extend(handler for handler in logger.handlers if handler not in handlers)
+            logger.handlers = [queue_handler]
+
+        self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """ Writes out what is left in the queue and gives the handlers back to their loggers """
+        if not self.is_running:
+            return
+
+        self._listener.stop()
+        self._listener = None
+        for logger_name, handlers in self._original_handlers.items():
+            logging.getLogger(logger_name).handlers = handlers
+        self._original_handlers = {}
+
+
+queue_logging = QueueLogging()
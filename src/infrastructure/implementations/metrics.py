@@ -0,0 +1,213 @@
+import bisect
+import math
+from typing import Callable, Dict, Generic, Iterator, List, Sequence, Tuple, TypeVar
+
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_LATENCY_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                                          0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+Child = TypeVar('Child')
+MetricType = TypeVar('MetricType', bound='Metric')
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if not label_names:
+        return ''
+    labels = ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values))
+    return f'{{{labels}}}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        """ For a collector copying a total kept by the component it measures """
+        self.value = value
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'bucket_counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets: Tuple[float, ...] = buckets
+        self.bucket_counts: List[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric(Generic[Child]):
+    """ Metric family, one child per combination of label values """
+    type_name: str = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Child] = {}
+
+    def labels(self, *label_values: str) -> Child:
+        child = self._children.get(label_values)
+        if child is None:
+            if len(label_values) != len(self.label_names):
+                raise ValueError(f'{self.name} expects labels {self.label_names}, got {label_values}')
+            child = self._children[label_values] = self._create_child()
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.type_name}'
+        for label_values, child in list(self._children.items()):
+            yield from self._render_child(label_values, child)
+
+    def _create_child(self) -> Child:
+        raise NotImplementedError
+
+    def _render_child(self, label_values: Tuple[str, ...], child: Child) -> Iterator[str]:
+        yield f'{self.name}{_format_labels(self.label_names, label_values)} {_format_value(child.value)}'
+
+
+class Counter(Metric[_CounterChild]):
+    type_name = 'counter'
+
+    def _create_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(Metric[_GaugeChild]):
+    type_name = 'gauge'
+
+    def _create_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(Metric[_HistogramChild]):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+
+    def _create_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, label_values: Tuple[str, ...], child: _HistogramChild) -> Iterator[str]:
+        label_names = self.label_names + ('le',)
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(self.buckets + (math.inf,), child.bucket_counts):
+            cumulative_count += bucket_count
+            labels = _format_labels(label_names, label_values + (_format_value(upper_bound),))
+            yield f'{self.name}_bucket{labels} {cumulative_count}'
+
+        labels = _format_labels(self.label_names, label_values)
+        yield f'{self.name}_sum{labels} {_format_value(child.sum)}'
+        yield f'{self.name}_count{labels} {child.count}'
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: MetricType) -> MetricType:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """ Called before every render, for components keeping their own counters """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """ Prometheus text exposition format 0.0.4 """
+        for collector in self._collectors:
+            collector()
+        return '\n'.join(line for metric in self._metrics.values() for line in metric.render()) + '\n'
+
+
+metrics_registry = MetricsRegistry()
+
+http_requests_in_flight: Gauge = metrics_registry.register(Gauge(
+    'http_requests_in_flight', 'HTTP requests being processed', ['method']))
+http_request_duration_seconds: Histogram = metrics_registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template', ['method', 'route', 'status']))
+
+db_statement_duration_seconds: Histogram = metrics_registry.register(Histogram(
+    'db_statement_duration_seconds', 'Duration of SQL statements (count is the number of statements)',
+    ['operation', 'table'], buckets=SQL_LATENCY_BUCKETS))
+db_statement_rows_total: Counter = metrics_registry.register(Counter(
+    'db_statement_rows_total', 'Rows affected by INSERT/UPDATE/DELETE statements', ['operation', 'table']))
+db_pool_checkout_wait_seconds: Histogram = metrics_registry.register(Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a connection from the pool',
+    buckets=SQL_LATENCY_BUCKETS))
+db_pool_connections_checked_out: Gauge = metrics_registry.register(Gauge(
+    'db_pool_connections_checked_out', 'Connections currently checked out of the pool'))
+
+task_events_subscribers: Gauge = metrics_registry.register(Gauge(
+    'task_events_subscribers', 'Clients connected to the task events stream'))
+task_events_dropped_total: Counter = metrics_registry.register(Counter(
+    'task_events_dropped_total', 'Task events dropped for slow clients, which were asked to resync instead'))
+
+cache_entries: Gauge = metrics_registry.register(Gauge(
+    'cache_entries', 'Entries held by an in-process cache', ['cache']))
+cache_hits_total: Counter = metrics_registry.register(Counter(
+    'cache_hits_total', 'Lookups answered by an in-process cache', ['cache']))
+cache_misses_total: Counter = metrics_registry.register(Counter(
+    'cache_misses_total', 'Lookups an in-process cache could not answer, expired entries included', ['cache']))
+cache_evictions_total: Counter = metrics_registry.register(Counter(
+    'cache_evictions_total', 'Entries evicted from an in-process cache to stay under its bounds', ['cache']))
+
+password_hashing_in_flight: Gauge = metrics_registry.register(Gauge(
+    'password_hashing_in_flight', 'Password hashes running or waiting for a worker'))
+password_hashing_queue_depth: Gauge = metrics_registry.register(Gauge(
+    'password_hashing_queue_depth', 'Password hashes waiting for a worker'))
+password_hashing_queue_wait_seconds: Histogram = metrics_registry.register(Histogram(
+    'password_hashing_queue_wait_seconds', 'Time password hashes spent waiting for a worker'))
+password_hashing_rejected_total: Counter = metrics_registry.register(Counter(
+    'password_hashing_rejected_total', 'Password hashes rejected with 503 because the queue was full'))
+
+admission_concurrency_limit: Gauge = metrics_registry.register(Gauge(
+    'admission_concurrency_limit', 'Requests the admission control lets run at once, adapted to their latency',
+    ['limiter']))
+admission_in_flight: Gauge = metrics_registry.register(Gauge(
+    'admission_in_flight', 'Requests admitted and being processed', ['limiter']))
+admission_queue_depth: Gauge = metrics_registry.register(Gauge(
+    'admission_queue_depth', 'Requests waiting to be admitted', ['limiter']))
+admission_queue_wait_seconds: Histogram = metrics_registry.register(Histogram(
+    'admission_queue_wait_seconds', 'Time admitted requests spent waiting in the queue', ['limiter']))
+admission_rejected_total: Counter = metrics_registry.register(Counter(
+    'admission_rejected_total', 'Requests rejected with 503 because the queue was full or the wait timed out',
+    ['limiter', 'reason']))
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Any, AsyncContextManager, Callable, Coroutine, List, Optional, Sequence, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db.models import Notification
+from src.infrastructure.implementations.email import email_manager
+from src.repositories.notification.repositories import NotificationRepository
+from src.services.notifications.interfaces import AbstractEmailBackend, AbstractNotificationRepository
+
+
+logger = logging.getLogger('app')
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+class NotificationDispatcher:
+    """ Background worker that delivers the notification outbox through an email backend """
+
+    def __init__(self, email_backend: AbstractEmailBackend, batch_size: int, poll_interval_seconds: float,
+                 lease_seconds: float, max_attempts: int, backoff_base_seconds: float, backoff_max_seconds: float,
+                 notification_repository_class: Type[AbstractNotificationRepository] = NotificationRepository,
+                 max_concurrency: int = settings.email.max_concurrency):
+        self.email_backend: AbstractEmailBackend = email_backend
+        self.notification_repository_class: Type[AbstractNotificationRepository] = notification_repository_class
+        self.batch_size: int = batch_size
+        self.poll_interval_seconds: float = poll_interval_seconds
+        self.lease_seconds: float = lease_seconds
+        self.max_attempts: int = max_attempts
+        self.backoff_base_seconds: float = backoff_base_seconds
+        self.backoff_max_seconds: float = backoff_max_seconds
+        self.max_concurrency: int = max_concurrency
+
+        self._session_factory: Optional[SessionFactory] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session_factory: SessionFactory) -> None:
+        if self._task is not None:
+            return
+
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def dispatch_batch(self, session_factory: Optional[SessionFactory] = None) -> int:
+        """ Sends one batch of due notifications and returns how many were claimed """
+        now = datetime.now(UTC)
+        async with (session_factory or self._session_factory)() as session:
+            notification_repository = self.notification_repository_class(session)
+
+            notifications: Sequence[Notification] = await notification_repository.claim_due_notifications(
+                self.batch_size, now, now + timedelta(seconds=self.lease_seconds))
+            await notification_repository.commit()
+            if not notifications:
+                return 0
+
+            results = await asyncio.gather(*self._get_sendings(notifications), return_exceptions=True)
+
+            sent_ids: List[int] = []
+            for notification, result in zip(notifications, results):
+                if isinstance(result, Exception):
+                    await self._handle_failure(notification_repository, notification, result)
+                else:
+                    sent_ids.append(notification.id)
+
+            await notification_repository.mark_sent(sent_ids)
+            await notification_repository.commit()
+
+        return len(notifications)
+
+    def _get_sendings(self, notifications: Sequence[Notification]) -> List[Coroutine[Any, Any, None]]:
+        """ One sending per notification, at most max_concurrency of them in flight as with send_emails """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(notification: Notification) -> None:
+            async with semaphore:
+                await self.email_backend.send_email(notification.recipient, notification.subject, notification.body)
+
+        return [send(notification) for notification in notifications]
+
+    def get_backoff_seconds(self, attempts: int) -> float:
+        return min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempts - 1))
+
+    async def _handle_failure(self, notification_repository: AbstractNotificationRepository,
+                              notification: Notification, error: Exception) -> None:
+        attempts = notification.attempts + 1
+        if attempts >= self.max_attempts:
+            logger.error('Notification %s to %s is dead after %s attempts: %r',
+                         notification.id, notification.recipient, attempts, error)
+            await notification_repository.mark_dead(notification.id, attempts, repr(error))
+            return
+
+        next_attempt_at = datetime.now(UTC) + timedelta(seconds=self.get_backoff_seconds(attempts))
+        logger.warning('Notification %s to %s failed, attempt %s: %r',
+                       notification.id, notification.recipient, attempts, error)
+        await notification_repository.reschedule(notification.id, attempts, repr(error), next_attempt_at)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_batch()
+            except Exception as e:
+                logger.error(e)
+                claimed = 0
+
+            # A full batch means there may be more due notifications, so the next one is taken right away
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+
+notification_dispatcher = NotificationDispatcher(
+    email_manager,
+    batch_size=settings.notifications.batch_size,
+    poll_interval_seconds=settings.notifications.poll_interval_seconds,
+    lease_seconds=settings.notifications.lease_seconds,
+    max_attempts=settings.notifications.max_attempts,
+    backoff_base_seconds=settings.notifications.backoff_base_seconds,
+    backoff_max_seconds=settings.notifications.backoff_max_seconds,
+)
@@ -1,8 +1,110 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
 import bcrypt
+from fastapi import HTTPException
 
+from src.config import settings
+from src.exceptions import get_exception_503_service_unavailable_with_detail
+from src.infrastructure.dto import PasswordHashingStats
+from src.infrastructure.implementations.metrics import (password_hashing_in_flight, password_hashing_queue_depth,
+                                                        password_hashing_queue_wait_seconds,
+                                                        password_hashing_rejected_total)
 from src.services.auth.interfaces import AbstractPasswordManager
 
 
+logger = logging.getLogger('app')
+Result = TypeVar('Result')
+
+
+def _run_timed(func: Callable[..., Result], *args) -> Tuple[float, Result]:
+    """ Runs inside the worker, returns the wall clock start time to measure the time spent in the queue """
+    started_at = time.time()
+    return started_at, func(*args)
+
+
+class PasswordHashingPool:
+    """ Bounded worker pool for bcrypt, so hashing does not block the event loop """
+
+    def __init__(self, executor: str, workers: int, max_queue_size: int):
+        self.executor_type: str = executor
+        self.workers: int = workers
+        self.max_queue_size: int = max_queue_size
+
+        self._executor: Optional[Executor] = None
+        self.in_flight: int = 0
+        self.completed: int = 0
+        self.rejected: int = 0
+        self.total_wait_seconds: float = 0.0
+        self.max_wait_seconds: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def stats(self) -> PasswordHashingStats:
+        return PasswordHashingStats(
+            in_flight=self.in_flight,
+            queue_depth=self.queue_depth,
+            completed=self.completed,
+            rejected=self.rejected,
+            average_wait_seconds=self.total_wait_seconds / self.completed if self.completed else 0.0,
+            max_wait_seconds=self.max_wait_seconds,
+        )
+
+    async def run(self, func: Callable[..., Result], *args) -> Result | HTTPException:
+        if self.in_flight >= self.workers + self.max_queue_size:
+            self.rejected += 1
+            password_hashing_rejected_total.labels().inc()
+            logger.warning('Password hashing queue is full, %s requests are waiting', self.queue_depth)
+            raise get_exception_503_service_unavailable_with_detail('Server is busy, try again later')
+
+        self.in_flight += 1
+        self._set_gauges()
+        submitted_at = time.time()
+        try:
+            started_at, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _run_timed, func, *args)
+        finally:
+            self.in_flight -= 1
+            self._set_gauges()
+
+        wait_seconds = max(0.0, started_at - submitted_at)
+        password_hashing_queue_wait_seconds.labels().observe(wait_seconds)
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        return result
+
+    def _set_gauges(self) -> None:
+        password_hashing_in_flight.labels().set(self.in_flight)
+        password_hashing_queue_depth.labels().set(self.queue_depth)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='password_hashing')
+        return self._executor
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor=settings.password_hashing.executor,
+    workers=settings.password_hashing.workers,
+    max_queue_size=settings.password_hashing.max_queue_size,
+)
+
+
 class PasswordManager(AbstractPasswordManager):
 
     @staticmethod
@@ -14,3 +116,11 @@ class PasswordManager(AbstractPasswordManager):
     @staticmethod
     def validate_password(password: str, hashed_password: bytes) -> bool:
         return bcrypt.checkpw(password.encode(), hashed_password)
+
+    @staticmethod
+    async def async_hash_password(password: str) -> bytes:
+        return await password_hashing_pool.run(PasswordManager.hash_password, password)
+
+    @staticmethod
+    async def async_validate_password(password: str, hashed_password: bytes) -> bool:
+        return await password_hashing_pool.run(PasswordManager.validate_password, password, hashed_password)
@@ -0,0 +1,200 @@
+import asyncio
+import base64
+import logging
+import re
+import socket
+import ssl
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger('app')
+Reply = Tuple[int, List[str]]
+
+
+class SMTPError(Exception):
+    """ The server rejected a command, the connection itself is still usable """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f'{code} {message}')
+        self.code: int = code
+        self.message: str = message
+
+
+class SMTPConnection:
+    """ One persistent SMTP session, several messages are sent through it one after another """
+
+    def __init__(self, host: str, port: int, timeout_seconds: float,
+                 use_tls: bool = False, start_tls: bool = False,
+                 username: Optional[str] = None, password: Optional[str] = None):
+        self.host: str = host
+        self.port: int = port
+        self.timeout_seconds: float = timeout_seconds
+        self.use_tls: bool = use_tls
+        self.start_tls: bool = start_tls
+        self.username: Optional[str] = username
+        self.password: Optional[str] = password
+
+        self.extensions: Dict[str, str] = {}
+        self.messages_sent: int = 0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def supports_pipelining(self) -> bool:
+        return 'pipelining' in self.extensions
+
+    @property
+    def is_closed(self) -> bool:
+        return self._writer is None or self._writer.is_closing() or self._reader.at_eof()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=ssl.create_default_context() if self.use_tls else None),
+            self.timeout_seconds)
+
+        await self._expect(220)
+        await self._ehlo()
+
+        if self.start_tls:
+            await self._command('STARTTLS', 220)
+            await self._writer.start_tls(ssl.create_default_context())
+            await self._ehlo()
+
+        if self.username:
+            credentials = base64.b64encode(f'\0{self.username}\0{self.password or ""}'.encode()).decode()
+            await self._command(f'AUTH PLAIN {credentials}', 235)
+
+    async def send_message(self, sender: str, recipient: str, message: bytes) -> None:
+        envelope = [f'MAIL FROM:<{sender}>', f'RCPT TO:<{recipient}>', 'DATA']
+
+        if self.supports_pipelining:
+            # RFC 2920: the whole envelope goes out in one write and costs one round trip instead of three
+            await self._write(*envelope)
+            replies: List[Reply] = [await self._read_reply() for _ in envelope]
+        else:
+            replies = []
+            for command in envelope:
+                await self._write(command)
+                replies.append(await self._read_reply())
+                if replies[-1][0] >= 400:
+                    break
+
+        for (code, lines), expected_code in zip(replies, (250, 250, 354)):
+            if code != expected_code:
+                if replies[-1][0] == 354:
+                    await self._write('.')
+                    await self._read_reply()
+                await self._command('RSET', 250)
+                raise SMTPError(code, ' '.join(lines))
+
+        await self._write_data(message)
+        await self._expect(250)
+        self.messages_sent += 1
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+
+        try:
+            if not self.is_closed:
+                await self._write('QUIT')
+                await self._read_reply()
+        except (OSError, asyncio.TimeoutError, SMTPError):
+            pass
+        finally:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+    async def _ehlo(self) -> None:
+        _, lines = await self._command(f'EHLO {socket.getfqdn()}', 250)
+        self.extensions = {}
+        for line in lines[1:]:
+            keyword, _, params = line.partition(' ')
+            self.extensions[keyword.lower()] = params
+
+    async def _command(self, command: str, expected_code: int) -> Reply:
+        await self._write(command)
+        return await self._expect(expected_code)
+
+    async def _expect(self, expected_code: int) -> Reply:
+        code, lines = await self._read_reply()
+        if code != expected_code:
+            raise SMTPError(code, ' '.join(lines))
+        return code, lines
+
+    async def _write(self, *commands: str) -> None:
+        self._writer.write(''.join(f'{command}\r\n' for command in commands).encode())
+        await asyncio.wait_for(self._writer.drain(), self.timeout_seconds)
+
+    async def _write_data(self, message: bytes) -> None:
+        message = re.sub(rb'(?m)^\.', b'..', message)
+        if not message.endswith(b'\r\n'):
+            message += b'\r\n'
+        self._writer.write(message + b'.\r\n')
+        await asyncio.wait_for(self._writer.drain(), self.timeout_seconds)
+
+    async def _read_reply(self) -> Reply:
+        lines: List[str] = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout_seconds)
+            if not line:
+                raise ConnectionError('SMTP server closed the connection')
+
+            lines.append(line[4:].strip().decode(errors='replace'))
+            if line[3:4] != b'-':
+                return int(line[:3]), lines
+
+
+class SMTPConnectionPool:
+    """ Keeps up to `size` SMTP connections open, `size` is also the cap on messages sent at the same time """
+
+    def __init__(self, connection_factory: Callable[[], SMTPConnection], size: int,
+                 max_messages_per_connection: int):
+        self.connection_factory: Callable[[], SMTPConnection] = connection_factory
+        self.size: int = size
+        self.max_messages_per_connection: int = max_messages_per_connection
+
+        self.connections_opened: int = 0
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(size)
+        self._idle: List[SMTPConnection] = []
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTPConnection]:
+        async with self._semaphore:
+            connection: SMTPConnection = await self._acquire()
+            try:
+                yield connection
+            except SMTPError:
+                await self._release(connection)
+                raise
+            except BaseException:
+                await connection.close()
+                raise
+            await self._release(connection)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(connection.close() for connection in idle))
+
+    async def _acquire(self) -> SMTPConnection:
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.is_closed:
+                return connection
+            await connection.close()
+
+        connection = self.connection_factory()
+        await connection.connect()
+        self.connections_opened += 1
+        return connection
+
+    async def _release(self, connection: SMTPConnection) -> None:
+        if connection.is_closed or connection.messages_sent >= self.max_messages_per_connection:
+            await connection.close()
+        else:
+            self._idle.append(connection)
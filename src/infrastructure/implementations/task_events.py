@@ -0,0 +1,113 @@
+import asyncio
+from collections import defaultdict, deque
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Set
+
+from fastapi import HTTPException
+
+from src.config import settings
+from src.exceptions import get_exception_503_service_unavailable_with_detail
+from src.infrastructure.dto import TaskEventsStats
+from src.infrastructure.implementations.metrics import task_events_dropped_total, task_events_subscribers
+from src.services.task_tracker.dto import TaskEvent, TaskEventType
+from src.services.task_tracker.interfaces import AbstractTaskEventsBroker
+
+
+class TaskEventsSubscription:
+    """
+        Events waiting to be sent to one client. When the client falls buffer_size events behind they are
+        dropped for a single resync event and nothing more is buffered until the client has received it
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size: int = buffer_size
+        self.dropped: int = 0
+
+        self._events: Deque[TaskEvent] = deque()
+        self._needs_resync: bool = False
+        self._ready: asyncio.Event = asyncio.Event()
+
+    def put(self, event: TaskEvent) -> int:
+        """ Returns the number of events dropped """
+        dropped: int = 0
+        if self._needs_resync:
+            dropped = 1
+        elif len(self._events) >= self.buffer_size:
+            dropped = len(self._events) + 1
+            self._events.clear()
+            self._events.append(TaskEvent(id=event.id, type=TaskEventType.RESYNC))
+            self._needs_resync = True
+        else:
+            self._events.append(event)
+
+        self.dropped += dropped
+        self._ready.set()
+        return dropped
+
+    async def get_events(self, timeout: float) -> List[TaskEvent]:
+        """ The events buffered since the previous call, waits for at most timeout seconds if there are none """
+        if not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        events: List[TaskEvent] = list(self._events)
+        self._events.clear()
+        self._needs_resync = False
+        return events
+
+
+class TaskEventsBroker(AbstractTaskEventsBroker):
+    """ In-process pub/sub, a client only gets the events of the tasks it is responsible for or assigned to """
+
+    def __init__(self, buffer_size: int, max_subscribers: int):
+        self.buffer_size: int = buffer_size
+        self.max_subscribers: int = max_subscribers
+
+        self._subscriptions: Dict[int, Set[TaskEventsSubscription]] = defaultdict(set)
+        self.subscribers: int = 0
+        self.published: int = 0
+        self.dropped: int = 0
+
+    def publish(self, event: TaskEvent, users_ids: Iterable[int]) -> None:
+        self.published += 1
+        event = event.model_copy(update={'id': self.published})
+
+        for user_id in set(users_ids):
+            for subscription in self._subscriptions.get(user_id, ()):
+                dropped: int = subscription.put(event)
+                if dropped:
+                    self.dropped += dropped
+                    task_events_dropped_total.labels().inc(dropped)
+
+    def check_capacity(self) -> Optional[HTTPException]:
+        if self.subscribers >= self.max_subscribers:
+            raise get_exception_503_service_unavailable_with_detail('Too many clients listen to task events',
+                                                                    retry_after=5)
+
+    async def listen(self, user_id: int, heartbeat_seconds: float) -> AsyncIterator[List[TaskEvent]]:
+        """
+            Yields an empty batch once subscribed, then the batches of events for the user,
+            an empty one when nothing happened for heartbeat_seconds
+        """
+        subscription = TaskEventsSubscription(self.buffer_size)
+        self._subscriptions[user_id].add(subscription)
+        self.subscribers += 1
+        task_events_subscribers.labels().inc()
+        try:
+            yield []
+            while True:
+                yield await subscription.get_events(heartbeat_seconds)
+        finally:
+            self._subscriptions[user_id].discard(subscription)
+            if not self._subscriptions[user_id]:
+                del self._subscriptions[user_id]
+            self.subscribers -= 1
+            task_events_subscribers.labels().dec()
+
+    def stats(self) -> TaskEventsStats:
+        return TaskEventsStats(subscribers=self.subscribers, published=self.published, dropped=self.dropped)
+
+
+task_events_broker = TaskEventsBroker(settings.task_events.buffer_size, settings.task_events.max_subscribers)
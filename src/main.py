@@ -1,14 +1,65 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
+from fastapi import Depends, FastAPI
+
+from src.config import settings
+from src.db.database import db_helper
+from src.api.middlewares import MetricsMiddleware, QueryCounterMiddleware
+from src.infrastructure.implementations.password_manager import password_hashing_pool
+from src.infrastructure.implementations.admission_control import AdaptiveConcurrencyLimiter
+from src.infrastructure.implementations.notification_dispatcher import notification_dispatcher
+from src.infrastructure.implementations.email import email_manager
+from src.infrastructure.implementations.logging_queue import queue_logging
 from src.api.routes.auth.router import auth as auth_router
 from src.api.routes.task_tracker.router import task_tracker as task_tracker_router
+from src.api.routes.metrics.router import metrics as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.global_settings.log_queue:
+        queue_logging.start(list(settings.global_settings.logger_config.get('loggers', {})))
+    db_helper.connect()
+    notification_dispatcher.start(db_helper.session_factory)
+    yield
+    await notification_dispatcher.stop()
+    await email_manager.close()
+    await db_helper.dispose()
+    password_hashing_pool.shutdown()
+    queue_logging.stop()
+
 
 api_description = ('API Description: When a user is created, he is given the role: USER,\n'
                    'For now, they can only be changed through the database.\n'
                    'Each endpoint has a list of allowable roles.\n'
                    'Correct execution of Task Tracker endpoints returns the name of the task')
-app = FastAPI(root_path='/api/v1', description=api_description)
+app = FastAPI(root_path='/api/v1', description=api_description, lifespan=lifespan)
 
 
 app.include_router(task_tracker_router, tags=['Task Tracker'])
-app.include_router(auth_router, tags=['Auth'])
+# Routers hashing passwords get their own admission control, so a login storm queues in front of them
+# instead of slowing down every other route
+auth_dependencies = []
+if settings.auth_admission.enabled:
+    auth_limiter = AdaptiveConcurrencyLimiter(
+        name='auth',
+        min_limit=settings.auth_admission.min_limit,
+        max_limit=settings.auth_admission.max_limit,
+        initial_limit=settings.auth_admission.initial_limit,
+        max_queue_size=settings.auth_admission.max_queue_size,
+        max_queue_wait_seconds=settings.auth_admission.max_queue_wait_seconds,
+        latency_target_seconds=settings.auth_admission.latency_target_seconds,
+        backoff_ratio=settings.auth_admission.backoff_ratio,
+    )
+    auth_dependencies.append(Depends(auth_limiter.admit))
+app.include_router(auth_router, tags=['Auth'], dependencies=auth_dependencies)
+
+if settings.query_counter.enabled:
+    app.add_middleware(QueryCounterMiddleware,
+                       budget=settings.query_counter.budget,
+                       repeated_statement_threshold=settings.query_counter.repeated_statement_threshold,
+                       raise_on_violation=settings.query_counter.action == 'raise')
+
+if settings.metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
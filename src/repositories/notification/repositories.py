@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Dict, Iterable, Sequence
+
+from sqlalchemy import select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.enums import NotificationStatus
+from src.db.models import Notification
+from src.services.notifications.interfaces import AbstractNotificationRepository
+
+
+class NotificationRepository(AbstractNotificationRepository):
+
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    async def add_notifications(self, receivers: Iterable[str], subject: str, body: str) -> None:
+        await self.add_personal_notifications({receiver: body for receiver in receivers}, subject)
+
+    async def add_personal_notifications(self, bodies_by_receiver: Dict[str, str], subject: str) -> None:
+        if not bodies_by_receiver:
+            return
+
+        await self.session.execute(insert(Notification), [
+            {'recipient': receiver, 'subject': subject, 'body': body}
+            for receiver, body in bodies_by_receiver.items()
+        ])
+
+    async def claim_due_notifications(self, limit: int, now: datetime,
+                                      lease_until: datetime) -> Sequence[Notification]:
+        # Moving next_attempt_at forward leases the rows, if the process dies while sending
+        # they become due again once the lease expires
+        due_notifications_ids = (
+            select(Notification.id)
+            .where(Notification.status == NotificationStatus.PENDING, Notification.next_attempt_at <= now)
+            .order_by(Notification.next_attempt_at, Notification.id)
+            .limit(limit)
+        )
+        query = (
+            update(Notification)
+            .where(Notification.id.in_(due_notifications_ids.scalar_subquery()))
+            .values(next_attempt_at=lease_until)
+            .returning(Notification)
+        )
+        result = await self.session.execute(query, execution_options={'synchronize_session': False})
+        return result.scalars().all()
+
+    async def mark_sent(self, notifications_ids: Sequence[int]) -> None:
+        if not notifications_ids:
+            return
+
+        await self.session.execute(
+            update(Notification)
+            .where(Notification.id.in_(notifications_ids))
+            .values(status=NotificationStatus.SENT, attempts=Notification.attempts + 1, last_error=None)
+        )
+
+    async def reschedule(self, notification_id: int, attempts: int, error: str, next_attempt_at: datetime) -> None:
+        await self.session.execute(
+            update(Notification)
+            .where(Notification.id == notification_id)
+            .values(attempts=attempts, last_error=error, next_attempt_at=next_attempt_at)
+        )
+
+    async def mark_dead(self, notification_id: int, attempts: int, error: str) -> None:
+        await self.session.execute(
+            update(Notification)
+            .where(Notification.id == notification_id)
+            .values(status=NotificationStatus.DEAD, attempts=attempts, last_error=error)
+        )
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+
+class TestNotificationRepository(NotificationRepository):
+
+    async def commit(self) -> None:
+        pass
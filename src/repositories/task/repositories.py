@@ -1,69 +1,513 @@
 import logging
+from collections import defaultdict, Counter
+from enum import Enum
 from fastapi import HTTPException
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, Sequence, List, Tuple, TypeVar, Iterable
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert, tuple_, literal, or_, union, union_all, Select, Update
+from sqlalchemy import func, ColumnElement, String, cast, true
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload, aliased
 
-from src.services.task_tracker.dto import CreateTask
-from src.db.models import Task, TaskUser
-from src.domain.task_tracker.entities import TaskBase
-from src.services.task_tracker.interfaces import AbstractTaskRepository
+from src.services.task_tracker.dto import CreateTask, TaskFilter, TaskCursor, ListedTask, TaskReceivers
+from src.services.task_tracker.dto import ImportTask, ChangesCursor, TaskChange, TaskStats, TaskIdCursor
+from src.exceptions import get_exception_400_bad_request_with_detail
+from src.db.enums import TaskCounterDimension, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser, User, TaskTombstone, TaskCounter
+from src.domain.task_tracker.entities import TaskBase, TaskAssignee
+from src.infrastructure.implementations.cache import task_cache
+from src.services.task_tracker.interfaces import AbstractTaskRepository, AbstractTaskCache
 
 
 logger = logging.getLogger('app')
+Statement = TypeVar('Statement', Select, Update)
+
+# Keeps IN lists well below the SQLite limit of bound parameters per statement
+IN_CHUNK_SIZE = 5000
+
+
+# Columns of the task counted by the task counters
+COUNTED_COLUMNS: Dict[str, TaskCounterDimension] = {
+    'status': TaskCounterDimension.STATUS,
+    'priority': TaskCounterDimension.PRIORITY,
+    'responsible_person': TaskCounterDimension.RESPONSIBLE_PERSON,
+}
+CountersDeltas = Counter[Tuple[TaskCounterDimension, str]]
+
+
+def get_next_change_seq() -> ColumnElement[int]:
+    """
+        One more than the last change of a task or a tombstone, evaluated inside the writing statement.
+        SQLite lets one transaction write at a time, so the sequence follows the order of the commits
+    """
+    changed_task, tombstone = aliased(Task), aliased(TaskTombstone)
+    return func.max(func.coalesce(select(func.max(changed_task.change_seq)).scalar_subquery(), 0),
+                    func.coalesce(select(func.max(tombstone.change_seq)).scalar_subquery(), 0)) + 1
+
+
+def get_counter_value(value: Any) -> str:
+    """ The value of a task column as the counters store it: enum names and user ids """
+    return value.name if isinstance(value, Enum) else str(value)
+
+
+def get_updated_tasks_deltas(columns: Sequence[str], previous_values: Iterable[Sequence[Any]],
+                             new_values: Iterable[Sequence[Any]]) -> CountersDeltas:
+    """ Updated tasks leave the counters of their previous values of `columns` and join the ones of the new values """
+    deltas: CountersDeltas = Counter()
+    for previous_row, new_row in zip(previous_values, new_values):
+        for column, previous_value, new_value in zip(columns, previous_row, new_row):
+            deltas[COUNTED_COLUMNS[column], get_counter_value(previous_value)] -= 1
+            deltas[COUNTED_COLUMNS[column], get_counter_value(new_value)] += 1
+    return deltas
+
+
+def get_created_tasks_deltas(tasks: Sequence[Dict[str, Any]], assignees_ids: Iterable[int]) -> CountersDeltas:
+    """ What new tasks add to the counters, values are stored as in the task table: enum names and user ids """
+    deltas: CountersDeltas = Counter({(TaskCounterDimension.TOTAL, ''): len(tasks)})
+    for task in tasks:
+        deltas[TaskCounterDimension.STATUS, task['status'].name] += 1
+        deltas[TaskCounterDimension.PRIORITY, task['priority'].name] += 1
+        deltas[TaskCounterDimension.RESPONSIBLE_PERSON, str(task['responsible_person'])] += 1
+    for user_id in assignees_ids:
+        deltas[TaskCounterDimension.ASSIGNEE, str(user_id)] += 1
+    return deltas
 
 
 class TaskRepository(AbstractTaskRepository):
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: AbstractTaskCache = task_cache):
         self.session: AsyncSession = session
+        self.cache: AbstractTaskCache = cache
+        self._invalidated_tasks: List[Tuple[Sequence[int], Sequence[str]]] = []
 
-    async def get_task_model_by(self, filter_by: Dict[str, Any]) -> Optional[Task]:
-        query = select(Task).filter_by(**filter_by)
+    async def get_task_model_by(self, filter_by: Dict[str, Any], with_assignees: bool = False) -> Optional[Task]:
+        query = select(Task).filter_by(**filter_by).execution_options(populate_existing=True)
+        query = query.options(selectinload(Task.assignees).raiseload('*') if with_assignees
+                              else raiseload(Task.assignees))
         result = await self.session.execute(query)
-        task = result.scalars().unique().first()
+        task = result.scalars().first()
         return task
 
     async def get_task_by(self, filter_by: Dict[str, Any]) -> Optional[TaskBase]:
-        task = await self.get_task_model_by(filter_by)
-        return TaskBase.model_validate(task) if task else None
+        """ Reads through the task cache, a lookup by id or by name alone is answered from it """
+        cached_task: Optional[TaskBase] = self._get_cached_task(filter_by)
+        if cached_task:
+            return cached_task
+
+        # A write committed while the task is read invalidates it after this read may have seen the old row
+        generation: int = self.cache.get_generation()
+        task_model: Optional[Task] = await self.get_task_model_by(filter_by, with_assignees=True)
+        if not task_model:
+            return None
+
+        task: TaskBase = TaskBase.model_validate(task_model).model_copy(update={
+            'assignees': [TaskAssignee.model_validate(assignee) for assignee in task_model.assignees]})
+        self.cache.set(task, generation)
+        return task
+
+    def _get_cached_task(self, filter_by: Dict[str, Any]) -> Optional[TaskBase]:
+        if filter_by.keys() == {'id'}:
+            return self.cache.get(filter_by['id'])
+        if filter_by.keys() == {'name'}:
+            return self.cache.get_by_name(filter_by['name'])
+        return None
+
+    async def stream_tasks(self, task_filter: TaskFilter, after: Optional[TaskCursor],
+                           limit: int) -> AsyncIterator[ListedTask]:
+        query = select(Task.id, Task.name, Task.description, Task.responsible_person,
+                       Task.status, Task.priority, Task.version)
+        query = self._filter_tasks(query, task_filter)
+
+        # Keyset pagination: the page starts right after the cursor instead of using OFFSET.
+        # Columns fixed by an equality filter are dropped from the seek key,
+        # this lets SQLite walk the matching composite index in order. The index holds the names of the enums,
+        # ordering by a rank of them instead would sort every matching task for each page
+        cursor_values = {'priority': after.priority, 'status': after.status, 'id': after.id} if after else {}
+        seek_columns = [Task.priority, Task.status, Task.id]
+        if task_filter.priority is not None:
+            seek_columns.remove(Task.priority)
+        if task_filter.status is not None:
+            seek_columns.remove(Task.status)
+
+        if after:
+            query = query.where(tuple_(*seek_columns) > tuple_(
+                *[literal(cursor_values[column.key], column.type) for column in seek_columns]))
+
+        query = query.order_by(*seek_columns).limit(limit)
+
+        result = await self.session.stream(query)
+        async for row in result:
+            yield ListedTask.model_validate(row)
+
+    async def stream_user_tasks(self, user_id: int, after: Optional[TaskIdCursor],
+                                limit: int) -> AsyncIterator[ListedTask]:
+        """
+            The tasks the user is responsible for or assigned to in id order. Each side reads at most `limit` ids
+            after the cursor from its covering index, only the tasks of the page are read from the table
+        """
+        responsible_tasks = select(Task.id.label('id')).where(Task.responsible_person == user_id)
+        assigned_tasks = select(TaskUser.task_id.label('id')).where(TaskUser.user_id == user_id)
+        if after:
+            responsible_tasks = responsible_tasks.where(Task.id > after.id)
+            assigned_tasks = assigned_tasks.where(TaskUser.task_id > after.id)
+
+        # SQLite only allows LIMIT in the parts of a UNION wrapped into subqueries
+        pages_ids = [select(page.c.id) for page in (responsible_tasks.order_by(Task.id).limit(limit).subquery(),
+                                                    assigned_tasks.order_by(TaskUser.task_id).limit(limit).subquery())]
+        query = (select(Task.id, Task.name, Task.description, Task.responsible_person,
+                        Task.status, Task.priority, Task.version)
+                 .where(Task.id.in_(union(*pages_ids))).order_by(Task.id).limit(limit))
+
+        result = await self.session.stream(query)
+        async for row in result:
+            yield ListedTask.model_validate(row)
+
+    async def stream_tasks_chunks(self, task_filter: TaskFilter, chunk_size: int) -> AsyncIterator[List[ListedTask]]:
+        """ Every task matching the filter in id order, read from one cursor chunk_size rows at a time """
+        query = select(Task.id, Task.name, Task.description, Task.responsible_person,
+                       Task.status, Task.priority, Task.version)
+        query = self._filter_tasks(query, task_filter).order_by(Task.id).execution_options(yield_per=chunk_size)
+
+        result = await self.session.stream(query)
+        async for rows in result.partitions():
+            yield [ListedTask.model_validate(row) for row in rows]
+
+    async def get_task_version(self, task_id: int) -> Optional[int]:
+        result = await self.session.execute(select(Task.version).where(Task.id == task_id))
+        return result.scalar_one_or_none()
+
+    async def get_tasks_changes(self, after: Optional[ChangesCursor], limit: int) -> List[TaskChange]:
+        """ The first `limit` changes after the cursor, two index range scans whatever the number of tasks """
+        tasks_query = select(Task.id, Task.name, Task.description, Task.responsible_person,
+                             Task.status, Task.priority, Task.version, Task.change_seq)
+        # The id of a task deleted last can be reused by the next one, then only the task is sent
+        tombstones_query = (select(TaskTombstone.task_id, TaskTombstone.change_seq)
+                            .where(TaskTombstone.task_id.not_in(select(Task.id))))
+        if after:
+            tasks_query = tasks_query.where(tuple_(Task.change_seq, Task.id) > tuple_(
+                literal(after.change_seq), literal(after.task_id)))
+            tombstones_query = tombstones_query.where(tuple_(TaskTombstone.change_seq, TaskTombstone.task_id) > tuple_(
+                literal(after.change_seq), literal(after.task_id)))
+
+        tasks_result = await self.session.execute(tasks_query.order_by(Task.change_seq, Task.id).limit(limit))
+        changes: List[TaskChange] = [TaskChange(change_seq=row.change_seq, task_id=row.id,
+                                                task=ListedTask.model_validate(row)) for row in tasks_result]
+        tombstones_result = await self.session.execute(
+            tombstones_query.order_by(TaskTombstone.change_seq, TaskTombstone.task_id).limit(limit))
+        changes.extend(TaskChange(change_seq=change_seq, task_id=task_id) for task_id, change_seq in tombstones_result)
+
+        changes.sort(key=lambda change: (change.change_seq, change.task_id))
+        return changes[:limit]
+
+    async def get_assignees_ids_by_tasks_ids(self, tasks_ids: Sequence[int]) -> Dict[int, List[int]]:
+        query = select(TaskUser.task_id, TaskUser.user_id).where(TaskUser.task_id.in_(tasks_ids))
+        result = await self.session.execute(query)
+
+        assignees_ids: Dict[int, List[int]] = defaultdict(list)
+        for task_id, user_id in result:
+            assignees_ids[task_id].append(user_id)
+        return assignees_ids
+
+    @staticmethod
+    def _filter_tasks(query: Statement, task_filter: TaskFilter) -> Statement:
+        if task_filter.status is not None:
+            query = query.where(Task.status == task_filter.status)
+        if task_filter.priority is not None:
+            query = query.where(Task.priority == task_filter.priority)
+        if task_filter.responsible_person_id is not None:
+            query = query.where(Task.responsible_person == task_filter.responsible_person_id)
+        if task_filter.assignee_id is not None:
+            query = query.where(Task.id.in_(
+                select(TaskUser.task_id).where(TaskUser.user_id == task_filter.assignee_id)))
+        return query
+
+    async def update_task_by_id(self, task_id: int, data_for_update: Dict[str, Any],
+                                expected_versions: Optional[Sequence[int]] = None
+                                ) -> Optional[Tuple[str, int, int, int]]:
+        """
+            Creates a new version of the task, when expected_versions are given only if the current version is one
+            of them. Returns (name, responsible_person, version) after the update and the responsible person before
+            it, None if nothing was updated
+        """
+        logger.debug('task_id = %s, data_for_update = %s', task_id, data_for_update)
+        counted_columns: List[str] = [column for column in data_for_update if column in COUNTED_COLUMNS]
+        query = (update(Task).where(Task.id == task_id)
+                 .values(**data_for_update, version=Task.version + 1, change_seq=get_next_change_seq())
+                 .returning(Task.name, Task.responsible_person, Task.version,
+                            *(getattr(Task, column) for column in counted_columns)))
+        where: ColumnElement[bool] = Task.id == task_id
+        if expected_versions is not None:
+            where = where & Task.version.in_(expected_versions)
+        query = query.where(where)
+
+        # RETURNING only sees the new values, the counted ones (the responsible person among them) are read
+        # before the UPDATE
+        previous_values: Optional[Sequence[Any]] = None
+        if counted_columns:
+            previous_values = (await self.session.execute(
+                select(*(getattr(Task, column) for column in counted_columns)).where(where))).one_or_none()
+            if previous_values is None:
+                return None
 
-    async def update_task_by_id(self, task_id: int, data_for_update: Dict[str, Any]) -> None:
-        logger.debug(f'task_id = {task_id}\n'
-              f'data_for_update = {data_for_update}\n')
         try:
-            assignees: Optional[Dict] = data_for_update.pop('assignees', None)
-
-            if data_for_update:
-                await self.session.execute(update(Task).where(Task.id == task_id).values(
-                    **data_for_update))
-
-            if assignees:
-                await self.session.execute(
-                    delete(TaskUser).where(TaskUser.task_id == task_id)
-                )
-                new_assignees = [
-                    TaskUser(task_id=task_id, user_id=user.id) for user in assignees
-                ]
-                self.session.add_all(new_assignees)
+            result = await self.session.execute(query, execution_options={'synchronize_session': False})
+        except IntegrityError as e:
+            # The unique constraint on task.name is the only one an update can break
+            await self.session.rollback()
+            logger.debug(e)
+            raise get_exception_400_bad_request_with_detail('Task with this name already exists!')
         except Exception as e:
             await self.session.rollback()
             logger.error(e)
             raise HTTPException(status_code=500, detail='Task update error')
 
-    async def create_task(self, task: CreateTask) -> TaskBase:
+        updated_task: Optional[Sequence[Any]] = result.one_or_none()
+        if not updated_task:
+            return None
+        name, responsible_person, version, *new_values = updated_task
+        if not counted_columns:
+            return name, responsible_person, version, responsible_person
+
+        await self._add_to_counters(get_updated_tasks_deltas(counted_columns, [previous_values], [new_values]))
+        previous_responsible_person: int = dict(zip(counted_columns, previous_values)).get('responsible_person',
+                                                                                            responsible_person)
+        return name, responsible_person, version, previous_responsible_person
+
+    async def replace_task_assignees(self, task_id: int, users_ids: Sequence[int],
+                                     bump_change_seq: bool = True) -> List[int]:
+        """
+            Returns the ids of the previous assignees. bump_change_seq=False when the task row itself was already
+            updated in this transaction, its change_seq covers the new assignees as well
+        """
+        result = await self.session.execute(delete(TaskUser).where(TaskUser.task_id == task_id)
+                                            .returning(TaskUser.user_id))
+        previous_users_ids: List[int] = list(result.scalars())
+        if users_ids:
+            await self.session.execute(insert(TaskUser), [{'task_id': task_id, 'user_id': user_id}
+                                                          for user_id in users_ids])
+        if bump_change_seq:
+            await self.session.execute(update(Task).where(Task.id == task_id)
+                                       .values(change_seq=get_next_change_seq()),
+                                       execution_options={'synchronize_session': False})
+
+        deltas: CountersDeltas = Counter({(TaskCounterDimension.ASSIGNEE, str(user_id)): 1 for user_id in users_ids})
+        deltas.subtract((TaskCounterDimension.ASSIGNEE, str(user_id)) for user_id in previous_users_ids)
+        await self._add_to_counters(deltas)
+        return previous_users_ids
+
+    async def get_task_receivers(self, task_id: int, responsible_person_id: int) -> TaskReceivers:
+        query = union_all(
+            select(User.id, User.email, literal(False).label('is_assignee')).where(User.id == responsible_person_id),
+            select(User.id, User.email, literal(True).label('is_assignee'))
+            .join(TaskUser, TaskUser.user_id == User.id).where(TaskUser.task_id == task_id),
+        )
+        receivers = TaskReceivers()
+        for user_id, email, is_assignee in await self.session.execute(query):
+            receivers.users_ids.append(user_id)
+            if is_assignee:
+                receivers.assignees_emails.append(email)
+            else:
+                receivers.responsible_person_email = email
+        return receivers
+
+    async def get_tasks_ids(self, task_filter: TaskFilter, limit: int) -> List[int]:
+        result = await self.session.execute(self._filter_tasks(select(Task.id), task_filter).order_by(Task.id)
+                                            .limit(limit))
+        return list(result.scalars())
+
+    async def update_tasks(self, tasks_ids: Optional[Sequence[int]], task_filter: Optional[TaskFilter],
+                           data_for_update: Dict[str, Any]) -> Dict[int, Tuple[str, int, int]]:
+        """ (name, new version, responsible person before the update) of every updated task by id """
+        counted_columns: List[str] = [column for column in data_for_update if column in COUNTED_COLUMNS]
+        query = (update(Task).values(**data_for_update, version=Task.version + 1, change_seq=get_next_change_seq())
+                 .returning(Task.id, Task.name, Task.version, Task.responsible_person,
+                            *(getattr(Task, column) for column in counted_columns)))
+        if tasks_ids is not None:
+            query = query.where(Task.id.in_(tasks_ids))
+        if task_filter is not None:
+            query = self._filter_tasks(query, task_filter)
+
+        # Tasks that already have the new values are neither written nor reported as changed
+        query = query.where(or_(*(getattr(Task, column) != value for column, value in data_for_update.items())))
+
+        # RETURNING only sees the new values, the counted ones (the responsible person among them) are read
+        # before the UPDATE
+        previous_values: Dict[int, Sequence[Any]] = {}
+        if counted_columns:
+            result = await self.session.execute(select(Task.id, *(getattr(Task, column) for column in counted_columns))
+                                                .where(query.whereclause))
+            previous_values = {task_id: values for task_id, *values in result}
+
+        result = await self.session.execute(query, execution_options={'synchronize_session': False})
+        updated_tasks: Dict[int, Tuple[str, int, int]] = {}
+        new_values: Dict[int, Sequence[Any]] = {}
+        for task_id, name, version, responsible_person, *values in result:
+            previous_responsible_person: int = dict(zip(counted_columns, previous_values.get(task_id, ()))).get(
+                'responsible_person', responsible_person)
+            updated_tasks[task_id] = (name, version, previous_responsible_person)
+            new_values[task_id] = values
+
+        await self._add_to_counters(get_updated_tasks_deltas(
+            counted_columns, [previous_values[task_id] for task_id in new_values], new_values.values()))
+        return updated_tasks
+
+    async def get_tasks_receivers(self, tasks_ids: Sequence[int]) -> List[Tuple[int, int, str]]:
+        """ (task id, user id, email) of the responsible person and of the assignees of every task """
+        receivers: List[Tuple[int, int, str]] = []
+        for start in range(0, len(tasks_ids), IN_CHUNK_SIZE):
+            chunk = tasks_ids[start:start + IN_CHUNK_SIZE]
+            query = union(
+                select(Task.id, User.id, User.email).join(User, User.id == Task.responsible_person)
+                .where(Task.id.in_(chunk)),
+                select(TaskUser.task_id, User.id, User.email).join(User, User.id == TaskUser.user_id)
+                .where(TaskUser.task_id.in_(chunk)),
+            )
+            result = await self.session.execute(query)
+            receivers.extend(result.tuples())
+        return receivers
+
+    async def create_task(self, task: CreateTask) -> TaskBase | HTTPException:
+        new_task = Task(**task.__dict__, change_seq=get_next_change_seq())
+        self.session.add(new_task)
         try:
-            new_task = Task(**task.__dict__)
-            self.session.add(new_task)
-            task: TaskBase = TaskBase.model_validate(new_task)
-            return task
-        except Exception as e:
-            logger.error(e)
+            # The id is needed by the events of the task, the INSERT would run at the commit anyway
+            await self.session.flush()
+        except IntegrityError as e:
+            # A task with the same name created since the name was checked
+            await self.session.rollback()
+            logger.debug(e)
+            raise get_exception_400_bad_request_with_detail('Task with this name already exists!')
+        await self._add_to_counters(get_created_tasks_deltas(
+            [task.model_dump(exclude={'assignees'})], [assignee.id for assignee in task.assignees]))
+        return TaskBase.model_validate(new_task)
+
+    async def create_tasks(self, tasks: Sequence[CreateTask]) -> Dict[str, int]:
+        return await self._insert_tasks([task.model_dump(exclude={'assignees'}) for task in tasks],
+                                        {task.name: [assignee.id for assignee in task.assignees] for task in tasks})
+
+    async def import_tasks(self, tasks: Sequence[ImportTask]) -> Dict[str, int]:
+        return await self._insert_tasks([task.model_dump(exclude={'assignees_ids'}) for task in tasks],
+                                        {task.name: task.assignees_ids for task in tasks})
+
+    async def _insert_tasks(self, tasks: List[Dict[str, Any]], assignees_ids: Dict[str, List[int]]) -> Dict[str, int]:
+        """ Three executemany statements whatever the number of tasks, returns the ids of the tasks by name """
+        result = await self.session.execute(
+            insert(Task).values(change_seq=get_next_change_seq()).returning(Task.id, Task.name), tasks)
+        tasks_ids: Dict[str, int] = {name: task_id for task_id, name in result}
+
+        tasks_users = [{'task_id': tasks_ids[name], 'user_id': user_id}
+                       for name, users_ids in assignees_ids.items() for user_id in users_ids]
+        if tasks_users:
+            await self.session.execute(insert(TaskUser), tasks_users)
+
+        await self._add_to_counters(get_created_tasks_deltas(
+            tasks, [task_user['user_id'] for task_user in tasks_users]))
+        return tasks_ids
+
+    async def get_exist_tasks_names(self, names: Sequence[str]) -> Sequence[str]:
+        result = await self.session.execute(select(Task.name).where(Task.name.in_(names)))
+        return result.scalars().all()
 
     async def delete_task_by(self, filter_by: Dict[str, Any]) -> None:
+        """ Deletes the tasks with their assignees and leaves a tombstone for each of them """
+        tasks_ids = select(Task.id).filter_by(**filter_by)
+        tombstones = sqlite_insert(TaskTombstone).from_select(
+            ['task_id', 'change_seq'], select(Task.id, get_next_change_seq()).filter_by(**filter_by))
+        await self.session.execute(tombstones.on_conflict_do_update(
+            index_elements=[TaskTombstone.task_id], set_={'change_seq': tombstones.excluded.change_seq}))
+        await self._count_tasks(Task.id.in_(tasks_ids), -1, list(TaskCounterDimension))
+        await self.session.execute(delete(TaskUser).where(TaskUser.task_id.in_(tasks_ids)))
         await self.session.execute(delete(Task).filter_by(**filter_by))
 
+    async def get_task_stats(self, user_id: Optional[int] = None) -> TaskStats:
+        """
+            Reads the counters instead of counting the tasks. With user_id only the counters of this user are read
+            from the people dimensions, every counter is then found by the unique (dimension, value) index
+        """
+        query = select(TaskCounter.dimension, TaskCounter.value, TaskCounter.count).where(TaskCounter.count != 0)
+        if user_id is not None:
+            people_dimensions = (TaskCounterDimension.RESPONSIBLE_PERSON, TaskCounterDimension.ASSIGNEE)
+            query = query.where(TaskCounter.dimension.not_in(people_dimensions)
+                                | tuple_(TaskCounter.dimension, TaskCounter.value).in_(
+                                    [(dimension, str(user_id)) for dimension in people_dimensions]))
+
+        task_stats = TaskStats()
+        for dimension, value, count in await self.session.execute(query):
+            if dimension == TaskCounterDimension.TOTAL:
+                task_stats.total = count
+            elif dimension == TaskCounterDimension.STATUS:
+                task_stats.by_status[TaskStatus[value]] = count
+            elif dimension == TaskCounterDimension.PRIORITY:
+                task_stats.by_priority[TaskPriority[value]] = count
+            elif dimension == TaskCounterDimension.RESPONSIBLE_PERSON:
+                task_stats.by_responsible_person[int(value)] = count
+            else:
+                task_stats.by_assignee[int(value)] = count
+        return task_stats
+
+    async def rebuild_task_counters(self) -> None:
+        """ Recounts every counter from the tasks, only needed after the tasks were written around the repository """
+        await self.session.execute(delete(TaskCounter))
+        await self._count_tasks(true(), 1, list(TaskCounterDimension))
+
+    async def _count_tasks(self, where: ColumnElement[bool], sign: int,
+                           dimensions: Sequence[TaskCounterDimension]) -> None:
+        """ Adds (sign=1) or subtracts (sign=-1) the tasks matching `where` to the counters with one statement """
+        if not dimensions:
+            return
+
+        dimension_type = TaskCounter.dimension.type
+        counts: List[Select] = []
+        for dimension in dimensions:
+            if dimension == TaskCounterDimension.TOTAL:
+                counts.append(select(literal(dimension, dimension_type), literal(''), func.count() * sign)
+                              .select_from(Task).where(where).having(func.count() > 0))
+            elif dimension == TaskCounterDimension.ASSIGNEE:
+                # Aliased, the assignee filter of `where` has its own task_user subquery
+                assignee = aliased(TaskUser)
+                counts.append(select(literal(dimension, dimension_type), cast(assignee.user_id, String),
+                                     func.count() * sign)
+                              .join(Task, Task.id == assignee.task_id).where(where).group_by(assignee.user_id))
+            else:
+                column = next(getattr(Task, column) for column, counted_dimension in COUNTED_COLUMNS.items()
+                              if counted_dimension == dimension)
+                counts.append(select(literal(dimension, dimension_type), cast(column, String), func.count() * sign)
+                              .select_from(Task).where(where).group_by(column))
+
+        query = sqlite_insert(TaskCounter).from_select(['dimension', 'value', 'count'], union_all(*counts))
+        await self.session.execute(query.on_conflict_do_update(
+            index_elements=[TaskCounter.dimension, TaskCounter.value],
+            set_={'count': TaskCounter.count + query.excluded.count}))
+
+    async def _add_to_counters(self, deltas: CountersDeltas) -> None:
+        """ Applies changes known without reading the tasks, one executemany statement """
+        rows = [{'dimension': dimension, 'value': value, 'count': delta}
+                for (dimension, value), delta in deltas.items() if delta]
+        if not rows:
+            return
+
+        query = sqlite_insert(TaskCounter)
+        await self.session.execute(query.on_conflict_do_update(
+            index_elements=[TaskCounter.dimension, TaskCounter.value],
+            set_={'count': TaskCounter.count + query.excluded.count}), rows)
+
+    def invalidate_cached_tasks(self, tasks_ids: Sequence[int] = (), names: Sequence[str] = ()) -> None:
+        """ Called by the services changing tasks, once more after the commit """
+        self.cache.invalidate(tasks_ids, names)
+        self._invalidated_tasks.append((tasks_ids, names))
+
     async def commit(self) -> None:
         await self.session.commit()
 
+        # A concurrent request may have cached the old task before the commit
+        for tasks_ids, names in self._invalidated_tasks:
+            self.cache.invalidate(tasks_ids, names)
+        self._invalidated_tasks.clear()
+
+
+class TestTaskRepository(TaskRepository):
+
+    async def commit(self) -> None:
+        pass
@@ -1,22 +1,30 @@
-from typing import Dict, Sequence
+from typing import Dict, Sequence, List, Tuple
 
 from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import User
 from src.domain.auth.entities import UserBase
+from src.exceptions import get_exception_400_bad_request_with_detail
 from src.infrastructure.dto import UserCreate
+from src.infrastructure.implementations.cache import LRUCache, user_cache, task_cache
 from src.services.auth.interfaces import AbstractUserRepository
+from src.services.task_tracker.interfaces import AbstractTaskCache
 
 
 class UserRepository(AbstractUserRepository):
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: LRUCache[int, UserBase] = user_cache,
+                 task_cache: AbstractTaskCache = task_cache):
         self.session: AsyncSession = session
-
+        self.cache: LRUCache[int, UserBase] = cache
+        self.task_cache: AbstractTaskCache = task_cache
+        self._changed_users_filters: List[Tuple[Dict, bool]] = []
 
     async def get_user_model_by(self, **filter_by) -> User | None:
-        query = select(User).filter_by(**filter_by)
+        query = select(User).filter_by(**filter_by).options(raiseload('*'))
         result = await self.session.execute(query)
         user = result.scalars().first()
         return user
@@ -26,26 +34,62 @@ class UserRepository(AbstractUserRepository):
         return UserBase.model_validate(user) if user else None
 
     async def get_users_by_ids(self, users_ids) -> Sequence[User]:
-        query = select(User).filter(User.id.in_(users_ids))
+        query = select(User).filter(User.id.in_(users_ids)).options(raiseload('*'))
         result = await self.session.execute(query)
-        users: Sequence[User] = result.scalars().unique().all()
+        users: Sequence[User] = result.scalars().all()
         return users
 
+    async def get_users_emails_by_ids(self, users_ids: Sequence[int]) -> Dict[int, str]:
+        result = await self.session.execute(select(User.id, User.email).where(User.id.in_(users_ids)))
+        return {user_id: email for user_id, email in result}
+
+    async def get_users_ids_by_usernames(self, usernames: Sequence[str]) -> Dict[str, int]:
+        result = await self.session.execute(select(User.username, User.id).where(User.username.in_(usernames)))
+        return {username: user_id for username, user_id in result}
+
     async def update_user_by(self, filter_by: Dict, data_for_update: Dict) -> None:
         await self.session.execute(update(User).filter_by(**filter_by).values(**data_for_update))
+        self._invalidate_cached_users(filter_by, with_tasks='email' in data_for_update)
 
     async def create_user(self, user_to_create: UserCreate) -> UserBase:
 
         user: User = User(**user_to_create.model_dump())
         self.session.add(user)
+        try:
+            # The INSERT would run at the commit anyway, here a concurrent registration is reported as a 400
+            await self.session.flush()
+        except IntegrityError:
+            await self.session.rollback()
+            raise get_exception_400_bad_request_with_detail('User with this username or email already exist!')
         return UserBase.model_validate(user)
 
     async def delete_user(self, filter_by: Dict) -> None:
         await self.session.execute(delete(User).filter_by(**filter_by))
+        self._invalidate_cached_users(filter_by, with_tasks=True)
 
     async def commit(self) -> None:
         await self.session.commit()
 
+        # A concurrent request may have cached the old row before the commit
+        for filter_by, with_tasks in self._changed_users_filters:
+            self._invalidate_cached_users(filter_by, with_tasks, remember=False)
+        self._changed_users_filters.clear()
+
+    def _invalidate_cached_users(self, filter_by: Dict, with_tasks: bool = False, remember: bool = True) -> None:
+        """
+            with_tasks when the emails change, cached tasks hold the emails of their responsible person and
+            assignees. The tasks of a user are not indexed, so the whole task cache is dropped
+        """
+        if remember:
+            self._changed_users_filters.append((filter_by, with_tasks))
+
+        if 'id' in filter_by:
+            self.cache.delete(filter_by['id'])
+        else:
+            self.cache.clear()
+        if with_tasks:
+            self.task_cache.clear()
+
 class TestUserRepository(UserRepository):
 
     async def commit(self) -> None:
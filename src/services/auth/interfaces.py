@@ -35,6 +35,14 @@ class AbstractUserRepository(ABC):
     async def get_users_by_ids(self, users_ids: List[int]) -> Sequence[User]:
         pass
 
+    @abstractmethod
+    async def get_users_ids_by_usernames(self, usernames: Sequence[str]) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    async def get_users_emails_by_ids(self, users_ids: Sequence[int]) -> Dict[int, str]:
+        pass
+
     @abstractmethod
     async def update_user_by(self, filter_by: Dict, data_for_update: Dict):
         pass
@@ -91,3 +99,11 @@ class AbstractPasswordManager(ABC):
     @staticmethod
     def validate_password(password: str, hashed_password: bytes) -> bool:
         pass
+
+    @staticmethod
+    async def async_hash_password(password: str) -> bytes:
+        pass
+
+    @staticmethod
+    async def async_validate_password(password: str, hashed_password: bytes) -> bool:
+        pass
@@ -42,7 +42,7 @@ class RegisterService:
         """
         await self._check_on_exiting_user()
 
-        user: UserCreate = self._format_user_to_save()
+        user: UserCreate = await self._format_user_to_save()
         new_user: UserBase = await self.repository.create_user(user)
         await self.repository.commit()
 
@@ -59,14 +59,14 @@ class RegisterService:
 
         return True
 
-    def _format_user_to_save(self) -> UserCreate:
+    async def _format_user_to_save(self) -> UserCreate:
         """
             Method for formating user_register to dto instance UserCreate for further
             convenient saving to db
             :return: UserCreate, dto instance
         """
         user_data: Dict = self.user_register.__dict__
-        user_hashed_password: bytes = self.password_manager.hash_password(self.user_register.password)
+        user_hashed_password: bytes = await self.password_manager.async_hash_password(self.user_register.password)
 
         user_data.update(password=user_hashed_password, register_at=datetime.now())
 
@@ -111,11 +111,12 @@ class LoginService:
             :return: UserBase, user entity
         """
         user: UserBase = await self.repository.get_user_by(username=self.user_login.username)
-        self.check_user_credentials(user, self.user_login.password)
+        await self.check_user_credentials(user, self.user_login.password)
         return user
 
-    def check_user_credentials(self, user: UserBase, received_password: str) -> HTTPException | bool:
-        if not user or not self.password_manager.validate_password(received_password, user.password.encode()):
+    async def check_user_credentials(self, user: UserBase, received_password: str) -> HTTPException | bool:
+        if not user or not await self.password_manager.async_validate_password(received_password,
+                                                                               user.password.encode()):
             raise get_exception_401_unauthorized_with_detail('invalid username or password')
         return True
 
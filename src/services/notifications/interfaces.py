@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Notification
+
+
+class AbstractNotificationRepository(ABC):
+    @abstractmethod
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @abstractmethod
+    async def add_notifications(self, receivers: Iterable[str], subject: str, body: str) -> None:
+        pass
+
+    @abstractmethod
+    async def add_personal_notifications(self, bodies_by_receiver: Dict[str, str], subject: str) -> None:
+        pass
+
+    @abstractmethod
+    async def claim_due_notifications(self, limit: int, now: datetime,
+                                      lease_until: datetime) -> Sequence[Notification]:
+        pass
+
+    @abstractmethod
+    async def mark_sent(self, notifications_ids: Sequence[int]) -> None:
+        pass
+
+    @abstractmethod
+    async def reschedule(self, notification_id: int, attempts: int, error: str, next_attempt_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def mark_dead(self, notification_id: int, attempts: int, error: str) -> None:
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+
+class AbstractEmailBackend(ABC):
+    @abstractmethod
+    async def send_email(self, to: str, subject: str, body: str) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
@@ -1,6 +1,9 @@
-from typing import Optional
+import base64
+import binascii
+from enum import Enum
+from typing import Optional, List, Dict
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, field_validator
 
 from src.db.models import User
 from src.db.enums import TaskStatus, TaskPriority
@@ -17,36 +20,195 @@ class CreateTask(BaseModel):
     assignees: list[User]
 
 
-class UpdateTask(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True, extra='forbid')
+class CreatedTask(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str = Field(max_length=150)
+
+
+class UpdatedTask(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str = Field(max_length=150)
+    version: int
 
+
+class TaskReceivers(BaseModel):
+    responsible_person_email: Optional[str] = None
+    assignees_emails: List[str] = []
+    users_ids: List[int] = []
+
+
+class BulkCreatedTasks(BaseModel):
+    names: list[str]
+
+
+class BulkUpdatedTasks(BaseModel):
+    updated_tasks_ids: list[int]
+
+
+class DeletedTask(BaseModel):
+    name: str = Field(max_length=150)
+
+
+class TaskEventType(Enum):
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    # The client missed events and has to reload its tasks
+    RESYNC = 'resync'
+
+
+class TaskEvent(BaseModel):
+    id: int = 0
+    type: TaskEventType
+    task_id: Optional[int] = None
     name: Optional[str] = None
-    description: Optional[str] = None
-    responsible_person: Optional[int] = None
+    version: Optional[int] = None
+
+
+class TaskFilter(BaseModel):
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
-    assignees: Optional[list[User]] = None
+    responsible_person_id: Optional[int] = None
+    assignee_id: Optional[int] = None
 
 
+class TaskCursor(BaseModel):
+    """
+        Position of the last task of a page in the (priority, status, id) order. The enums are stored and compared
+        by their names, so the order is alphabetical: HIGH, LOW, MEDIUM and DONE, IN_PROGRESS, TODO
+    """
+    priority: TaskPriority
+    status: TaskStatus
+    id: int
 
-class CreatedTask(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
+    def encode(self) -> str:
+        raw_cursor = f'{self.priority.name}|{self.status.name}|{self.id}'
+        return base64.urlsafe_b64encode(raw_cursor.encode()).decode()
 
-    name: str = Field(max_length=150)
-    assignees: list[User]
+    @classmethod
+    def decode(cls, cursor: str) -> Optional['TaskCursor']:
+        try:
+            priority, status, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            return cls(priority=TaskPriority[priority], status=TaskStatus[status], id=int(task_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, ValidationError):
+            return None
 
 
-class UpdatedTask(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
+class TaskIdCursor(BaseModel):
+    """ Position of the last task of a page in the id order """
+    id: int
 
-    name: str = Field(max_length=150)
-    responsible_person: Optional[User]
-    assignees: Optional[list[User]]
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(str(self.id).encode()).decode()
 
+    @classmethod
+    def decode(cls, cursor: str) -> Optional['TaskIdCursor']:
+        try:
+            return cls(id=int(base64.urlsafe_b64decode(cursor.encode()).decode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+            return None
 
-class DeletedTask(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    name: str = Field(max_length=150)
-    assignees: list[User]
+class NotModifiedTask(BaseModel):
+    """ The client already has the current version of the task """
+    id: int
+    version: int
+
+
+class ListedTask(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: str
+    responsible_person: int
+    status: TaskStatus
+    priority: TaskPriority
+    version: int
+    assignees_ids: List[int] = []
+
+
+class TasksPage(BaseModel):
+    tasks: List[ListedTask]
+    next_cursor: Optional[str] = None
+
+
+class ChangesCursor(BaseModel):
+    """ Position of the last change sent to a syncing client in the (change_seq, task id) order """
+    change_seq: int
+    task_id: int
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(f'{self.change_seq}|{self.task_id}'.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> Optional['ChangesCursor']:
+        try:
+            change_seq, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            return cls(change_seq=int(change_seq), task_id=int(task_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+            return None
+
+
+class TaskChange(BaseModel):
+    """ The current state of a changed task, None for a deleted one """
+    change_seq: int
+    task_id: int
+    task: Optional[ListedTask] = None
+
+
+class TasksChanges(BaseModel):
+    tasks: List[ListedTask]
+    deleted_tasks_ids: List[int]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class TaskStats(BaseModel):
+    """ Numbers of tasks read from the task counters """
+    total: int = 0
+    by_status: Dict[TaskStatus, int] = Field(default_factory=dict)
+    by_priority: Dict[TaskPriority, int] = Field(default_factory=dict)
+    by_responsible_person: Dict[int, int] = Field(default_factory=dict)
+    by_assignee: Dict[int, int] = Field(default_factory=dict)
+
+
+class TasksFileFormat(Enum):
+    """ Format of the tasks export and import files """
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+class ImportedTaskRecord(BaseModel):
+    """ One task of an import file, people are referenced by username """
+    model_config = ConfigDict(extra='ignore')
+
+    name: str = Field(min_length=1, max_length=150)
+    description: str
+    responsible_username: str
+    assignees_usernames: List[str] = []
+    status: TaskStatus = Field(default=TaskStatus.TODO)
+    priority: TaskPriority = Field(default=TaskPriority.MEDIUM)
+
+    @field_validator('assignees_usernames', mode='before')
+    @classmethod
+    def split_assignees_usernames(cls, value):
+        """ CSV has one column for all assignees, the usernames are separated by spaces """
+        return value.split() if isinstance(value, str) else value
+
+class ImportTask(BaseModel):
+    name: str
+    description: str
+    responsible_person: int
+    status: TaskStatus
+    priority: TaskPriority
+    assignees_ids: List[int]
+
 
+class ImportedTasks(BaseModel):
+    """ Progress of an import, records counts every record read including the skipped start_from ones """
+    records: int = 0
+    imported: int = 0
+    already_exist: int = 0
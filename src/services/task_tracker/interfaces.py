@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from fastapi import HTTPException
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence, Tuple, Iterable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import Task
-from src.services.task_tracker.dto import CreateTask
+from src.services.task_tracker.dto import CreateTask, TaskFilter, TaskCursor, ListedTask, TaskReceivers
+from src.services.task_tracker.dto import ImportTask, TaskEvent, ChangesCursor, TaskChange, TaskStats
+from src.services.task_tracker.dto import TaskIdCursor
 from src.domain.task_tracker.entities import TaskBase
+from src.infrastructure.dto import TaskCacheStats, TaskEventsStats
 
 
 class AbstractAPICreateTask(ABC):
@@ -17,6 +21,10 @@ class AbstractAPICreateTask(ABC):
     assignees_ids: List[int]
 
 
+class AbstractAPIBulkCreateTasks(ABC):
+    tasks: List[AbstractAPICreateTask]
+
+
 class AbstractAPIUpdateTask(ABC):
     name: Optional[str]
     description: Optional[str]
@@ -27,6 +35,67 @@ class AbstractAPIUpdateTask(ABC):
 
 
 
+class AbstractAPIBulkUpdateTasks(ABC):
+    tasks_ids: Optional[List[int]]
+    filter: Optional[TaskFilter]
+    status: Optional['TaskStatus']
+    priority: Optional['TaskPriority']
+    responsible_person_id: Optional[int]
+
+
+class AbstractTaskCache(ABC):
+    """ Tasks read by id or by name, kept until a write path invalidates them or they expire """
+
+    @abstractmethod
+    def get(self, task_id: int) -> Optional[TaskBase]:
+        pass
+
+    @abstractmethod
+    def get_by_name(self, name: str) -> Optional[TaskBase]:
+        pass
+
+    @abstractmethod
+    def get_generation(self) -> int:
+        """ Taken before reading a task from the database, to be passed to set """
+        pass
+
+    @abstractmethod
+    def set(self, task: TaskBase, generation: Optional[int] = None) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, tasks_ids: Sequence[int] = (), names: Sequence[str] = ()) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> TaskCacheStats:
+        pass
+
+
+class AbstractTaskEventsBroker(ABC):
+    """ Delivers the changes of tasks to the subscribed users they concern """
+
+    @abstractmethod
+    def publish(self, event: TaskEvent, users_ids: Iterable[int]) -> None:
+        pass
+
+    @abstractmethod
+    def check_capacity(self) -> Optional[HTTPException]:
+        pass
+
+    @abstractmethod
+    def listen(self, user_id: int, heartbeat_seconds: float) -> AsyncIterator[List[TaskEvent]]:
+        pass
+
+    @abstractmethod
+    def stats(self) -> TaskEventsStats:
+        pass
+
+
 class AbstractTaskRepository(ABC):
     @abstractmethod
     def __init__(self, session: AsyncSession):
@@ -37,21 +106,95 @@ class AbstractTaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_task_model_by(self, filter_by: Dict[str, Any]) -> Optional[Task]:
+    async def get_task_model_by(self, filter_by: Dict[str, Any], with_assignees: bool = False) -> Optional[Task]:
+        pass
+
+    @abstractmethod
+    def stream_tasks(self, task_filter: TaskFilter, after: Optional[TaskCursor],
+                     limit: int) -> AsyncIterator[ListedTask]:
         pass
 
     @abstractmethod
-    async def update_task_by_id(self, task_id: int, data_for_update: Dict[str, Any]) -> None:
+    def stream_user_tasks(self, user_id: int, after: Optional[TaskIdCursor],
+                          limit: int) -> AsyncIterator[ListedTask]:
+        pass
+
+    @abstractmethod
+    def stream_tasks_chunks(self, task_filter: TaskFilter, chunk_size: int) -> AsyncIterator[List[ListedTask]]:
+        pass
+
+    @abstractmethod
+    async def get_tasks_changes(self, after: Optional[ChangesCursor], limit: int) -> List[TaskChange]:
+        pass
+
+    @abstractmethod
+    async def get_task_version(self, task_id: int) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    async def get_assignees_ids_by_tasks_ids(self, tasks_ids: Sequence[int]) -> Dict[int, List[int]]:
+        pass
+
+    @abstractmethod
+    async def update_task_by_id(self, task_id: int, data_for_update: Dict[str, Any],
+                                expected_versions: Optional[Sequence[int]] = None
+                                ) -> Optional[Tuple[str, int, int, int]]:
+        pass
+
+    @abstractmethod
+    async def replace_task_assignees(self, task_id: int, users_ids: Sequence[int],
+                                     bump_change_seq: bool = True) -> List[int]:
+        pass
+
+    @abstractmethod
+    async def get_task_receivers(self, task_id: int, responsible_person_id: int) -> TaskReceivers:
+        pass
+
+    @abstractmethod
+    async def get_tasks_ids(self, task_filter: TaskFilter, limit: int) -> List[int]:
+        pass
+
+    @abstractmethod
+    async def update_tasks(self, tasks_ids: Optional[Sequence[int]], task_filter: Optional[TaskFilter],
+                           data_for_update: Dict[str, Any]) -> Dict[int, Tuple[str, int, int]]:
+        pass
+
+    @abstractmethod
+    async def get_tasks_receivers(self, tasks_ids: Sequence[int]) -> List[Tuple[int, int, str]]:
         pass
 
     @abstractmethod
     async def create_task(self, user: CreateTask) -> TaskBase:
         pass
 
+    @abstractmethod
+    async def create_tasks(self, tasks: Sequence[CreateTask]) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    async def import_tasks(self, tasks: Sequence[ImportTask]) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    async def get_exist_tasks_names(self, names: Sequence[str]) -> Sequence[str]:
+        pass
+
     @abstractmethod
     async def delete_task_by(self, filter_by: Dict[str, Any]) -> None:
         pass
 
+    @abstractmethod
+    async def get_task_stats(self, user_id: Optional[int] = None) -> TaskStats:
+        pass
+
+    @abstractmethod
+    async def rebuild_task_counters(self) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate_cached_tasks(self, tasks_ids: Sequence[int] = (), names: Sequence[str] = ()) -> None:
+        pass
+
     @abstractmethod
     async def commit(self) -> None:
         pass
@@ -1,28 +1,51 @@
+import csv
+import io
+import itertools
+import json
 import logging
+from contextlib import aclosing
+import anyio
 from fastapi import HTTPException
-from typing import Tuple, Sequence, Optional, Dict
+from pydantic import ValidationError
+from typing import Tuple, Sequence, Optional, Dict, List, AsyncIterator, Callable, Iterator, TextIO
 
-from src.db.models import User, Task
+from src.db.models import User
 from src.services.task_tracker.dto import DeletedTask
-from src.services.task_tracker.dto import CreatedTask, UpdatedTask, UpdateTask
+from src.services.task_tracker.dto import CreatedTask, UpdatedTask, TaskReceivers
+from src.services.task_tracker.dto import TaskFilter, TaskCursor, ListedTask, TasksPage, BulkCreatedTasks
+from src.services.task_tracker.dto import BulkUpdatedTasks, TasksFileFormat, ChangesCursor, TaskChange, TasksChanges
+from src.services.task_tracker.dto import TaskStats, TaskIdCursor, NotModifiedTask
+from src.services.task_tracker.dto import ImportedTaskRecord, ImportTask, ImportedTasks, TaskEvent, TaskEventType
 from src.exceptions import get_exception_404_not_found_with_detail
 from src.domain.task_tracker.entities import TaskBase
 from src.exceptions import get_exception_400_bad_request_with_detail
 from src.services.auth.interfaces import AbstractUserRepository
+from src.services.notifications.interfaces import AbstractNotificationRepository
 from src.services.task_tracker.dto import CreateTask
 from src.db.enums import UserRole
 
 from src.domain.auth.entities import UserBase
 
-from src.exceptions import get_exception_403_forbidden_with_detail
+from src.exceptions import get_exception_403_forbidden_with_detail, get_exception_412_precondition_failed_with_detail
 
-from src.services.task_tracker.interfaces import AbstractTaskRepository
+from src.services.task_tracker.interfaces import AbstractTaskRepository, AbstractTaskEventsBroker
 from src.services.task_tracker.interfaces import AbstractAPIUpdateTask, AbstractAPICreateTask
+from src.services.task_tracker.interfaces import AbstractAPIBulkCreateTasks, AbstractAPIBulkUpdateTasks
 from src.services.auth.services import UserValidationService
+from src.infrastructure.implementations.cache import LRUCache
+from src.infrastructure.implementations.task_events import task_events_broker
 
 
 logger = logging.getLogger('app')
 
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_CSV_COLUMNS = ('id', 'name', 'description', 'responsible_person', 'status', 'priority', 'version',
+                      'assignees_ids')
+IMPORT_CHUNK_SIZE = 5000
+BULK_UPDATE_MAX_TASKS = 5000
+IMPORT_USERNAMES_CACHE_SIZE = 100_000
+SSE_RETRY_MILLISECONDS = 3000
+
 
 class TaskMixin:
 
@@ -34,25 +57,38 @@ class TaskMixin:
 
         return responsible_person
 
-    async def _get_task_or_error(self, task_id: int) -> Task | HTTPException:
-        exist_task: Task = await self.task_repository.get_task_model_by({'id': task_id})
+    def _check_role_to_create_task(self) -> bool | HTTPException:
+        available_roles: Tuple[UserRole, UserRole, UserRole] = (
+            UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.PROJECT_MANAGER)
+        check_result: bool = UserValidationService.check_role_for_access_to_action(self.user.role, available_roles)
 
-        if not exist_task:
-            raise get_exception_404_not_found_with_detail('Task user not found!')
+        if check_result:
+            raise get_exception_403_forbidden_with_detail('Users does not have the permissions to create task!')
+
+        return True
 
-        return exist_task
+    def _check_role_to_update_task(self) -> bool | HTTPException:
+        available_roles: Tuple[UserRole] = tuple(role for role in UserRole if role != role.GUEST)
+        check_result: bool = UserValidationService.check_role_for_access_to_action(self.user.role, available_roles)
+        if check_result:
+            raise get_exception_403_forbidden_with_detail('You do not have the permissions to update task!')
+        return True
 
 
 class CreateTaskService(TaskMixin):
 
     def __init__(self, user: UserBase,
                  user_repository: AbstractUserRepository,
-                 task_repository: AbstractTaskRepository, task_to_create: AbstractAPICreateTask):
+                 task_repository: AbstractTaskRepository, notification_repository: AbstractNotificationRepository,
+                 task_to_create: AbstractAPICreateTask,
+                 task_events_broker: AbstractTaskEventsBroker = task_events_broker):
 
         self.user: UserBase = user
         self.user_repository: AbstractUserRepository = user_repository
         self.task_repository: AbstractTaskRepository = task_repository
+        self.notification_repository: AbstractNotificationRepository = notification_repository
         self.task_to_create: AbstractAPICreateTask = task_to_create
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
 
     async def create_task(self) -> CreatedTask:
         await self._checks_to_create_task()
@@ -60,140 +96,330 @@ class CreateTaskService(TaskMixin):
         responsible_person: User = await self._get_responsible_person_or_error(self.task_to_create.responsible_person_id)
         assignees: Sequence[User] = await self.user_repository.get_users_by_ids(self.task_to_create.assignees_ids)
 
-        try:
-            task = CreateTask(
-                name=self.task_to_create.name,
-                description=self.task_to_create.description,
-                responsible_person=responsible_person.id,
-                status=self.task_to_create.status,
-                priority=self.task_to_create.priority,
-                assignees=assignees
-            )
+        task = CreateTask(
+            name=self.task_to_create.name,
+            description=self.task_to_create.description,
+            responsible_person=responsible_person.id,
+            status=self.task_to_create.status,
+            priority=self.task_to_create.priority,
+            assignees=assignees
+        )
 
-            task_base: TaskBase = await self.task_repository.create_task(task)
-            created_task: CreatedTask = CreatedTask(**task_base.__dict__)
+        task_base: TaskBase = await self.task_repository.create_task(task)
+        created_task: CreatedTask = CreatedTask(name=task_base.name)
+        self.task_repository.invalidate_cached_tasks(names=[created_task.name])
 
-            await self.task_repository.commit()
-            return created_task
+        await self.notification_repository.add_notifications(
+            [assignee.email for assignee in assignees], 'Task Created!', f'Task: {created_task.name} has been created!')
+        await self.task_repository.commit()
 
-        except Exception as e:
-            logger.error(e)
+        self.task_events_broker.publish(
+            TaskEvent(type=TaskEventType.CREATED, task_id=task_base.id, name=task_base.name,
+                      version=task_base.version),
+            [responsible_person.id, *(assignee.id for assignee in assignees)])
+        return created_task
 
     async def _checks_to_create_task(self) -> Optional[HTTPException]:
         task_validation_service = TaskValidationService(self.task_repository)
         self._check_role_to_create_task()
         await task_validation_service.check_on_exist_task_by_name(self.task_to_create.name)
 
-    def _check_role_to_create_task(self) -> bool | HTTPException:
-        available_roles: Tuple[UserRole, UserRole, UserRole] = (
-            UserRole.ADMIN, UserRole.TEAM_LEAD, UserRole.PROJECT_MANAGER)
-        check_result: bool = UserValidationService.check_role_for_access_to_action(self.user.role, available_roles)
 
-        if check_result:
-            raise get_exception_403_forbidden_with_detail('Users does not have the permissions to create task!')
+class BulkCreateTaskService(TaskMixin):
+    """ Creates many tasks with a fixed number of queries regardless of how many tasks are sent """
 
-        return True
+    def __init__(self, user: UserBase,
+                 user_repository: AbstractUserRepository,
+                 task_repository: AbstractTaskRepository, notification_repository: AbstractNotificationRepository,
+                 tasks_to_create: AbstractAPIBulkCreateTasks,
+                 task_events_broker: AbstractTaskEventsBroker = task_events_broker):
+
+        self.user: UserBase = user
+        self.user_repository: AbstractUserRepository = user_repository
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.notification_repository: AbstractNotificationRepository = notification_repository
+        self.tasks_to_create: List[AbstractAPICreateTask] = tasks_to_create.tasks
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
+
+    async def create_tasks(self) -> BulkCreatedTasks:
+        self._check_role_to_create_task()
+        await self._check_on_exist_tasks_by_names()
+
+        users: Dict[int, User] = await self._get_referenced_users()
+        tasks: List[CreateTask] = [
+            CreateTask(
+                name=task_to_create.name,
+                description=task_to_create.description,
+                responsible_person=task_to_create.responsible_person_id,
+                status=task_to_create.status,
+                priority=task_to_create.priority,
+                assignees=[users[user_id] for user_id in dict.fromkeys(task_to_create.assignees_ids)
+                           if user_id in users]
+            )
+            for task_to_create in self.tasks_to_create
+        ]
+
+        tasks_ids: Dict[str, int] = await self.task_repository.create_tasks(tasks)
+        self.task_repository.invalidate_cached_tasks(names=[task.name for task in tasks])
+
+        tasks_names_by_receiver: Dict[str, List[str]] = {}
+        for task in tasks:
+            for assignee in task.assignees:
+                tasks_names_by_receiver.setdefault(assignee.email, []).append(task.name)
+
+        bodies_by_receiver: Dict[str, str] = {receiver: f'Tasks: {", ".join(tasks_names)} have been created!'
+                                              for receiver, tasks_names in tasks_names_by_receiver.items()}
+        await self.notification_repository.add_personal_notifications(bodies_by_receiver, 'Tasks Created!')
+        await self.task_repository.commit()
+
+        for task in tasks:
+            self.task_events_broker.publish(
+                TaskEvent(type=TaskEventType.CREATED, task_id=tasks_ids[task.name], name=task.name, version=1),
+                [task.responsible_person, *(assignee.id for assignee in task.assignees)])
+
+        return BulkCreatedTasks(names=[task.name for task in tasks])
+
+    async def _check_on_exist_tasks_by_names(self) -> Optional[HTTPException]:
+        names: List[str] = [task_to_create.name for task_to_create in self.tasks_to_create]
+        if len(set(names)) != len(names):
+            raise get_exception_400_bad_request_with_detail('Task names must be unique!')
+
+        exist_names: Sequence[str] = await self.task_repository.get_exist_tasks_names(names)
+        if exist_names:
+            raise get_exception_400_bad_request_with_detail(
+                f'Tasks with these names already exist: {", ".join(exist_names)}')
+
+    async def _get_referenced_users(self) -> Dict[int, User] | HTTPException:
+        responsible_persons_ids = {task_to_create.responsible_person_id for task_to_create in self.tasks_to_create}
+        users_ids = responsible_persons_ids.union(*(task_to_create.assignees_ids
+                                                    for task_to_create in self.tasks_to_create))
+
+        users: Dict[int, User] = {user.id: user for user in await self.user_repository.get_users_by_ids(users_ids)}
+
+        not_found_ids = responsible_persons_ids - users.keys()
+        if not_found_ids:
+            raise get_exception_400_bad_request_with_detail(
+                f'Responsible users not found: {", ".join(map(str, sorted(not_found_ids)))}')
+
+        return users
 
 
 class UpdateTaskService(TaskMixin):
 
     def __init__(self, user: UserBase,
                  user_repository: AbstractUserRepository,
-                 task_repository: AbstractTaskRepository, task_to_update: AbstractAPIUpdateTask,
-                 task_id: int):
+                 task_repository: AbstractTaskRepository, notification_repository: AbstractNotificationRepository,
+                 task_to_update: AbstractAPIUpdateTask,
+                 task_id: int,
+                 expected_versions: Optional[Sequence[int]] = None,
+                 task_events_broker: AbstractTaskEventsBroker = task_events_broker):
 
         self.user: UserBase = user
         self.user_repository: AbstractUserRepository = user_repository
         self.task_repository: AbstractTaskRepository = task_repository
+        self.notification_repository: AbstractNotificationRepository = notification_repository
         self.task_to_update: AbstractAPIUpdateTask = task_to_update
         self.task_id: int = task_id
+        self.expected_versions: Optional[Sequence[int]] = expected_versions
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
 
     async def update_task(self) -> UpdatedTask:
+        """
+            At most 9 statements: users lookup, the previous status/priority/responsible person, UPDATE ...
+            RETURNING, one upsert of the counters of the old and the new values, assignees delete/insert and their
+            counters, receivers, outbox.
+            With expected_versions (If-Match) the UPDATE only applies to one of these versions of the task,
+            so a concurrent update is reported as 412 instead of being overwritten
+        """
+        self._check_role_to_update_task()
 
-        await self._checks_to_update_task()
+        data_for_update: Dict = self._get_data_for_update()
+        assignees_ids: List[int] = list(dict.fromkeys(self.task_to_update.assignees_ids or []))
+        users_emails: Dict[int, str] = await self._get_users_emails(data_for_update.get('responsible_person'),
+                                                                    assignees_ids)
 
-        assignees_to_update: Optional[Sequence[User]] = await self._get_assignees_to_update()
-        data_for_update: Dict = self.task_to_update.model_dump(exclude_unset=True)
+        updated_task: Optional[Tuple[str, int, int, int]] = await self.task_repository.update_task_by_id(
+            self.task_id, data_for_update, self.expected_versions)
+        if not updated_task:
+            await self._raise_not_updated()
+        name, responsible_person_id, version, previous_responsible_person_id = updated_task
+        self.task_repository.invalidate_cached_tasks([self.task_id], [name])
 
-        responsible_person_id: int = data_for_update.pop('responsible_person_id', None)
+        assignees_to_update: List[int] = [user_id for user_id in assignees_ids if user_id in users_emails]
+        previous_assignees_ids: List[int] = []
+        if assignees_to_update:
+            # The UPDATE above already gave the task a new change_seq
+            previous_assignees_ids = await self.task_repository.replace_task_assignees(
+                self.task_id, assignees_to_update, bump_change_seq=False)
 
-        data_for_update.pop('assignees_ids', None)
+        receivers: TaskReceivers = await self.task_repository.get_task_receivers(self.task_id, responsible_person_id)
+        if receivers.assignees_emails:
+            emails_to_notify: List[str] = [*receivers.assignees_emails, receivers.responsible_person_email]
+            await self.notification_repository.add_notifications(
+                [email for email in dict.fromkeys(emails_to_notify) if email],
+                'Task Changed!', f'Task: "{name}" updated!')
 
-        logger.debug(f'self.task_to_update = {self.task_to_update}')
-        logger.debug(f'data_for_update = {data_for_update}')
+        await self.task_repository.commit()
 
+        # The previous responsible person and assignees learn that the task is no longer theirs
+        self.task_events_broker.publish(
+            TaskEvent(type=TaskEventType.UPDATED, task_id=self.task_id, name=name, version=version),
+            [*receivers.users_ids, *previous_assignees_ids, previous_responsible_person_id])
+        return UpdatedTask(name=name, version=version)
+
+    async def _raise_not_updated(self) -> HTTPException:
+        """ Only a failed update pays for telling a missing task from a changed one """
+        version: Optional[int] = await self.task_repository.get_task_version(self.task_id) \
+            if self.expected_versions is not None else None
+        if version is None:
+            raise get_exception_404_not_found_with_detail(f'Task with id: {self.task_id} not found!')
+        raise get_exception_412_precondition_failed_with_detail(
+            f'Task with id: {self.task_id} was changed, its current version is {version}!')
+
+    def _get_data_for_update(self) -> Dict:
+        data_for_update: Dict = self.task_to_update.model_dump(exclude_unset=True, exclude={'assignees_ids'})
+        responsible_person_id: Optional[int] = data_for_update.pop('responsible_person_id', None)
+        data_for_update = {column: value for column, value in data_for_update.items() if value is not None}
 
-        update_task = UpdateTask(
-            **data_for_update
-        )
+        if responsible_person_id:
+            data_for_update['responsible_person'] = responsible_person_id
 
-        if assignees_to_update:
-            update_task.assignees = assignees_to_update
+        logger.debug('data_for_update = %s', data_for_update)
+        return data_for_update
 
-        if responsible_person_id:
-            update_task.responsible_person = responsible_person_id
-            logger.debug(f'update_task = {update_task}')
+    async def _get_users_emails(self, responsible_person_id: Optional[int],
+                                assignees_ids: List[int]) -> Dict[int, str] | HTTPException:
+        """ One query for the new responsible person and the new assignees, unknown assignees are skipped """
+        users_ids: List[int] = assignees_ids + ([responsible_person_id] if responsible_person_id else [])
+        if not users_ids:
+            return {}
 
-        await self.task_repository.update_task_by_id(self.task_id, update_task.model_dump(exclude_unset=True))
-        updated_task: Task = await self._get_task_or_error(self.task_id)
-        responsible_person = await self._get_responsible_person_or_error(updated_task.responsible_person)
+        users_emails: Dict[int, str] = await self.user_repository.get_users_emails_by_ids(users_ids)
+        if responsible_person_id and responsible_person_id not in users_emails:
+            raise get_exception_400_bad_request_with_detail('Responsible user not found!')
+        return users_emails
 
-        logger.debug(f'updated_task type(Task) = {updated_task}')
-        updated_task: UpdatedTask = UpdatedTask(name=updated_task.name,
-                                            responsible_person=responsible_person,
-                                            assignees=updated_task.assignees)
 
-        await self.task_repository.commit()
+class BulkUpdateTaskService(TaskMixin):
+    """ Applies the same status/priority/responsible person change to many tasks with one UPDATE """
 
-        return updated_task
+    def __init__(self, user: UserBase,
+                 user_repository: AbstractUserRepository,
+                 task_repository: AbstractTaskRepository, notification_repository: AbstractNotificationRepository,
+                 tasks_to_update: AbstractAPIBulkUpdateTasks,
+                 task_events_broker: AbstractTaskEventsBroker = task_events_broker):
 
-    async def _get_assignees_to_update(self) -> Optional[Sequence[User]]:
-        assignees_ids = self.task_to_update.assignees_ids
-        assignees = None
-        if assignees_ids:
-            assignees: Sequence[User] = await self.user_repository.get_users_by_ids(self.task_to_update.assignees_ids)
-        return assignees
+        self.user: UserBase = user
+        self.user_repository: AbstractUserRepository = user_repository
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.notification_repository: AbstractNotificationRepository = notification_repository
+        self.tasks_to_update: AbstractAPIBulkUpdateTasks = tasks_to_update
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
 
-    async def _checks_to_update_task(self) -> Optional[HTTPException]:
-        task_validation_service = TaskValidationService(self.task_repository)
+    async def update_tasks(self) -> BulkUpdatedTasks:
+        data_for_update: Dict = self._get_data_for_update()
         self._check_role_to_update_task()
-        await task_validation_service.check_on_exist_task_by_id(self.task_id)
-        await task_validation_service.check_on_exist_task_by_name(self.task_to_update.name)
+        self._check_tasks_selection()
+
+        if 'responsible_person' in data_for_update:
+            await self._get_responsible_person_or_error(data_for_update['responsible_person'])
+
+        tasks_ids: Optional[List[int]] = self.tasks_to_update.tasks_ids
+        if self.tasks_to_update.filter is not None:
+            tasks_ids = await self._get_filtered_tasks_ids_or_error()
+
+        # The filter is applied again, a task changed since it was selected is left as it is
+        updated_tasks_with_versions: Dict[int, Tuple[str, int, int]] = \
+            await self.task_repository.update_tasks(tasks_ids, self.tasks_to_update.filter, data_for_update)
+        updated_tasks: Dict[int, str] = {task_id: name for task_id, (name, _, _) in updated_tasks_with_versions.items()}
+        self.task_repository.invalidate_cached_tasks(list(updated_tasks))
+
+        tasks_names_by_receiver: Dict[str, List[str]] = {}
+        users_ids_by_task: Dict[int, List[int]] = {}
+        if updated_tasks:
+            for task_id, user_id, email in await self.task_repository.get_tasks_receivers(list(updated_tasks)):
+                tasks_names_by_receiver.setdefault(email, []).append(updated_tasks[task_id])
+                users_ids_by_task.setdefault(task_id, []).append(user_id)
+
+        bodies_by_receiver: Dict[str, str] = {receiver: f'Tasks: {", ".join(tasks_names)} updated!'
+                                              for receiver, tasks_names in tasks_names_by_receiver.items()}
+        await self.notification_repository.add_personal_notifications(bodies_by_receiver, 'Tasks Changed!')
+        await self.task_repository.commit()
 
-    def _check_role_to_update_task(self) -> bool | HTTPException:
-        available_roles: Tuple[UserRole] = tuple(role for role in UserRole if role != role.GUEST)
-        check_result: bool = UserValidationService.check_role_for_access_to_action(self.user.role, available_roles)
-        if check_result:
-            raise get_exception_403_forbidden_with_detail('You do not have the permissions to update task!')
+        # The previous responsible persons learn that the tasks are no longer theirs
+        for task_id, (name, version, previous_responsible_person_id) in updated_tasks_with_versions.items():
+            self.task_events_broker.publish(
+                TaskEvent(type=TaskEventType.UPDATED, task_id=task_id, name=name, version=version),
+                [*users_ids_by_task.get(task_id, []), previous_responsible_person_id])
+
+        return BulkUpdatedTasks(updated_tasks_ids=list(updated_tasks))
+
+    def _get_data_for_update(self) -> Dict | HTTPException:
+        data_for_update: Dict = {}
+        if self.tasks_to_update.status is not None:
+            data_for_update['status'] = self.tasks_to_update.status
+        if self.tasks_to_update.priority is not None:
+            data_for_update['priority'] = self.tasks_to_update.priority
+        if self.tasks_to_update.responsible_person_id is not None:
+            data_for_update['responsible_person'] = self.tasks_to_update.responsible_person_id
+
+        if not data_for_update:
+            raise get_exception_400_bad_request_with_detail('Nothing to update!')
+        return data_for_update
+
+    def _check_tasks_selection(self) -> bool | HTTPException:
+        if (self.tasks_to_update.tasks_ids is None) == (self.tasks_to_update.filter is None):
+            raise get_exception_400_bad_request_with_detail('Pass either tasks_ids or filter!')
+        if self.tasks_to_update.filter is not None and not self.tasks_to_update.filter.model_dump(exclude_none=True):
+            raise get_exception_400_bad_request_with_detail('Filter must have at least one field!')
         return True
 
+    async def _get_filtered_tasks_ids_or_error(self) -> List[int] | HTTPException:
+        """ The same bound as tasks_ids, a filter matching more tasks has to be narrowed """
+        tasks_ids: List[int] = await self.task_repository.get_tasks_ids(self.tasks_to_update.filter,
+                                                                        BULK_UPDATE_MAX_TASKS + 1)
+        if len(tasks_ids) > BULK_UPDATE_MAX_TASKS:
+            raise get_exception_400_bad_request_with_detail(
+                f'Filter matches more than {BULK_UPDATE_MAX_TASKS} tasks, narrow it!')
+        return tasks_ids
+
 
 class DeleteTaskService:
 
     def __init__(self, user: UserBase,
                  user_repository: AbstractUserRepository,
                  task_repository: AbstractTaskRepository,
-                 task_id: int):
+                 notification_repository: AbstractNotificationRepository,
+                 task_id: int,
+                 task_events_broker: AbstractTaskEventsBroker = task_events_broker):
 
         self.user: UserBase = user
         self.user_repository: AbstractUserRepository = user_repository
         self.task_repository: AbstractTaskRepository = task_repository
+        self.notification_repository: AbstractNotificationRepository = notification_repository
         self.task_id: int = task_id
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
 
     async def delete_task(self) -> DeletedTask:
         self._check_role_to_delete_task()
 
-        task_to_delete: Task = await self.task_repository.get_task_model_by({'id': self.task_id})
+        task_to_delete: Optional[TaskBase] = await self.task_repository.get_task_by({'id': self.task_id})
         if not task_to_delete:
             raise get_exception_404_not_found_with_detail(f'Task with id: {self.task_id} does not exist!')
 
         await self.task_repository.delete_task_by({'id': self.task_id})
+        self.task_repository.invalidate_cached_tasks([self.task_id], [task_to_delete.name])
 
-        deleted_task = DeletedTask(
-            name=task_to_delete.name,
-            assignees=task_to_delete.assignees
-        )
+        deleted_task = DeletedTask(name=task_to_delete.name)
+
+        await self.notification_repository.add_notifications(
+            [assignee.email for assignee in task_to_delete.assignees], 'Task Changed!',
+            f'Task: "{deleted_task.name}" deleted!')
         await self.task_repository.commit()
+
+        self.task_events_broker.publish(
+            TaskEvent(type=TaskEventType.DELETED, task_id=self.task_id, name=deleted_task.name),
+            [task_to_delete.responsible_person, *(assignee.id for assignee in task_to_delete.assignees)])
         return deleted_task
 
 
@@ -205,6 +431,436 @@ class DeleteTaskService:
         return True
 
 
+class GetTaskService:
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 task_id: int,
+                 known_versions: Optional[Sequence[int]] = None,
+                 known_any_version: bool = False):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.task_id: int = task_id
+        self.known_versions: Optional[Sequence[int]] = known_versions
+        self.known_any_version: bool = known_any_version
+
+    async def get_task(self) -> ListedTask | NotModifiedTask | HTTPException:
+        """ NotModifiedTask when the client already has the current version (If-None-Match, * matches any) """
+        ListTasksService.check_role_to_list_tasks(self.user)
+
+        task: Optional[TaskBase] = await self.task_repository.get_task_by({'id': self.task_id})
+        if not task:
+            raise get_exception_404_not_found_with_detail(f'Task with id: {self.task_id} not found!')
+
+        if self.known_any_version or (self.known_versions and task.version in self.known_versions):
+            return NotModifiedTask(id=task.id, version=task.version)
+
+        return ListedTask(**task.model_dump(exclude={'assignees'}),
+                          assignees_ids=[assignee.id for assignee in task.assignees])
+
+
+class StreamTaskEventsService:
+    """ Server-Sent Events of the tasks the user is responsible for or assigned to """
+
+    def __init__(self, user: UserBase,
+                 task_events_broker: AbstractTaskEventsBroker,
+                 heartbeat_seconds: float,
+                 last_event_id: Optional[str] = None):
+
+        self.user: UserBase = user
+        self.task_events_broker: AbstractTaskEventsBroker = task_events_broker
+        self.last_event_id: Optional[str] = last_event_id
+        self.heartbeat_seconds: float = heartbeat_seconds
+
+    def stream_events(self) -> AsyncIterator[str] | HTTPException:
+        """ Checks the access and the number of clients right away, before the response is started """
+        ListTasksService.check_role_to_list_tasks(self.user)
+        self.task_events_broker.check_capacity()
+        return self._stream_events()
+
+    async def _stream_events(self) -> AsyncIterator[str]:
+        async with aclosing(self.task_events_broker.listen(self.user.id, self.heartbeat_seconds)) as batches:
+            await anext(batches)
+            yield f'retry: {SSE_RETRY_MILLISECONDS}\n\n'
+            # Events are not kept, a reconnecting client may have missed some
+            if self.last_event_id is not None:
+                yield self._format_event(TaskEvent(type=TaskEventType.RESYNC))
+
+            async for events in batches:
+                if not events:
+                    # Keeps proxies from closing an idle connection and detects the clients that are gone
+                    yield ': keepalive\n\n'
+                for event in events:
+                    yield self._format_event(event)
+
+    @staticmethod
+    def _format_event(event: TaskEvent) -> str:
+        return (f'id: {event.id}\nevent: {event.type.value}\n'
+                f'data: {event.model_dump_json(exclude={"id", "type"}, exclude_none=True)}\n\n')
+
+
+class ListTasksService:
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 task_filter: TaskFilter,
+                 cursor: Optional[str],
+                 limit: int):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.task_filter: TaskFilter = task_filter
+        self.cursor: Optional[str] = cursor
+        self.limit: int = limit
+
+    async def list_tasks(self) -> TasksPage:
+        self.check_role_to_list_tasks(self.user)
+        after: Optional[TaskCursor] = self._decode_cursor()
+
+        tasks: List[ListedTask] = [task async for task in
+                                   self.task_repository.stream_tasks(self.task_filter, after, self.limit)]
+        if not tasks:
+            return TasksPage(tasks=tasks)
+
+        assignees_ids: Dict[int, List[int]] = await self.task_repository.get_assignees_ids_by_tasks_ids(
+            [task.id for task in tasks])
+        for task in tasks:
+            task.assignees_ids = assignees_ids.get(task.id, [])
+
+        next_cursor = None
+        if len(tasks) == self.limit:
+            last_task = tasks[-1]
+            next_cursor = TaskCursor(priority=last_task.priority, status=last_task.status, id=last_task.id).encode()
+
+        return TasksPage(tasks=tasks, next_cursor=next_cursor)
+
+    def _decode_cursor(self) -> Optional[TaskCursor] | HTTPException:
+        if self.cursor is None:
+            return None
+
+        after: Optional[TaskCursor] = TaskCursor.decode(self.cursor)
+        if not after:
+            raise get_exception_400_bad_request_with_detail('Invalid cursor!')
+        return after
+
+    @staticmethod
+    def check_role_to_list_tasks(user: UserBase) -> bool | HTTPException:
+        available_roles: Tuple[UserRole] = tuple(role for role in UserRole if role != role.GUEST)
+        check_result: bool = UserValidationService.check_role_for_access_to_action(user.role, available_roles)
+        if check_result:
+            raise get_exception_403_forbidden_with_detail('You do not have the permissions to view tasks!')
+        return True
+
+
+class ListMyTasksService:
+    """ Pages of the tasks the current user is responsible for or assigned to, oldest task first """
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 cursor: Optional[str],
+                 limit: int):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.cursor: Optional[str] = cursor
+        self.limit: int = limit
+
+    async def list_my_tasks(self) -> TasksPage:
+        ListTasksService.check_role_to_list_tasks(self.user)
+        after: Optional[TaskIdCursor] = self._decode_cursor()
+
+        tasks: List[ListedTask] = [task async for task in
+                                   self.task_repository.stream_user_tasks(self.user.id, after, self.limit)]
+        if not tasks:
+            return TasksPage(tasks=tasks)
+
+        assignees_ids: Dict[int, List[int]] = await self.task_repository.get_assignees_ids_by_tasks_ids(
+            [task.id for task in tasks])
+        for task in tasks:
+            task.assignees_ids = assignees_ids.get(task.id, [])
+
+        next_cursor = TaskIdCursor(id=tasks[-1].id).encode() if len(tasks) == self.limit else None
+        return TasksPage(tasks=tasks, next_cursor=next_cursor)
+
+    def _decode_cursor(self) -> Optional[TaskIdCursor] | HTTPException:
+        if self.cursor is None:
+            return None
+
+        after: Optional[TaskIdCursor] = TaskIdCursor.decode(self.cursor)
+        if not after:
+            raise get_exception_400_bad_request_with_detail('Invalid cursor!')
+        return after
+
+
+class SyncTasksService:
+    """
+        The tasks changed or deleted after the cursor in the order of the changes, so a client keeping
+        next_cursor only downloads what changed since its previous sync
+    """
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 cursor: Optional[str],
+                 limit: int):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.cursor: Optional[str] = cursor
+        self.limit: int = limit
+
+    async def sync_tasks(self) -> TasksChanges:
+        ListTasksService.check_role_to_list_tasks(self.user)
+        after: Optional[ChangesCursor] = self._decode_cursor()
+
+        changes: List[TaskChange] = await self.task_repository.get_tasks_changes(after, self.limit + 1)
+        has_more: bool = len(changes) > self.limit
+        changes = changes[:self.limit]
+
+        tasks: List[ListedTask] = [change.task for change in changes if change.task]
+        if tasks:
+            assignees_ids: Dict[int, List[int]] = await self.task_repository.get_assignees_ids_by_tasks_ids(
+                [task.id for task in tasks])
+            for task in tasks:
+                task.assignees_ids = assignees_ids.get(task.id, [])
+
+        # Nothing changed: the client asks again with the same cursor
+        next_cursor: Optional[str] = self.cursor
+        if changes:
+            next_cursor = ChangesCursor(change_seq=changes[-1].change_seq, task_id=changes[-1].task_id).encode()
+
+        return TasksChanges(tasks=tasks, deleted_tasks_ids=[change.task_id for change in changes if not change.task],
+                            next_cursor=next_cursor, has_more=has_more)
+
+    def _decode_cursor(self) -> Optional[ChangesCursor] | HTTPException:
+        if self.cursor is None:
+            return None
+
+        after: Optional[ChangesCursor] = ChangesCursor.decode(self.cursor)
+        if not after:
+            raise get_exception_400_bad_request_with_detail('Invalid cursor!')
+        return after
+
+
+class GetTaskStatsService:
+    """ Numbers of tasks for the dashboards, read from the counters the writes keep up to date """
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 user_id: Optional[int] = None):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.user_id: Optional[int] = user_id
+
+    async def get_task_stats(self) -> TaskStats:
+        ListTasksService.check_role_to_list_tasks(self.user)
+        return await self.task_repository.get_task_stats(self.user_id)
+
+
+class RebuildTaskCountersService:
+    """ Recounts the task counters from the tasks in one transaction, e.g. after the tasks were seeded """
+
+    def __init__(self, task_repository: AbstractTaskRepository):
+        self.task_repository: AbstractTaskRepository = task_repository
+
+    async def rebuild_task_counters(self) -> TaskStats:
+        await self.task_repository.rebuild_task_counters()
+        await self.task_repository.commit()
+        return await self.task_repository.get_task_stats()
+
+
+class ExportTasksService:
+    """
+        Streams every task matching the filter with its assignees, the memory used doesn't depend on the number
+        of tasks: they are read from one cursor chunk by chunk and the assignees of a chunk are loaded with one query
+    """
+
+    def __init__(self, user: UserBase,
+                 task_repository: AbstractTaskRepository,
+                 task_filter: TaskFilter,
+                 export_format: TasksFileFormat,
+                 chunk_size: int = EXPORT_CHUNK_SIZE):
+
+        self.user: UserBase = user
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.task_filter: TaskFilter = task_filter
+        self.export_format: TasksFileFormat = export_format
+        self.chunk_size: int = chunk_size
+
+    def export_tasks(self) -> AsyncIterator[bytes] | HTTPException:
+        """ Checks the access right away, so a forbidden export fails before the response is started """
+        self._check_role_to_export_tasks()
+        return self._export_tasks()
+
+    async def _export_tasks(self) -> AsyncIterator[bytes]:
+        if self.export_format == TasksFileFormat.CSV:
+            yield self._to_csv([EXPORT_CSV_COLUMNS])
+
+        async for tasks in self.task_repository.stream_tasks_chunks(self.task_filter, self.chunk_size):
+            assignees_ids: Dict[int, List[int]] = await self.task_repository.get_assignees_ids_by_tasks_ids(
+                [task.id for task in tasks])
+            for task in tasks:
+                task.assignees_ids = assignees_ids.get(task.id, [])
+
+            if self.export_format == TasksFileFormat.CSV:
+                yield self._to_csv((task.id, task.name, task.description, task.responsible_person,
+                                    task.status.value, task.priority.value, task.version,
+                                    ' '.join(map(str, task.assignees_ids))) for task in tasks)
+            else:
+                yield ''.join(f'{task.model_dump_json()}\n' for task in tasks).encode()
+
+    @staticmethod
+    def _to_csv(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def _check_role_to_export_tasks(self) -> bool | HTTPException:
+        available_roles: Tuple[UserRole] = tuple(role for role in UserRole if role != role.GUEST)
+        check_result: bool = UserValidationService.check_role_for_access_to_action(self.user.role, available_roles)
+        if check_result:
+            raise get_exception_403_forbidden_with_detail('You do not have the permissions to export tasks!')
+        return True
+
+
+class ImportTasksService(TaskMixin):
+    """
+        Imports tasks from a CSV or NDJSON file read record by record, every chunk of records is inserted with
+        executemany and committed on its own. Tasks whose name already exists are skipped, so an interrupted
+        import can be sent again as is, start_from skips the records committed before without checking them
+    """
+
+    def __init__(self, user: UserBase,
+                 user_repository: AbstractUserRepository,
+                 task_repository: AbstractTaskRepository,
+                 tasks_file: TextIO,
+                 file_format: TasksFileFormat,
+                 start_from: int = 0,
+                 chunk_size: int = IMPORT_CHUNK_SIZE,
+                 on_chunk_imported: Optional[Callable[[ImportedTasks], None]] = None):
+
+        self.user: UserBase = user
+        self.user_repository: AbstractUserRepository = user_repository
+        self.task_repository: AbstractTaskRepository = task_repository
+        self.tasks_file: TextIO = tasks_file
+        self.file_format: TasksFileFormat = file_format
+        self.start_from: int = start_from
+        self.chunk_size: int = chunk_size
+        self.on_chunk_imported: Optional[Callable[[ImportedTasks], None]] = on_chunk_imported
+
+        # Assignees of neighbouring tasks are mostly the same people, only new usernames are looked up
+        self.users_ids: LRUCache[str, int] = LRUCache(max_size=IMPORT_USERNAMES_CACHE_SIZE,
+                                                      ttl_seconds=float('inf'))
+
+    async def import_tasks(self) -> ImportedTasks | HTTPException:
+        self._check_role_to_create_task()
+        imported_tasks = ImportedTasks(records=self.start_from)
+
+        records = itertools.islice(self._read_records(), self.start_from, None)
+        # Decoding and validating a chunk is CPU bound, it runs in a worker thread to keep the event loop free
+        while chunk := await anyio.to_thread.run_sync(self._read_chunk, records, imported_tasks):
+            tasks: List[ImportTask] = await self._get_tasks_to_import(chunk, imported_tasks)
+            if tasks:
+                await self.task_repository.import_tasks(tasks)
+                await self.task_repository.commit()
+
+            imported_tasks.records += len(chunk)
+            imported_tasks.imported += len(tasks)
+            imported_tasks.already_exist += len(chunk) - len(tasks)
+            if self.on_chunk_imported:
+                self.on_chunk_imported(imported_tasks)
+
+        return imported_tasks
+
+    def _read_chunk(self, records: Iterator[Optional[Dict]],
+                    imported_tasks: ImportedTasks) -> List[Tuple[int, ImportedTaskRecord]] | HTTPException:
+        """ The next chunk of records validated, each with its number in the file """
+        try:
+            chunk: List[Optional[Dict]] = list(itertools.islice(records, self.chunk_size))
+        except (UnicodeDecodeError, csv.Error) as e:
+            self._raise_import_error(imported_tasks.records + 1, imported_tasks, f'unreadable file: {e}')
+
+        numbered_records: List[Tuple[int, ImportedTaskRecord]] = []
+        for number, record in enumerate(chunk, start=imported_tasks.records + 1):
+            if record is None:
+                self._raise_import_error(number, imported_tasks, 'invalid JSON')
+            try:
+                numbered_records.append((number, ImportedTaskRecord.model_validate(record)))
+            except ValidationError as e:
+                error = e.errors()[0]
+                self._raise_import_error(number, imported_tasks,
+                                         f'{".".join(map(str, error["loc"])) or "task"}: {error["msg"]}')
+        return numbered_records
+
+    def _read_records(self) -> Iterator[Optional[Dict]]:
+        """ Yields None for a line which is not JSON, so the error is reported with the number of the record """
+        if self.file_format == TasksFileFormat.CSV:
+            for row in csv.DictReader(self.tasks_file):
+                # Empty optional columns fall back to the defaults, values beyond the header are dropped
+                yield {column: value for column, value in row.items()
+                       if column is not None and (value or column in ('name', 'description'))}
+        else:
+            for line in self.tasks_file:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+
+    async def _get_tasks_to_import(self, chunk: List[Tuple[int, ImportedTaskRecord]],
+                                   imported_tasks: ImportedTasks) -> List[ImportTask] | HTTPException:
+        # A name repeated in the file counts as an existing task, like one imported by a previous run
+        records_by_name: Dict[str, Tuple[int, ImportedTaskRecord]] = {}
+        for number, record in chunk:
+            records_by_name.setdefault(record.name, (number, record))
+        for name in await self.task_repository.get_exist_tasks_names(list(records_by_name)):
+            del records_by_name[name]
+
+        users_ids: Dict[str, int] = await self._get_users_ids(record for _, record in records_by_name.values())
+        tasks: List[ImportTask] = []
+        for number, record in records_by_name.values():
+            if record.responsible_username not in users_ids:
+                self._raise_import_error(number, imported_tasks,
+                                         f'responsible user "{record.responsible_username}" not found')
+
+            tasks.append(ImportTask(
+                name=record.name,
+                description=record.description,
+                responsible_person=users_ids[record.responsible_username],
+                status=record.status,
+                priority=record.priority,
+                # Unknown assignees are left out, as for the tasks created through the API
+                assignees_ids=list(dict.fromkeys(users_ids[username] for username in record.assignees_usernames
+                                                 if username in users_ids))
+            ))
+        return tasks
+
+    async def _get_users_ids(self, records) -> Dict[str, int]:
+        usernames = {username for record in records
+                     for username in (record.responsible_username, *record.assignees_usernames)}
+
+        users_ids: Dict[str, int] = {}
+        for username in usernames:
+            user_id = self.users_ids.get(username)
+            if user_id is not None:
+                users_ids[username] = user_id
+
+        not_cached_usernames = list(usernames - users_ids.keys())
+        if not_cached_usernames:
+            found_users_ids = await self.user_repository.get_users_ids_by_usernames(not_cached_usernames)
+            for username, user_id in found_users_ids.items():
+                self.users_ids.set(username, user_id)
+            users_ids.update(found_users_ids)
+        return users_ids
+
+    @staticmethod
+    def _raise_import_error(record_number: int, imported_tasks: ImportedTasks, error: str) -> HTTPException:
+        raise get_exception_400_bad_request_with_detail(
+            f'Record {record_number}: {error}. The first {imported_tasks.records} records are imported, '
+            f'fix the file and send it again with start_from={imported_tasks.records} to resume')
+
+
 class TaskValidationService:
 
     def __init__(self, task_repository: AbstractTaskRepository):
@@ -215,9 +871,3 @@ class TaskValidationService:
         if check_on_exiting_task:
             raise get_exception_400_bad_request_with_detail(f'Task with this name already exists!')
         return False
-
-    async def check_on_exist_task_by_id(self, task_id: int) -> HTTPException | bool:
-        task: TaskBase = await self.task_repository.get_task_by({'id': task_id})
-        if not task:
-            raise get_exception_404_not_found_with_detail(f'Task with id: {task_id} not found!')
-        return False
@@ -0,0 +1,25 @@
+import random
+
+from src.cli.seed import chunked, generate_tasks_users, generate_users
+
+
+class TestSeed:
+
+    def test_chunked(self) -> None:
+        chunks = list(chunked(({'id': number} for number in range(25)), 10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert chunks[-1][-1] == {'id': 24}
+
+    def test_generate_users_reuses_password_hashes(self) -> None:
+        users = list(generate_users(1, 10, range(1, 3), ['hash_1', 'hash_2'], random.Random(0)))
+
+        assert [user['id'] for user in users] == list(range(1, 11))
+        assert {user['password'] for user in users} == {'hash_1', 'hash_2'}
+        assert {user['team_id'] for user in users} <= {1, 2}
+
+    def test_generate_tasks_users_without_duplicates(self) -> None:
+        tasks_users = list(generate_tasks_users(range(1, 101), range(1, 6), 3, random.Random(0)))
+
+        assert len(tasks_users) == 300
+        assert len({(task_user['task_id'], task_user['user_id']) for task_user in tasks_users}) == 300
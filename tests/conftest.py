@@ -2,12 +2,22 @@ import pytest
 from _pytest.fixtures import FixtureFunction
 
 from asyncio import current_task
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 
+import httpx
 from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
 
+from src.main import app
+from src.db.database import db_helper, QueryCounter, count_queries, count_engine_queries
+from src.api.routes.dependencies import SessionDep, get_user_repository, get_session_factory
+from src.api.routes.task_tracker.dependencies import get_task_repository, get_notification_repository
+from src.infrastructure.implementations.cache import user_cache, task_cache
+
 from src.repositories.user.repositories import TestUserRepository
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.notification.repositories import TestNotificationRepository
 from src.infrastructure.dto import UserCreate
 from src.infrastructure.implementations.password_manager import PasswordManager
 from src.services.auth.interfaces import AbstractUserRegister
@@ -72,6 +82,19 @@ async def user_repository(db_session) -> TestUserRepository:
     return TestUserRepository(db_session)
 
 
+@pytest.fixture
+async def task_repository(db_session) -> TestTaskRepository:
+    # the tasks cached by a test are rollbacked with it
+    task_cache.clear()
+    yield TestTaskRepository(db_session)
+    task_cache.clear()
+
+
+@pytest.fixture
+async def notification_repository(db_session) -> TestNotificationRepository:
+    return TestNotificationRepository(db_session)
+
+
 @pytest.fixture
 async def create_user(user_repository: TestUserRepository):
     await user_repository.create_user(UserCreate(username=settings.tests.username,
@@ -93,3 +116,56 @@ def non_exist_user():
                     password=random_lower_string(),
                     email=random_email())
     return user
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    """returns a context manager counting the statements run on the test engine,
+    it fails the test when the budget is exceeded or a statement shape repeats (N+1)"""
+    count_engine_queries(db_engine.sync_engine)
+
+    @contextmanager
+    def query_counter_(budget: int,
+                       repeated_statement_threshold: int = settings.query_counter.repeated_statement_threshold):
+        with count_queries(QueryCounter(budget, repeated_statement_threshold)) as counter:
+            yield counter
+        counter.check()
+
+    return query_counter_
+
+
+def get_test_user_repository(session: SessionDep) -> TestUserRepository:
+    return TestUserRepository(session)
+
+
+def get_test_task_repository(session: SessionDep) -> TestTaskRepository:
+    return TestTaskRepository(session)
+
+
+def get_test_notification_repository(session: SessionDep) -> TestNotificationRepository:
+    return TestNotificationRepository(session)
+
+
+@pytest.fixture
+async def api_client(db_session):
+    """yields a client calling the app in-process, every request runs in db_session which is rollbacked after the test"""
+    async def get_session():
+        yield db_session
+        # the test repositories don't commit, flushing here keeps the writes of a request inside that request
+        await db_session.flush()
+
+    app.dependency_overrides[db_helper.get_session] = get_session
+    # streamed responses close the session they are given, which rollbacks the test data as well
+    app.dependency_overrides[get_session_factory] = lambda: lambda: db_session
+    app.dependency_overrides[get_user_repository] = get_test_user_repository
+    app.dependency_overrides[get_task_repository] = get_test_task_repository
+    app.dependency_overrides[get_notification_repository] = get_test_notification_repository
+    user_cache.clear()
+    task_cache.clear()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test/api/v1') as client:
+        yield client
+
+    app.dependency_overrides.clear()
+    user_cache.clear()
+    task_cache.clear()
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from src.infrastructure.implementations.admission_control import AdaptiveConcurrencyLimiter
+from src.infrastructure.implementations.metrics import admission_queue_wait_seconds
+
+
+def get_limiter(**kwargs) -> AdaptiveConcurrencyLimiter:
+    options = dict(name='test', min_limit=1, max_limit=8, initial_limit=2, max_queue_size=2,
+                   max_queue_wait_seconds=1, latency_target_seconds=0.1, backoff_ratio=0.5)
+    options.update(kwargs)
+    return AdaptiveConcurrencyLimiter(**options)
+
+
+async def hold_slot(limiter: AdaptiveConcurrencyLimiter, seconds: float, latency_seconds: float = 0.0) -> None:
+    await limiter.acquire()
+    await asyncio.sleep(seconds)
+    limiter.release(latency_seconds)
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    @pytest.mark.anyio
+    async def test_queues_over_the_limit_and_rejects_when_queue_is_full(self) -> None:
+        limiter = get_limiter()
+
+        results = await asyncio.gather(*(hold_slot(limiter, 0.05) for _ in range(5)), return_exceptions=True)
+
+        rejected = [result for result in results if isinstance(result, HTTPException)]
+        assert len(rejected) == 1 and rejected[0].status_code == 503
+        assert int(rejected[0].headers['Retry-After']) >= 1
+        assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+    @pytest.mark.anyio
+    async def test_rejects_after_the_max_queue_wait(self) -> None:
+        limiter = get_limiter(initial_limit=1, max_queue_wait_seconds=0.01)
+        await limiter.acquire()
+
+        with pytest.raises(HTTPException) as exception_info:
+            await limiter.acquire()
+
+        assert exception_info.value.status_code == 503
+        assert limiter.queue_depth == 0
+        limiter.release(0.0)
+        assert limiter.in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_slot_handed_over_at_the_timeout_is_freed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        limiter = get_limiter(initial_limit=1)
+        await limiter.acquire()
+
+        async def wait_for(waiter: asyncio.Future, timeout: float) -> None:
+            # The slot is handed over to the waiter in the same loop tick the wait times out
+            limiter.release(0.0)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, 'wait_for', wait_for)
+        with pytest.raises(HTTPException) as exception_info:
+            await limiter.acquire()
+
+        assert exception_info.value.status_code == 503
+        assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+    @pytest.mark.anyio
+    async def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        limiter = get_limiter(initial_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release(0.0)
+
+        assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+    @pytest.mark.anyio
+    async def test_limit_grows_while_fast_and_used_up(self) -> None:
+        limiter = get_limiter(initial_limit=1)
+
+        for _ in range(10):
+            await limiter.acquire()
+            limiter.release(0.01)
+
+        assert limiter.current_limit > 1
+
+    @pytest.mark.anyio
+    async def test_limit_stays_while_fast_and_idle(self) -> None:
+        limiter = get_limiter(initial_limit=4)
+
+        for _ in range(10):
+            await limiter.acquire()
+            limiter.release(0.01)
+
+        assert limiter.current_limit == 4
+
+    @pytest.mark.anyio
+    async def test_limit_shrinks_once_per_round_trip_when_slow(self) -> None:
+        limiter = get_limiter(initial_limit=8)
+
+        for _ in range(4):
+            await limiter.acquire()
+        for _ in range(4):
+            limiter.release(10)
+
+        # four slow requests of the same round trip halve the limit once
+        assert limiter.current_limit == 4
+        assert limiter.in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_auth_routes_go_through_admission(self, api_client: AsyncClient) -> None:
+        admitted = admission_queue_wait_seconds.labels('auth').count
+
+        response = await api_client.post('/auth/login/', data={'username': 'unknown', 'password': 'unknown'})
+
+        assert response.status_code != 503
+        assert admission_queue_wait_seconds.labels('auth').count == admitted + 1
@@ -0,0 +1,178 @@
+import time
+
+import pytest
+
+from tests.conftest import TestUser
+
+from src.api.routes.task_tracker.dto import APIUpdateTask
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task
+from src.domain.auth.entities import UserBase
+from src.domain.task_tracker.entities import TaskBase
+from src.infrastructure.dto import UserCreate
+from src.infrastructure.implementations.cache import LRUCache, LRUTaskCache, get_task_size, task_cache, user_cache
+from src.infrastructure.implementations.metrics import metrics_registry
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.services import UpdateTaskService, DeleteTaskService
+from src.utils import random_lower_string, random_email
+
+
+class TestLRUCache:
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl_seconds=60)
+        cache.set(1, 'first')
+        cache.set(2, 'second')
+        cache.get(1)
+        cache.set(3, 'third')
+
+        assert cache.get(2) is None
+        assert cache.get(1) == 'first' and cache.get(3) == 'third'
+
+        stats = cache.stats()
+        assert (stats.size, stats.hits, stats.misses, stats.evictions) == (2, 3, 1, 1)
+
+    def test_expires_entries(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(max_size=2, ttl_seconds=0.01)
+        cache.set(1, 'first')
+        time.sleep(0.02)
+
+        assert cache.get(1) is None
+        assert cache.stats().size == 0
+
+
+class TestUserCacheInvalidation:
+
+    def test_user_cache_stats_on_metrics(self) -> None:
+        user_cache.get(-1)
+        lines = metrics_registry.render().splitlines()
+
+        assert f'cache_misses_total{{cache="user"}} {user_cache.misses}' in lines
+        assert f'cache_entries{{cache="user"}} {user_cache.stats().size}' in lines
+
+    @pytest.mark.anyio
+    async def test_update_and_delete_invalidate_user(self, db_session, exist_user: TestUser) -> None:
+        cache: LRUCache[int, UserBase] = LRUCache(max_size=10, ttl_seconds=60)
+        user_repository = TestUserRepository(db_session, cache)
+        user: UserBase = await user_repository.get_user_by(username=exist_user.username)
+
+        cache.set(user.id, user)
+        await user_repository.update_user_by({'id': user.id}, {'email': 'changed@email.com'})
+        assert cache.get(user.id) is None
+
+        cache.set(user.id, user)
+        await user_repository.delete_user({'username': user.username})
+        assert cache.get(user.id) is None
+
+
+def get_task(task_id: int, name: str, description: str = '') -> TaskBase:
+    return TaskBase(id=task_id, name=name, description=description, responsible_person=1,
+                    status=TaskStatus.TODO, priority=TaskPriority.LOW, assignees=[], version=1)
+
+
+class TestLRUTaskCache:
+
+    def test_evicts_over_max_bytes(self) -> None:
+        task_size = get_task_size(get_task(1, 'first'))
+        cache = LRUTaskCache(max_size=10, ttl_seconds=60, max_bytes=int(task_size * 2.5))
+        cache.set(get_task(1, 'first'))
+        cache.set(get_task(2, 'second'))
+        cache.set(get_task(3, 'third', description='x' * 200))
+
+        assert cache.get(1) is None
+        assert cache.get(2).name == 'second' and cache.get_by_name('third').id == 3
+
+        stats = cache.stats()
+        assert (stats.by_id.size, stats.by_id.evictions) == (2, 1)
+        assert stats.by_id.weight <= task_size * 2.5
+
+    def test_name_of_invalidated_task_is_a_miss(self) -> None:
+        cache = LRUTaskCache(max_size=10, ttl_seconds=60, max_bytes=1024 * 1024)
+        cache.set(get_task(1, 'old name'))
+        cache.invalidate([1])
+        cache.set(get_task(1, 'new name'))
+
+        assert cache.get_by_name('old name') is None
+        assert cache.get_by_name('new name').id == 1
+
+    def test_task_read_before_invalidation_is_not_cached(self) -> None:
+        cache = LRUTaskCache(max_size=10, ttl_seconds=60, max_bytes=1024 * 1024)
+        generation = cache.get_generation()
+        # the update commits and invalidates the task while the old row is being read
+        cache.invalidate([1], ['old name'])
+        cache.set(get_task(1, 'old name'), generation)
+
+        assert cache.get(1) is None and cache.get_by_name('old name') is None
+
+        cache.set(get_task(2, 'other'), generation)
+        assert cache.get(2).name == 'other'
+
+    def test_forgotten_invalidations_refuse_older_reads(self) -> None:
+        cache = LRUTaskCache(max_size=2, ttl_seconds=60, max_bytes=1024 * 1024)
+        generation = cache.get_generation()
+        cache.invalidate([1, 2, 3])
+
+        cache.set(get_task(1, 'first'), generation)
+        assert cache.get(1) is None
+
+        cache.set(get_task(1, 'first'), cache.get_generation())
+        assert cache.get(1).name == 'first'
+
+    def test_task_cache_stats_on_metrics(self) -> None:
+        by_id = task_cache.stats().by_id
+        lines = metrics_registry.render().splitlines()
+
+        assert f'cache_hits_total{{cache="task_by_id"}} {by_id.hits}' in lines
+        assert any(line.startswith('cache_entries{cache="task_by_name"}') for line in lines)
+
+
+class TestTaskCacheInvalidation:
+
+    @pytest.fixture
+    async def admin(self, user_repository: TestUserRepository) -> UserBase:
+        username = random_lower_string()
+        await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                     email=random_email(), register_at=None, role=UserRole.ADMIN))
+        return await user_repository.get_user_by(username=username)
+
+    @pytest.fixture
+    async def task(self, task_repository: TestTaskRepository, admin: UserBase) -> Task:
+        task = Task(name=random_lower_string(), description=random_lower_string(),
+                    responsible_person=admin.id, status=TaskStatus.TODO, priority=TaskPriority.LOW)
+        task_repository.session.add(task)
+        await task_repository.session.flush()
+        return task
+
+    @pytest.mark.anyio
+    async def test_update_and_delete_invalidate_task(self, user_repository: TestUserRepository,
+                                                     task_repository: TestTaskRepository,
+                                                     notification_repository: TestNotificationRepository,
+                                                     admin: UserBase, task: Task) -> None:
+        task_repository.cache = LRUTaskCache(max_size=10, ttl_seconds=60, max_bytes=1024 * 1024)
+        old_name = task.name
+        assert (await task_repository.get_task_by({'name': old_name})).id == task.id
+        assert (await task_repository.get_task_by({'id': task.id})).name == old_name
+        assert task_repository.cache.stats().by_id.hits == 1
+
+        new_name = random_lower_string()
+        await UpdateTaskService(admin, user_repository, task_repository, notification_repository,
+                                APIUpdateTask(name=new_name), task.id).update_task()
+        assert (await task_repository.get_task_by({'id': task.id})).name == new_name
+        assert await task_repository.get_task_by({'name': old_name}) is None
+
+        # Cached tasks hold the emails of their users
+        await UpdateTaskService(admin, user_repository, task_repository, notification_repository,
+                                APIUpdateTask(assignees_ids=[admin.id]), task.id).update_task()
+        assert (await task_repository.get_task_by({'id': task.id})).assignees[0].email == admin.email
+        new_email = random_email()
+        await TestUserRepository(user_repository.session, task_cache=task_repository.cache).update_user_by(
+            {'id': admin.id}, {'email': new_email})
+        assert task_repository.cache.get(task.id) is None
+        assert (await task_repository.get_task_by({'id': task.id})).assignees[0].email == new_email
+
+        await DeleteTaskService(admin, user_repository, task_repository, notification_repository,
+                                task.id).delete_task()
+        assert await task_repository.get_task_by({'id': task.id}) is None
+        assert await task_repository.get_task_by({'name': new_name}) is None
@@ -0,0 +1,44 @@
+import json
+import logging
+from typing import List
+
+from src.infrastructure.implementations.logging_queue import JSONFormatter, QueueLogging
+
+
+class CollectingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class TestQueueLogging:
+
+    def test_json_formatter(self) -> None:
+        record = logging.LogRecord('app', logging.INFO, __file__, 10, 'task %s updated', (1,), None)
+        record.task_id = 1
+
+        log = json.loads(JSONFormatter().format(record))
+
+        assert log['level'] == 'INFO'
+        assert log['message'] == 'task 1 updated'
+        assert log['task_id'] == 1
+
+    def test_records_reach_handlers_through_queue(self) -> None:
+        logger = logging.getLogger('test_queue_logging')
+        logger.setLevel(logging.DEBUG)
+        handler = CollectingHandler()
+        logger.handlers = [handler]
+        data_for_update = {'status': 'Done'}
+
+        queue_logging = QueueLogging()
+        queue_logging.start([logger.name])
+        logger.debug('data_for_update = %s', data_for_update)
+        data_for_update['status'] = 'To do'
+        queue_logging.stop()
+
+        assert logger.handlers == [handler]
+        assert [record.getMessage() for record in handler.records] == ["data_for_update = {'status': 'Done'}"]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+from starlette.types import Message, Receive, Scope, Send
+
+from src.api.middlewares import MetricsMiddleware
+from src.db.database import get_statement_labels, instrument_engine
+from src.db.models import User
+from src.infrastructure.implementations.metrics import Counter, Histogram, MetricsRegistry
+from src.infrastructure.implementations.metrics import db_statement_duration_seconds, http_request_duration_seconds
+
+
+class TestMetrics:
+
+    def test_render_histogram(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.register(Histogram('request_seconds', 'Latency', ['route'], buckets=(0.1, 1)))
+        for value in (0.05, 0.5, 5):
+            histogram.labels('/tasks/').observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert '# TYPE request_seconds histogram' in lines
+        assert 'request_seconds_bucket{route="/tasks/",le="0.1"} 1' in lines
+        assert 'request_seconds_bucket{route="/tasks/",le="1"} 2' in lines
+        assert 'request_seconds_bucket{route="/tasks/",le="+Inf"} 3' in lines
+        assert 'request_seconds_count{route="/tasks/"} 3' in lines
+
+    def test_render_counter_escapes_labels(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.register(Counter('errors_total', 'Errors', ['message']))
+        counter.labels('say "hi"').inc(2)
+
+        assert 'errors_total{message="say \\"hi\\""} 2' in registry.render().splitlines()
+
+    def test_collectors_run_before_render(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.register(Counter('hits_total', 'Hits', ['cache']))
+        totals = {'user': 3}
+        registry.add_collector(lambda: counter.labels('user').set(totals['user']))
+
+        assert 'hits_total{cache="user"} 3' in registry.render().splitlines()
+        totals['user'] = 5
+        assert 'hits_total{cache="user"} 5' in registry.render().splitlines()
+
+    def test_statement_labels(self) -> None:
+        assert get_statement_labels('SELECT task.id FROM task JOIN task_user ON 1') == ('SELECT', 'task')
+        assert get_statement_labels('INSERT INTO task_user (task_id, user_id) VALUES (?, ?)') == ('INSERT', 'task_user')
+        assert get_statement_labels('UPDATE notification SET attempts=?') == ('UPDATE', 'notification')
+
+    @pytest.mark.anyio
+    async def test_event_stream_latency_is_time_to_first_byte(self) -> None:
+        route = APIRoute('/events/', endpoint=lambda: None)
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            scope['route'] = route
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': [(b'content-type', b'text/event-stream; charset=utf-8')]})
+            # the client listens for a while
+            await asyncio.sleep(0.2)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+        async def send(message: Message) -> None:
+            pass
+
+        histogram = http_request_duration_seconds.labels('GET', '/events/', '200')
+        count_before, sum_before = histogram.count, histogram.sum
+        await MetricsMiddleware(app)({'type': 'http', 'method': 'GET', 'path': '/events/'}, None, send)
+
+        assert histogram.count == count_before + 1
+        assert histogram.sum - sum_before < 0.1
+
+    @pytest.mark.anyio
+    async def test_engine_events(self, db_engine) -> None:
+        instrument_engine(db_engine.sync_engine)
+        statements_before = db_statement_duration_seconds.labels('SELECT', 'user').count
+
+        async with db_engine.connect() as connection:
+            await connection.execute(select(User.id).limit(1))
+
+        assert db_statement_duration_seconds.labels('SELECT', 'user').count == statements_before + 1
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import nullcontext
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import select
+
+from src.db.enums import NotificationStatus
+from src.db.models import Notification
+from src.infrastructure.implementations.notification_dispatcher import NotificationDispatcher
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.services.notifications.interfaces import AbstractEmailBackend
+from src.utils import random_email
+
+
+class FakeEmailBackend(AbstractEmailBackend):
+
+    def __init__(self, failing_receivers: Tuple[str, ...] = ()):
+        self.failing_receivers: Tuple[str, ...] = failing_receivers
+        self.sent: List[Tuple[str, str, str]] = []
+
+    async def send_email(self, to: str, subject: str, body: str) -> None:
+        if to in self.failing_receivers:
+            raise ConnectionError('SMTP server is unavailable')
+        self.sent.append((to, subject, body))
+
+    async def close(self) -> None:
+        pass
+
+
+class SlowEmailBackend(FakeEmailBackend):
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+
+    async def send_email(self, to: str, subject: str, body: str) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        await super().send_email(to, subject, body)
+
+
+class TestNotificationDispatcher:
+
+    @staticmethod
+    def get_dispatcher(email_backend: AbstractEmailBackend, max_attempts: int = 3,
+                       max_concurrency: int = 20) -> NotificationDispatcher:
+        return NotificationDispatcher(email_backend, batch_size=1000, poll_interval_seconds=0, lease_seconds=60,
+                                      max_attempts=max_attempts, backoff_base_seconds=0, backoff_max_seconds=0,
+                                      notification_repository_class=TestNotificationRepository,
+                                      max_concurrency=max_concurrency)
+
+    @staticmethod
+    async def get_notification(notification_repository: TestNotificationRepository, recipient: str) -> Notification:
+        result = await notification_repository.session.execute(
+            select(Notification).where(Notification.recipient == recipient).execution_options(populate_existing=True))
+        return result.scalar_one()
+
+    @pytest.mark.anyio
+    async def test_dispatch_batch(self, notification_repository: TestNotificationRepository) -> None:
+        receivers = [random_email() for _ in range(3)]
+        await notification_repository.add_notifications(receivers, 'Task Created!', 'Task: test has been created!')
+
+        email_backend = FakeEmailBackend()
+        dispatcher = self.get_dispatcher(email_backend)
+        await dispatcher.dispatch_batch(lambda: nullcontext(notification_repository.session))
+
+        assert {to for to, _, _ in email_backend.sent}.issuperset(receivers)
+        for receiver in receivers:
+            notification = await self.get_notification(notification_repository, receiver)
+            assert notification.status == NotificationStatus.SENT
+            assert notification.attempts == 1
+
+    @pytest.mark.anyio
+    async def test_dispatch_batch_caps_concurrency(self, notification_repository: TestNotificationRepository) -> None:
+        receivers = [random_email() for _ in range(6)]
+        await notification_repository.add_notifications(receivers, 'Task Created!', 'Task: test has been created!')
+
+        email_backend = SlowEmailBackend()
+        dispatcher = self.get_dispatcher(email_backend, max_concurrency=2)
+        await dispatcher.dispatch_batch(lambda: nullcontext(notification_repository.session))
+
+        assert {to for to, _, _ in email_backend.sent}.issuperset(receivers)
+        assert email_backend.max_in_flight == 2
+
+    @pytest.mark.anyio
+    async def test_dispatch_batch_retries_and_gives_up(self,
+                                                       notification_repository: TestNotificationRepository) -> None:
+        receiver = random_email()
+        await notification_repository.add_notifications([receiver], 'Task Changed!', 'Task: test updated!')
+
+        dispatcher = self.get_dispatcher(FakeEmailBackend(failing_receivers=(receiver,)), max_attempts=2)
+        session_factory = lambda: nullcontext(notification_repository.session)
+
+        await dispatcher.dispatch_batch(session_factory)
+        notification = await self.get_notification(notification_repository, receiver)
+        assert notification.status == NotificationStatus.PENDING
+        assert notification.attempts == 1
+        assert 'SMTP server is unavailable' in notification.last_error
+
+        await dispatcher.dispatch_batch(session_factory)
+        notification = await self.get_notification(notification_repository, receiver)
+        assert notification.status == NotificationStatus.DEAD
+        assert notification.attempts == 2
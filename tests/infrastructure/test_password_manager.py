@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.implementations.metrics import metrics_registry
+from src.infrastructure.implementations.metrics import password_hashing_queue_wait_seconds, password_hashing_rejected_total
+from src.infrastructure.implementations.password_manager import PasswordHashingPool, PasswordManager
+
+
+class TestPasswordManager:
+
+    @pytest.mark.anyio
+    async def test_async_hash_and_validate_password(self) -> None:
+        hashed_password = await PasswordManager.async_hash_password('password')
+
+        assert await PasswordManager.async_validate_password('password', hashed_password) is True
+        assert await PasswordManager.async_validate_password('wrong password', hashed_password) is False
+
+
+class TestPasswordHashingPool:
+
+    @pytest.mark.anyio
+    async def test_rejects_when_queue_is_full(self) -> None:
+        pool = PasswordHashingPool(executor='thread', workers=1, max_queue_size=1)
+        waited = password_hashing_queue_wait_seconds.labels().count
+        rejected_before = password_hashing_rejected_total.labels().value
+
+        results = await asyncio.gather(*(pool.run(time.sleep, 0.1) for _ in range(3)), return_exceptions=True)
+        pool.shutdown()
+
+        rejected = [result for result in results if isinstance(result, HTTPException)]
+        assert len(rejected) == 1 and rejected[0].status_code == 503
+
+        stats = pool.stats()
+        assert stats.completed == 2 and stats.rejected == 1
+        assert stats.in_flight == 0 and stats.queue_depth == 0
+        assert stats.max_wait_seconds >= 0.05
+
+        assert password_hashing_queue_wait_seconds.labels().count == waited + 2
+        assert password_hashing_rejected_total.labels().value == rejected_before + 1
+        assert 'password_hashing_queue_depth 0' in metrics_registry.render().splitlines()
@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.types import Receive, Scope, Send
+
+from src.api.middlewares import QueryCounterMiddleware
+from src.db.database import QueryBudgetExceeded, QueryCounter, count_queries, count_engine_queries
+
+
+@pytest.fixture
+async def engine():
+    engine_ = create_async_engine('sqlite+aiosqlite://')
+    count_engine_queries(engine_.sync_engine)
+    yield engine_
+    await engine_.dispose()
+
+
+class TestQueryCounter:
+
+    @pytest.mark.anyio
+    async def test_repeated_statements(self, engine) -> None:
+        with count_queries(QueryCounter(budget=10, repeated_statement_threshold=3)) as query_counter:
+            async with engine.connect() as connection:
+                select_in = text('SELECT 1 WHERE 1 IN :ids').bindparams(bindparam('ids', expanding=True))
+                for ids in ([1], [1, 2], [1, 2, 3]):
+                    # an IN list of another length is still the same statement shape
+                    await connection.execute(select_in, {'ids': ids})
+                    await connection.execute(text('SELECT :id'), {'id': ids[-1]})
+
+        assert query_counter.count == 6
+        assert query_counter.get_repeated_statements() == {'SELECT 1 WHERE 1 IN (?)': 3, 'SELECT ?': 3}
+        with pytest.raises(QueryBudgetExceeded):
+            query_counter.check()
+
+    @pytest.mark.anyio
+    async def test_nested_counters_and_raise(self, engine) -> None:
+        with count_queries(QueryCounter(budget=10, repeated_statement_threshold=10)) as outer:
+            with count_queries(QueryCounter(budget=1, repeated_statement_threshold=10,
+                                            raise_on_violation=True)) as inner:
+                async with engine.connect() as connection:
+                    await connection.execute(text('SELECT 1'))
+                    with pytest.raises(QueryBudgetExceeded):
+                        await connection.execute(text('SELECT 2'))
+
+        assert inner.count == 2
+        assert outer.count == 2
+        outer.check()
+
+    @pytest.mark.anyio
+    async def test_middleware_logs_violations(self, engine, caplog) -> None:
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            async with engine.connect() as connection:
+                for _ in range(3):
+                    await connection.execute(text('SELECT 1'))
+
+        middleware = QueryCounterMiddleware(app, budget=2, repeated_statement_threshold=3)
+        with caplog.at_level(logging.WARNING, logger='app'):
+            await middleware({'type': 'http', 'method': 'GET', 'path': '/tasks/'}, None, None)
+
+        assert '3 statements, budget is 2' in caplog.text
+        assert '3 x SELECT 1' in caplog.text
@@ -0,0 +1,82 @@
+import socket
+from typing import List
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.infrastructure.implementations.email import SMTPEmailManager
+from src.infrastructure.implementations.smtp import SMTPConnection, SMTPConnectionPool, SMTPError
+
+
+class RecordingHandler:
+
+    def __init__(self, pipelining: bool):
+        self.pipelining: bool = pipelining
+        self.messages: List[tuple] = []
+        self.connections: int = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        if self.pipelining:
+            responses.insert(-1, '250-PIPELINING')
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith('rejected'):
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.mail_from, envelope.rcpt_tos, envelope.content))
+        return '250 Message accepted for delivery'
+
+
+def get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+class TestSMTPEmailManager:
+
+    @pytest.fixture(params=[True, False], ids=['pipelining', 'no_pipelining'])
+    def smtp_server(self, request):
+        handler = RecordingHandler(pipelining=request.param)
+        controller = Controller(handler, hostname='127.0.0.1', port=get_free_port())
+        controller.start()
+        yield controller
+        controller.stop()
+
+    @staticmethod
+    def get_email_manager(smtp_server: Controller, pool_size: int = 2) -> SMTPEmailManager:
+        pool = SMTPConnectionPool(lambda: SMTPConnection(smtp_server.hostname, smtp_server.port, timeout_seconds=5),
+                                  size=pool_size, max_messages_per_connection=1000)
+        return SMTPEmailManager('tracker@example.com', pool, max_concurrency=10)
+
+    @pytest.mark.anyio
+    async def test_send_emails_reuses_connections(self, smtp_server: Controller) -> None:
+        email_manager = self.get_email_manager(smtp_server)
+        receivers = [f'user{number}@example.com' for number in range(50)]
+
+        failed_receivers = await email_manager.send_emails(receivers, 'Task Created!', '.starts with a dot')
+        await email_manager.close()
+
+        assert failed_receivers == []
+        assert email_manager.pool.connections_opened == 2
+        assert smtp_server.handler.connections == 2
+        assert sorted(rcpt_tos[0] for _, rcpt_tos, _ in smtp_server.handler.messages) == sorted(receivers)
+        assert b'\r\n.starts with a dot' in smtp_server.handler.messages[0][2]
+
+    @pytest.mark.anyio
+    async def test_rejected_recipient_keeps_connection(self, smtp_server: Controller) -> None:
+        email_manager = self.get_email_manager(smtp_server, pool_size=1)
+
+        with pytest.raises(SMTPError):
+            await email_manager.send_email('rejected@example.com', 'Task Changed!', 'body')
+        await email_manager.send_email('user@example.com', 'Task Changed!', 'body')
+        await email_manager.close()
+
+        assert email_manager.pool.connections_opened == 1
+        assert [rcpt_tos for _, rcpt_tos, _ in smtp_server.handler.messages] == [['user@example.com']]
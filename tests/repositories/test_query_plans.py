@@ -0,0 +1,220 @@
+import inspect
+import re
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Set, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.infrastructure.implementations.cache import NoTaskCache
+from src.repositories.task.repositories import TaskRepository, TestTaskRepository
+from src.repositories.user.repositories import UserRepository, TestUserRepository
+from src.services.task_tracker.dto import CreateTask, ImportTask, TaskFilter, TaskCursor, TaskIdCursor, ChangesCursor
+from src.utils import random_lower_string, random_email
+
+
+# Tables growing with the number of users and tasks, a plan reading all their rows fails the suite
+LARGE_TABLES = {'user', 'task', 'task_user', 'task_tombstone'}
+# Full scans a method needs by design, as they appear in the plan
+ALLOWED_SCANS: Dict[str, Set[str]] = {
+    # The first page without filters walks the listing index in order and stops after `limit` rows
+    'TaskRepository.stream_tasks': {'SCAN task USING INDEX ix_task_priority_status_id'},
+    # The export without filters reads every task once, in id order
+    'TaskRepository.stream_tasks_chunks': {'SCAN task'},
+    # Recounts every task, each GROUP BY walks the smallest index starting with its column
+    'TaskRepository.rebuild_task_counters': {
+        'SCAN task USING COVERING INDEX ix_task_status_priority_id',
+        'SCAN task USING COVERING INDEX ix_task_priority_status_id',
+        'SCAN task USING COVERING INDEX ix_task_responsible_person_id',
+        'SCAN task_user_1 USING COVERING INDEX ix_task_user_user_id_task_id',
+    },
+}
+# Methods without SQL of their own
+NO_STATEMENTS = {'TaskRepository.invalidate_cached_tasks', 'TaskRepository.commit', 'UserRepository.commit'}
+
+Statement = Tuple[str, Any]
+RepositoryCall = Callable[[TestUserRepository, TestTaskRepository, 'Dataset'], Awaitable[Any]]
+
+
+class Dataset:
+    def __init__(self, users: List[UserBase], tasks_ids: List[int]):
+        self.users: List[UserBase] = users
+        self.tasks_ids: List[int] = tasks_ids
+
+
+async def consume(tasks) -> list:
+    return [task async for task in tasks]
+
+
+async def stream_tasks(user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                       dataset: Dataset) -> None:
+    """ Every filter of the task listing, the first page and a next one """
+    after = TaskCursor(priority=TaskPriority.LOW, status=TaskStatus.TODO, id=dataset.tasks_ids[0])
+    for task_filter in (TaskFilter(), TaskFilter(status=TaskStatus.TODO), TaskFilter(priority=TaskPriority.LOW),
+                        TaskFilter(status=TaskStatus.TODO, priority=TaskPriority.LOW),
+                        TaskFilter(responsible_person_id=dataset.users[0].id),
+                        TaskFilter(assignee_id=dataset.users[1].id)):
+        for cursor in (None, after):
+            await consume(task_repository.stream_tasks(task_filter, cursor, 50))
+
+
+async def get_user_by(user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                      dataset: Dataset) -> None:
+    """ Lookups of the current user, of login and of the registration checks """
+    for filter_by in ({'id': dataset.users[0].id}, {'username': dataset.users[0].username},
+                      {'email': dataset.users[0].email}):
+        await user_repository.get_user_by(**filter_by)
+
+
+async def get_tasks_ids(user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                        dataset: Dataset) -> None:
+    """ Every filter of the bulk update """
+    for task_filter in (TaskFilter(status=TaskStatus.TODO), TaskFilter(priority=TaskPriority.LOW),
+                        TaskFilter(responsible_person_id=dataset.users[0].id),
+                        TaskFilter(assignee_id=dataset.users[1].id)):
+        await task_repository.get_tasks_ids(task_filter, 5001)
+
+
+def get_task_to_create(dataset: Dataset) -> CreateTask:
+    return CreateTask(name=random_lower_string(), description=random_lower_string(),
+                      responsible_person=dataset.users[0].id, assignees=[])
+
+
+def get_task_to_import(dataset: Dataset) -> ImportTask:
+    return ImportTask(name=random_lower_string(), description=random_lower_string(),
+                      responsible_person=dataset.users[0].id, status=TaskStatus.TODO, priority=TaskPriority.LOW,
+                      assignees_ids=[dataset.users[1].id])
+
+
+# One call per public method of the repositories, with the arguments the services use
+REPOSITORY_CALLS: Dict[str, RepositoryCall] = {
+    'UserRepository.get_user_model_by': lambda users, tasks, dataset: users.get_user_model_by(
+        id=dataset.users[0].id),
+    'UserRepository.get_user_by': get_user_by,
+    'UserRepository.get_users_by_ids': lambda users, tasks, dataset: users.get_users_by_ids(
+        [user.id for user in dataset.users]),
+    'UserRepository.get_users_emails_by_ids': lambda users, tasks, dataset: users.get_users_emails_by_ids(
+        [user.id for user in dataset.users]),
+    'UserRepository.get_users_ids_by_usernames': lambda users, tasks, dataset: users.get_users_ids_by_usernames(
+        [user.username for user in dataset.users]),
+    'UserRepository.update_user_by': lambda users, tasks, dataset: users.update_user_by(
+        {'id': dataset.users[0].id}, {'last_login': None}),
+    'UserRepository.create_user': lambda users, tasks, dataset: users.create_user(UserCreate(
+        username=random_lower_string(), password=random_lower_string(), email=random_email(), register_at=None)),
+    'UserRepository.delete_user': lambda users, tasks, dataset: users.delete_user({'id': dataset.users[2].id}),
+
+    'TaskRepository.get_task_model_by': lambda users, tasks, dataset: tasks.get_task_model_by(
+        {'id': dataset.tasks_ids[0]}, with_assignees=True),
+    'TaskRepository.get_task_by': lambda users, tasks, dataset: tasks.get_task_by({'id': dataset.tasks_ids[0]}),
+    'TaskRepository.stream_tasks': stream_tasks,
+    'TaskRepository.stream_tasks_chunks': lambda users, tasks, dataset: consume(tasks.stream_tasks_chunks(
+        TaskFilter(), 100)),
+    'TaskRepository.stream_user_tasks': lambda users, tasks, dataset: consume(tasks.stream_user_tasks(
+        dataset.users[1].id, TaskIdCursor(id=dataset.tasks_ids[0]), 50)),
+    'TaskRepository.get_task_version': lambda users, tasks, dataset: tasks.get_task_version(dataset.tasks_ids[0]),
+    'TaskRepository.get_tasks_changes': lambda users, tasks, dataset: tasks.get_tasks_changes(
+        ChangesCursor(change_seq=0, task_id=dataset.tasks_ids[0]), 500),
+    'TaskRepository.get_assignees_ids_by_tasks_ids': lambda users, tasks, dataset: (
+        tasks.get_assignees_ids_by_tasks_ids(dataset.tasks_ids)),
+    'TaskRepository.update_task_by_id': lambda users, tasks, dataset: tasks.update_task_by_id(
+        dataset.tasks_ids[0], {'status': TaskStatus.DONE, 'responsible_person': dataset.users[1].id},
+        expected_versions=[1]),
+    'TaskRepository.replace_task_assignees': lambda users, tasks, dataset: tasks.replace_task_assignees(
+        dataset.tasks_ids[0], [dataset.users[0].id]),
+    'TaskRepository.get_task_receivers': lambda users, tasks, dataset: tasks.get_task_receivers(
+        dataset.tasks_ids[0], dataset.users[0].id),
+    'TaskRepository.get_tasks_ids': get_tasks_ids,
+    'TaskRepository.update_tasks': lambda users, tasks, dataset: tasks.update_tasks(
+        dataset.tasks_ids, None, {'priority': TaskPriority.HIGH, 'responsible_person': dataset.users[1].id}),
+    'TaskRepository.get_tasks_receivers': lambda users, tasks, dataset: tasks.get_tasks_receivers(
+        dataset.tasks_ids),
+    'TaskRepository.create_task': lambda users, tasks, dataset: tasks.create_task(get_task_to_create(dataset)),
+    'TaskRepository.create_tasks': lambda users, tasks, dataset: tasks.create_tasks(
+        [get_task_to_create(dataset) for _ in range(3)]),
+    'TaskRepository.import_tasks': lambda users, tasks, dataset: tasks.import_tasks(
+        [get_task_to_import(dataset) for _ in range(3)]),
+    'TaskRepository.get_exist_tasks_names': lambda users, tasks, dataset: tasks.get_exist_tasks_names(
+        [random_lower_string() for _ in range(3)]),
+    'TaskRepository.delete_task_by': lambda users, tasks, dataset: tasks.delete_task_by({'id': dataset.tasks_ids[0]}),
+    'TaskRepository.get_task_stats': lambda users, tasks, dataset: tasks.get_task_stats(dataset.users[0].id),
+    'TaskRepository.rebuild_task_counters': lambda users, tasks, dataset: tasks.rebuild_task_counters(),
+}
+
+
+def get_public_methods(repository_class: type) -> Set[str]:
+    return {f'{repository_class.__name__}.{name}' for name, member in inspect.getmembers(repository_class)
+            if not name.startswith('_') and inspect.isfunction(member)}
+
+
+@contextmanager
+def capture_statements(db_engine) -> Iterator[List[Statement]]:
+    statements: List[Statement] = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+        # The rows of an executemany share the plan, a multi-row INSERT ... RETURNING has one flat row
+        if executemany and parameters and isinstance(parameters[0], (tuple, list)):
+            parameters = parameters[0]
+        statements.append((statement, tuple(parameters)))
+
+    event.listen(db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+async def get_full_scans(session: AsyncSession, statement: str, parameters: Any) -> Tuple[List[str], List[str]]:
+    """ The steps of the plan of the statement reading a large table in full, and the plan """
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+    plan: List[str] = [row[3] for row in result]
+
+    # e.g. "SCAN task", "SCAN task_user_1 USING COVERING INDEX ..." (an alias), but not "SCAN (subquery-1)"
+    full_scans: List[str] = [detail for detail in plan
+                             if (match := re.match(r'SCAN (\w+?)(_\d+)?\b', detail)) and match.group(1) in LARGE_TABLES]
+    return full_scans, plan
+
+
+class TestQueryPlans:
+
+    @pytest.fixture
+    async def dataset(self, user_repository: TestUserRepository, task_repository: TestTaskRepository) -> Dataset:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username in usernames:
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None,
+                                                         role=UserRole.DEVELOPER))
+        users = [await user_repository.get_user_by(username=username) for username in usernames]
+
+        tasks = [Task(name=random_lower_string(), description=random_lower_string(), responsible_person=users[0].id,
+                      status=TaskStatus.TODO, priority=TaskPriority.LOW) for _ in range(3)]
+        task_repository.session.add_all(tasks)
+        await task_repository.session.flush()
+        task_repository.session.add_all([TaskUser(task_id=task.id, user_id=users[1].id) for task in tasks])
+        await task_repository.session.flush()
+        return Dataset(users, [task.id for task in tasks])
+
+    def test_every_repository_method_is_checked(self) -> None:
+        public_methods = get_public_methods(UserRepository) | get_public_methods(TaskRepository)
+
+        assert public_methods - NO_STATEMENTS == REPOSITORY_CALLS.keys()
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize('method', REPOSITORY_CALLS)
+    async def test_no_full_scans_of_large_tables(self, method: str, db_engine, db_session: AsyncSession,
+                                                 user_repository: TestUserRepository, dataset: Dataset) -> None:
+        task_repository = TestTaskRepository(db_session, NoTaskCache())
+
+        with capture_statements(db_engine) as statements:
+            await REPOSITORY_CALLS[method](user_repository, task_repository, dataset)
+        assert statements
+
+        for statement, parameters in statements:
+            full_scans, plan = await get_full_scans(db_session, statement, parameters)
+            unexpected_scans = set(full_scans) - ALLOWED_SCANS.get(method, set())
+            assert not unexpected_scans, f'{method}:\n{statement}\n' + '\n'.join(plan)
@@ -0,0 +1,85 @@
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from src.api.etags import parse_etags
+from src.db.enums import UserRole, TaskStatus
+from src.db.models import Task
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate, CredentialsToEncodeToken, TokenPayload
+from src.infrastructure.implementations.jwt_manager import JWTManager, TokenType
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.utils import random_lower_string, random_email
+
+
+class TestConditionalRequests:
+
+    @pytest.fixture
+    async def user(self, user_repository: TestUserRepository) -> UserBase:
+        username = random_lower_string()
+        await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                     email=random_email(), register_at=None, role=UserRole.DEVELOPER))
+        return await user_repository.get_user_by(username=username)
+
+    @pytest.fixture
+    def headers(self, user: UserBase) -> Dict[str, str]:
+        token = JWTManager.encode_token(CredentialsToEncodeToken(
+            payload=TokenPayload(sub=user.id, type=TokenType.ACCESS.value), expire_minutes=5))
+        return {'Authorization': f'Bearer {token}'}
+
+    @pytest.fixture
+    async def task(self, task_repository: TestTaskRepository, user: UserBase) -> Task:
+        task = Task(name=random_lower_string(), description=random_lower_string(), responsible_person=user.id)
+        task_repository.session.add(task)
+        await task_repository.session.flush()
+        return task
+
+    def test_parse_etags(self) -> None:
+        assert parse_etags(None) is None
+        assert parse_etags('*') is None
+        assert parse_etags('"3", W/"4", "x"') == [3]
+        assert parse_etags('"3", W/"4"', weak=True) == [3, 4]
+
+    @pytest.mark.anyio
+    async def test_get_and_update_with_etags(self, api_client: httpx.AsyncClient, query_counter,
+                                             headers: Dict[str, str], task: Task) -> None:
+        response = await api_client.get(f'/task_tracker/tasks/{task.id}', headers=headers)
+        assert response.status_code == 200, response.text
+        etag = response.headers['etag']
+        assert etag == '"1"' and response.json()['version'] == 1
+
+        with query_counter(1):
+            response = await api_client.get(f'/task_tracker/tasks/{task.id}',
+                                            headers={**headers, 'If-None-Match': f'W/{etag}'})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+
+        # the current version is sent back, not the list of the client
+        response = await api_client.get(f'/task_tracker/tasks/{task.id}',
+                                        headers={**headers, 'If-None-Match': f'"7", {etag}'})
+        assert response.status_code == 304
+        assert response.headers['etag'] == etag
+
+        response = await api_client.get(f'/task_tracker/tasks/{task.id}', headers={**headers, 'If-None-Match': '*'})
+        assert response.status_code == 304
+        assert response.headers['etag'] == etag
+
+        response = await api_client.put(f'/task_tracker/update_task/{task.id}', json={'status': TaskStatus.DONE.value},
+                                        headers={**headers, 'If-Match': etag})
+        assert response.status_code == 200, response.text
+        assert response.headers['etag'] == '"2"'
+
+        # a second client still holding the first version must not overwrite the update
+        response = await api_client.put(f'/task_tracker/update_task/{task.id}', json={'status': TaskStatus.TODO.value},
+                                        headers={**headers, 'If-Match': etag})
+        assert response.status_code == 412
+
+        response = await api_client.get(f'/task_tracker/tasks/{task.id}', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.json()['status'] == TaskStatus.DONE.value
+
+        response = await api_client.get('/task_tracker/tasks/-1', headers=headers)
+        assert response.status_code == 404
@@ -0,0 +1,109 @@
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate, CredentialsToEncodeToken, TokenPayload
+from src.infrastructure.implementations.jwt_manager import JWTManager, TokenType
+from src.repositories.user.repositories import TestUserRepository
+from src.utils import random_lower_string, random_email
+
+
+# Statements per request, the current user is only loaded by the first request of a test (then it is cached).
+# Raise a budget only together with the change that needs it
+QUERY_BUDGETS = {
+    'register': 3,
+    'login': 2,
+    'list_tasks': 2,
+    'list_my_tasks': 2,
+    'get_task': 2,
+    'get_task_not_modified': 1,
+    'create_task': 8,
+    'create_tasks': 6,
+    'update_task': 7,
+    'update_tasks': 5,
+    'delete_task': 7,
+}
+BULK_SIZE = 20
+
+
+class TestQueryBudgets:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> List[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username, role in zip(usernames, (UserRole.ADMIN, UserRole.DEVELOPER, UserRole.DEVELOPER)):
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None, role=role))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    def headers(self, users: List[UserBase]) -> Dict[str, str]:
+        token = JWTManager.encode_token(CredentialsToEncodeToken(
+            payload=TokenPayload(sub=users[0].id, type=TokenType.ACCESS.value), expire_minutes=5))
+        return {'Authorization': f'Bearer {token}'}
+
+    def get_task(self, users: List[UserBase]) -> dict:
+        return {'name': random_lower_string(), 'description': random_lower_string(),
+                'responsible_person_id': users[1].id, 'status': TaskStatus.TODO.value,
+                'priority': TaskPriority.LOW.value, 'assignees_ids': [users[1].id, users[2].id]}
+
+    @pytest.mark.anyio
+    async def test_auth_budgets(self, api_client: httpx.AsyncClient, query_counter) -> None:
+        form = {'username': random_lower_string(), 'password': random_lower_string(), 'email': random_email()}
+
+        with query_counter(QUERY_BUDGETS['register']):
+            response = await api_client.post('/auth/register/', data=form)
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['login']):
+            response = await api_client.post('/auth/login/', data={'username': form['username'],
+                                                                   'password': form['password']})
+        assert response.status_code == 200, response.text
+
+    @pytest.mark.anyio
+    async def test_task_tracker_budgets(self, api_client: httpx.AsyncClient, query_counter,
+                                        headers: Dict[str, str], users: List[UserBase]) -> None:
+        with query_counter(QUERY_BUDGETS['create_task']):
+            response = await api_client.post('/task_tracker/create_task/', json=self.get_task(users),
+                                             headers=headers)
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['create_tasks']):
+            response = await api_client.post('/task_tracker/create_tasks/', headers=headers,
+                                             json={'tasks': [self.get_task(users) for _ in range(BULK_SIZE)]})
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['list_tasks']):
+            response = await api_client.get('/task_tracker/tasks/', params={'limit': 500}, headers=headers)
+        assert response.status_code == 200, response.text
+        tasks_ids = [item['id'] for item in response.json()['tasks']][:BULK_SIZE]
+
+        with query_counter(QUERY_BUDGETS['list_my_tasks']):
+            response = await api_client.get('/task_tracker/my_tasks/', params={'limit': 500}, headers=headers)
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['get_task']):
+            response = await api_client.get(f'/task_tracker/tasks/{tasks_ids[0]}', headers=headers)
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['get_task_not_modified']):
+            response = await api_client.get(f'/task_tracker/tasks/{tasks_ids[0]}',
+                                            headers={**headers, 'If-None-Match': response.headers['etag']})
+        assert response.status_code == 304, response.text
+
+        with query_counter(QUERY_BUDGETS['update_task']):
+            response = await api_client.put(f'/task_tracker/update_task/{tasks_ids[0]}', headers=headers,
+                                            json={'name': random_lower_string(), 'assignees_ids': [users[2].id]})
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['update_tasks']):
+            response = await api_client.put('/task_tracker/update_tasks/', headers=headers,
+                                            json={'tasks_ids': tasks_ids, 'status': TaskStatus.DONE.value})
+        assert response.status_code == 200, response.text
+
+        with query_counter(QUERY_BUDGETS['delete_task']):
+            response = await api_client.delete(f'/task_tracker/delete_task/{tasks_ids[0]}', headers=headers)
+        assert response.status_code == 200, response.text
@@ -1,6 +1,7 @@
 import pytest
 from fastapi import HTTPException
 
+from src.infrastructure.dto import UserCreate
 from src.infrastructure.implementations.password_manager import PasswordManager
 
 from tests.conftest import TestUserRegister
@@ -9,6 +10,7 @@ from src.services.auth.services import RegisterService, UserValidationService
 from src.config import settings
 from src.exceptions import get_exception_400_bad_request_with_detail
 from src.services.auth.services import AbstractUserRepository
+from src.utils import random_lower_string
 
 
 class TestRegister:
@@ -42,3 +44,14 @@ class TestRegister:
                                                              email=self.register_data.email)
         assert created_user.username == get_created_user.username \
                and created_user.email == get_created_user.email
+
+    @pytest.mark.anyio
+    async def test_create_user_with_taken_email(self, user_repository: AbstractUserRepository):
+        """ A concurrent registration passes the checks, the unique index still rejects it """
+        await RegisterService(user_repository, self.register_data, PasswordManager()).create_new_user()
+
+        user_to_create = UserCreate(username=random_lower_string(), password=random_lower_string(),
+                                    email=self.register_data.email, register_at=None)
+        with pytest.raises(HTTPException) as exception_info:
+            await user_repository.create_user(user_to_create)
+        assert exception_info.value.status_code == 400
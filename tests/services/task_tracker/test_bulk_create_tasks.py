@@ -0,0 +1,109 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.api.routes.task_tracker.dto import APIBulkCreateTasks, APICreateTask
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Notification
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import BulkCreatedTasks
+from src.services.task_tracker.services import BulkCreateTaskService, CreateTaskService, TaskValidationService
+from src.utils import random_lower_string, random_email
+
+
+class TestBulkCreateTasks:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username in usernames:
+            await user_repository.create_user(UserCreate(username=username,
+                                                         password=random_lower_string(),
+                                                         email=random_email(),
+                                                         register_at=None,
+                                                         role=UserRole.ADMIN))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @staticmethod
+    def get_tasks_to_create(responsible_person_id: int, assignees_ids: list[int], count: int) -> APIBulkCreateTasks:
+        return APIBulkCreateTasks(tasks=[
+            APICreateTask(name=random_lower_string(), description=random_lower_string(),
+                          responsible_person_id=responsible_person_id, status=TaskStatus.TODO,
+                          priority=TaskPriority.LOW, assignees_ids=assignees_ids)
+            for _ in range(count)
+        ])
+
+    @pytest.mark.anyio
+    async def test_create_tasks(self, user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                                notification_repository: TestNotificationRepository,
+                                users: list[UserBase]) -> None:
+        admin, *assignees = users
+        tasks_to_create = self.get_tasks_to_create(admin.id, [assignee.id for assignee in assignees], 100)
+
+        bulk_create_task_service = BulkCreateTaskService(admin, user_repository, task_repository,
+                                                         notification_repository, tasks_to_create)
+        created_tasks: BulkCreatedTasks = await bulk_create_task_service.create_tasks()
+
+        names = [task.name for task in tasks_to_create.tasks]
+        assert created_tasks.names == names
+        assert sorted(await task_repository.get_exist_tasks_names(names)) == sorted(names)
+
+        notifications = (await task_repository.session.execute(
+            select(Notification).where(Notification.recipient.in_([assignee.email for assignee in assignees]))
+        )).scalars().all()
+        assert sorted(notification.recipient for notification in notifications) == sorted(
+            assignee.email for assignee in assignees)
+        assert all(names[-1] in notification.body for notification in notifications)
+
+        task = await task_repository.get_task_by({'name': names[0]})
+        assert sorted(assignee.id for assignee in task.assignees) == sorted(assignee.id for assignee in assignees)
+
+    @pytest.mark.anyio
+    async def test_create_tasks_with_exist_name(self, user_repository: TestUserRepository,
+                                                task_repository: TestTaskRepository,
+                                                notification_repository: TestNotificationRepository,
+                                                users: list[UserBase]) -> None:
+        admin = users[0]
+        tasks_to_create = self.get_tasks_to_create(admin.id, [], 2)
+        await BulkCreateTaskService(admin, user_repository, task_repository,
+                                    notification_repository, tasks_to_create).create_tasks()
+
+        with pytest.raises(HTTPException):
+            await BulkCreateTaskService(admin, user_repository, task_repository,
+                                    notification_repository, tasks_to_create).create_tasks()
+
+    @pytest.mark.anyio
+    async def test_create_task_with_name_taken_concurrently(self, user_repository: TestUserRepository,
+                                                            task_repository: TestTaskRepository,
+                                                            notification_repository: TestNotificationRepository,
+                                                            users: list[UserBase],
+                                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        admin = users[0]
+        task_to_create = self.get_tasks_to_create(admin.id, [], 1).tasks[0]
+        await CreateTaskService(admin, user_repository, task_repository,
+                                notification_repository, task_to_create).create_task()
+
+        # The other request created the task after this one checked the name
+        async def check_on_exist_task_by_name(self, task_name: str) -> bool:
+            return False
+        monkeypatch.setattr(TaskValidationService, 'check_on_exist_task_by_name', check_on_exist_task_by_name)
+        with pytest.raises(HTTPException) as exception_info:
+            await CreateTaskService(admin, user_repository, task_repository,
+                                    notification_repository, task_to_create).create_task()
+
+        assert exception_info.value.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_create_tasks_with_unknown_responsible_person(self, user_repository: TestUserRepository,
+                                                                task_repository: TestTaskRepository,
+                                                                notification_repository: TestNotificationRepository,
+                                                                users: list[UserBase]) -> None:
+        tasks_to_create = self.get_tasks_to_create(-1, [], 2)
+
+        with pytest.raises(HTTPException):
+            await BulkCreateTaskService(users[0], user_repository, task_repository,
+                                        notification_repository, tasks_to_create).create_tasks()
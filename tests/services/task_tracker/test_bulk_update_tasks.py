@@ -0,0 +1,108 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.api.routes.task_tracker.dto import APIBulkUpdateTasks
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, Notification
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import BulkUpdatedTasks, TaskFilter
+from src.services.task_tracker import services
+from src.services.task_tracker.services import BulkUpdateTaskService
+from src.utils import random_lower_string, random_email
+
+
+class TestBulkUpdateTasks:
+
+    @pytest.fixture
+    async def responsible_person(self, user_repository: TestUserRepository) -> UserBase:
+        username = random_lower_string()
+        await user_repository.create_user(UserCreate(username=username,
+                                                     password=random_lower_string(),
+                                                     email=random_email(),
+                                                     register_at=None,
+                                                     role=UserRole.DEVELOPER))
+        return await user_repository.get_user_by(username=username)
+
+    @pytest.fixture
+    async def tasks_ids(self, task_repository: TestTaskRepository, responsible_person: UserBase) -> list[int]:
+        tasks = [Task(name=random_lower_string(), description=random_lower_string(),
+                      responsible_person=responsible_person.id, status=status, priority=TaskPriority.LOW)
+                 for status in (TaskStatus.TODO, TaskStatus.TODO, TaskStatus.DONE)]
+        task_repository.session.add_all(tasks)
+        await task_repository.session.flush()
+        return [task.id for task in tasks]
+
+    @pytest.mark.anyio
+    async def test_update_tasks_by_ids(self, user_repository: TestUserRepository,
+                                       task_repository: TestTaskRepository,
+                                       notification_repository: TestNotificationRepository,
+                                       responsible_person: UserBase, tasks_ids: list[int]) -> None:
+        tasks_to_update = APIBulkUpdateTasks(tasks_ids=tasks_ids, status=TaskStatus.DONE)
+        bulk_update_task_service = BulkUpdateTaskService(responsible_person, user_repository,
+                                                         task_repository, notification_repository, tasks_to_update)
+        updated_tasks: BulkUpdatedTasks = await bulk_update_task_service.update_tasks()
+
+        assert sorted(updated_tasks.updated_tasks_ids) == sorted(tasks_ids[:2])
+
+        notifications = (await task_repository.session.execute(
+            select(Notification).where(Notification.recipient == responsible_person.email)
+        )).scalars().all()
+        assert len(notifications) == 1
+        assert notifications[0].subject == 'Tasks Changed!'
+
+    @pytest.mark.anyio
+    async def test_update_tasks_by_filter(self, user_repository: TestUserRepository,
+                                          task_repository: TestTaskRepository,
+                                          notification_repository: TestNotificationRepository,
+                                          responsible_person: UserBase, tasks_ids: list[int]) -> None:
+        task_filter = TaskFilter(responsible_person_id=responsible_person.id, status=TaskStatus.DONE)
+        tasks_to_update = APIBulkUpdateTasks(filter=task_filter, priority=TaskPriority.HIGH)
+        bulk_update_task_service = BulkUpdateTaskService(responsible_person, user_repository,
+                                                         task_repository, notification_repository, tasks_to_update)
+        updated_tasks: BulkUpdatedTasks = await bulk_update_task_service.update_tasks()
+
+        assert updated_tasks.updated_tasks_ids == tasks_ids[2:]
+
+    @pytest.mark.anyio
+    async def test_update_tasks_by_empty_filter(self, user_repository: TestUserRepository,
+                                                task_repository: TestTaskRepository,
+                                                notification_repository: TestNotificationRepository,
+                                                responsible_person: UserBase) -> None:
+        tasks_to_update = APIBulkUpdateTasks(filter=TaskFilter(), status=TaskStatus.DONE)
+        with pytest.raises(HTTPException) as exception_info:
+            await BulkUpdateTaskService(responsible_person, user_repository,
+                                        task_repository, notification_repository, tasks_to_update).update_tasks()
+
+        assert exception_info.value.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_update_tasks_by_filter_matching_too_many(self, user_repository: TestUserRepository,
+                                                            task_repository: TestTaskRepository,
+                                                            notification_repository: TestNotificationRepository,
+                                                            responsible_person: UserBase, tasks_ids: list[int],
+                                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(services, 'BULK_UPDATE_MAX_TASKS', 1)
+        task_filter = TaskFilter(responsible_person_id=responsible_person.id)
+        tasks_to_update = APIBulkUpdateTasks(filter=task_filter, priority=TaskPriority.HIGH)
+        with pytest.raises(HTTPException) as exception_info:
+            await BulkUpdateTaskService(responsible_person, user_repository,
+                                        task_repository, notification_repository, tasks_to_update).update_tasks()
+
+        assert exception_info.value.status_code == 400
+        task = await task_repository.get_task_by({'id': tasks_ids[0]})
+        assert task.priority != TaskPriority.HIGH
+
+    @pytest.mark.anyio
+    async def test_update_tasks_without_selection(self, user_repository: TestUserRepository,
+                                                  task_repository: TestTaskRepository,
+                                                  notification_repository: TestNotificationRepository,
+                                                  responsible_person: UserBase) -> None:
+        with pytest.raises(HTTPException):
+            tasks_to_update = APIBulkUpdateTasks(status=TaskStatus.DONE)
+            await BulkUpdateTaskService(responsible_person, user_repository,
+                                        task_repository, notification_repository, tasks_to_update).update_tasks()
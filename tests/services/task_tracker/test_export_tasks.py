@@ -0,0 +1,97 @@
+import csv
+import gzip
+import io
+import json
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.api.streaming import accepts_gzip
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate, CredentialsToEncodeToken, TokenPayload
+from src.infrastructure.implementations.jwt_manager import JWTManager, TokenType
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TaskFilter, TasksFileFormat
+from src.services.task_tracker.services import ExportTasksService
+from src.utils import random_lower_string, random_email
+
+
+TASKS_COUNT = 7
+CHUNK_SIZE = 3
+
+
+class TestExportTasks:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> List[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username, role in zip(usernames, (UserRole.DEVELOPER, UserRole.DEVELOPER, UserRole.GUEST)):
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None, role=role))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    async def tasks(self, task_repository: TestTaskRepository, users: List[UserBase]) -> Dict[int, List[int]]:
+        """ Tasks created by the test with their assignees, the first one has none """
+        tasks = [Task(name=random_lower_string(), description=f'line, "quoted"\n{i}', responsible_person=users[0].id,
+                      status=TaskStatus.TODO, priority=TaskPriority.MEDIUM) for i in range(TASKS_COUNT)]
+        task_repository.session.add_all(tasks)
+        await task_repository.session.flush()
+        task_repository.session.add_all(TaskUser(task_id=task.id, user_id=user.id)
+                                        for task in tasks[1:] for user in users[:2])
+        await task_repository.session.flush()
+        return {task.id: [] if task is tasks[0] else sorted(user.id for user in users[:2]) for task in tasks}
+
+    @pytest.mark.anyio
+    async def test_export_ndjson_in_chunks(self, task_repository: TestTaskRepository, query_counter,
+                                           users: List[UserBase], tasks: Dict[int, List[int]]) -> None:
+        export_tasks_service = ExportTasksService(users[0], task_repository,
+                                                  TaskFilter(responsible_person_id=users[0].id),
+                                                  TasksFileFormat.NDJSON, chunk_size=CHUNK_SIZE)
+
+        # the tasks query, then one assignees query per chunk
+        chunks_count = -(-TASKS_COUNT // CHUNK_SIZE)
+        with query_counter(1 + chunks_count, repeated_statement_threshold=chunks_count + 1) as counter:
+            chunks = [chunk async for chunk in export_tasks_service.export_tasks()]
+        assert counter.count == 1 + chunks_count
+        assert len(chunks) == chunks_count
+
+        exported = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        assert {task['id']: sorted(task['assignees_ids']) for task in exported} == tasks
+        assert exported[0]['status'] == TaskStatus.TODO.value
+
+    @pytest.mark.anyio
+    async def test_export_forbidden(self, task_repository: TestTaskRepository, users: List[UserBase]) -> None:
+        with pytest.raises(HTTPException) as exception_info:
+            ExportTasksService(users[2], task_repository, TaskFilter(), TasksFileFormat.NDJSON).export_tasks()
+        assert exception_info.value.status_code == 403
+
+    def test_accepts_gzip(self) -> None:
+        assert accepts_gzip('gzip') and accepts_gzip('deflate, GZIP;q=0.5') and accepts_gzip('br, *')
+        assert not accepts_gzip('') and not accepts_gzip('deflate, br')
+        assert not accepts_gzip('gzip;q=0') and not accepts_gzip('gzip; q=0.0, deflate')
+        assert not accepts_gzip('*, gzip;q=0') and not accepts_gzip('*;q=0')
+
+    @pytest.mark.anyio
+    async def test_export_gzip_csv(self, api_client: httpx.AsyncClient, users: List[UserBase],
+                                   tasks: Dict[int, List[int]]) -> None:
+        token = JWTManager.encode_token(CredentialsToEncodeToken(
+            payload=TokenPayload(sub=users[0].id, type=TokenType.ACCESS.value), expire_minutes=5))
+
+        async with api_client.stream('GET', '/task_tracker/export_tasks/',
+                                     params={'export_format': 'csv', 'responsible_person_id': users[0].id},
+                                     headers={'Authorization': f'Bearer {token}', 'Accept-Encoding': 'gzip'}) as response:
+            # the raw body, httpx would decode the gzip on the fly
+            body = b''.join([chunk async for chunk in response.aiter_raw()])
+
+        assert response.status_code == 200, body
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['content-type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(body).decode(), newline='')))
+        assert {int(row['id']): sorted(map(int, row['assignees_ids'].split())) for row in rows} == tasks
+        assert rows[0]['description'] == 'line, "quoted"\n0'
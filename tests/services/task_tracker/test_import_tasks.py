@@ -0,0 +1,148 @@
+import io
+import json
+from typing import List
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate, CredentialsToEncodeToken, TokenPayload
+from src.infrastructure.implementations.jwt_manager import JWTManager, TokenType
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TasksFileFormat, ImportedTasks
+from src.services.task_tracker.services import ImportTasksService
+from src.utils import random_lower_string, random_email
+
+
+class TestImportTasks:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> List[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username, role in zip(usernames, (UserRole.ADMIN, UserRole.DEVELOPER, UserRole.DEVELOPER)):
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None, role=role))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    async def get_tasks(self, task_repository: TestTaskRepository, names: List[str]) -> dict:
+        result = await task_repository.session.execute(
+            select(Task.name, Task.status, Task.responsible_person, TaskUser.user_id)
+            .outerjoin(TaskUser, TaskUser.task_id == Task.id).where(Task.name.in_(names)))
+        tasks = {}
+        for name, status, responsible_person, assignee_id in result:
+            task = tasks.setdefault(name, {'status': status, 'responsible_person': responsible_person,
+                                           'assignees_ids': set()})
+            if assignee_id is not None:
+                task['assignees_ids'].add(assignee_id)
+        return tasks
+
+    @pytest.mark.anyio
+    async def test_import_csv(self, user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                              users: List[UserBase]) -> None:
+        exist_name, names = random_lower_string(), [random_lower_string() for _ in range(3)]
+        task_repository.session.add(Task(name=exist_name, description='', responsible_person=users[0].id))
+        await task_repository.session.flush()
+
+        admin, first, second = (user.username for user in users)
+        tasks_file = io.StringIO(
+            'name,description,responsible_username,assignees_usernames,status,priority\r\n'
+            f'{names[0]},"multi\nline",{first},{first} {second} {second},Done,High\r\n'
+            f'{exist_name},exists,{first},,,\r\n'
+            f'{names[1]},unknown assignee,{admin},{second} nobody,,\r\n'
+            f'{names[1]},repeated name,{admin},,,\r\n'
+            f'{names[2]},no assignees,{second},,In Progress,\r\n')
+        progress: List[ImportedTasks] = []
+
+        imported_tasks = await ImportTasksService(users[0], user_repository, task_repository, tasks_file,
+                                                  TasksFileFormat.CSV, chunk_size=2,
+                                                  on_chunk_imported=lambda p: progress.append(p.model_copy())
+                                                  ).import_tasks()
+
+        assert imported_tasks == ImportedTasks(records=5, imported=3, already_exist=2)
+        assert [p.records for p in progress] == [2, 4, 5]
+        assert await self.get_tasks(task_repository, names) == {
+            names[0]: {'status': TaskStatus.DONE, 'responsible_person': users[1].id,
+                       'assignees_ids': {users[1].id, users[2].id}},
+            names[1]: {'status': TaskStatus.TODO, 'responsible_person': users[0].id, 'assignees_ids': {users[2].id}},
+            names[2]: {'status': TaskStatus.IN_PROGRESS, 'responsible_person': users[2].id, 'assignees_ids': set()},
+        }
+
+    @pytest.mark.anyio
+    async def test_import_ndjson_error_and_resume(self, user_repository: TestUserRepository,
+                                                  task_repository: TestTaskRepository, users: List[UserBase]) -> None:
+        names = [random_lower_string() for _ in range(4)]
+        records = [{'name': name, 'description': '', 'responsible_username': users[1].username,
+                    'assignees_usernames': [users[2].username], 'priority': TaskPriority.LOW.value}
+                   for name in names]
+        broken_records = [*records[:3], {**records[3], 'responsible_username': 'nobody'}]
+
+        with pytest.raises(HTTPException) as exception_info:
+            await ImportTasksService(users[0], user_repository, task_repository,
+                                     io.StringIO('\n'.join(map(json.dumps, broken_records))),
+                                     TasksFileFormat.NDJSON, chunk_size=2).import_tasks()
+        assert exception_info.value.status_code == 400
+        assert exception_info.value.detail.startswith('Record 4: responsible user "nobody" not found')
+        assert 'start_from=2' in exception_info.value.detail
+        assert sorted(await self.get_tasks(task_repository, names)) == sorted(names[:2])
+
+        imported_tasks = await ImportTasksService(users[0], user_repository, task_repository,
+                                                  io.StringIO('\n'.join(map(json.dumps, records)) + '\n\n'),
+                                                  TasksFileFormat.NDJSON, start_from=2, chunk_size=2).import_tasks()
+        assert imported_tasks == ImportedTasks(records=4, imported=2, already_exist=0)
+        assert sorted(await self.get_tasks(task_repository, names)) == sorted(names)
+
+    @pytest.mark.anyio
+    async def test_import_error_number_after_repeated_records(self, user_repository: TestUserRepository,
+                                                              task_repository: TestTaskRepository,
+                                                              users: List[UserBase]) -> None:
+        record = {'name': random_lower_string(), 'description': '', 'responsible_username': users[1].username}
+        broken_record = {**record, 'name': random_lower_string(), 'responsible_username': 'nobody'}
+        records = [record, record, broken_record, broken_record]
+
+        with pytest.raises(HTTPException) as exception_info:
+            await ImportTasksService(users[0], user_repository, task_repository,
+                                     io.StringIO('\n'.join(map(json.dumps, records))),
+                                     TasksFileFormat.NDJSON).import_tasks()
+        assert exception_info.value.detail.startswith('Record 3: responsible user "nobody" not found')
+
+    @pytest.mark.anyio
+    async def test_import_forbidden_and_invalid(self, user_repository: TestUserRepository,
+                                                task_repository: TestTaskRepository, users: List[UserBase]) -> None:
+        with pytest.raises(HTTPException) as exception_info:
+            await ImportTasksService(users[1], user_repository, task_repository, io.StringIO(''),
+                                     TasksFileFormat.NDJSON).import_tasks()
+        assert exception_info.value.status_code == 403
+
+        with pytest.raises(HTTPException) as exception_info:
+            await ImportTasksService(users[0], user_repository, task_repository, io.StringIO('{"name": \n'),
+                                     TasksFileFormat.NDJSON).import_tasks()
+        assert exception_info.value.detail.startswith('Record 1: invalid JSON')
+
+        with pytest.raises(HTTPException) as exception_info:
+            await ImportTasksService(users[0], user_repository, task_repository,
+                                     io.StringIO('{"name": "x", "description": "", "responsible_username": "x", '
+                                                 '"status": "Unknown"}'),
+                                     TasksFileFormat.NDJSON).import_tasks()
+        assert exception_info.value.detail.startswith('Record 1: status:')
+
+    @pytest.mark.anyio
+    async def test_import_upload(self, api_client: httpx.AsyncClient, task_repository: TestTaskRepository,
+                                 users: List[UserBase]) -> None:
+        token = JWTManager.encode_token(CredentialsToEncodeToken(
+            payload=TokenPayload(sub=users[0].id, type=TokenType.ACCESS.value), expire_minutes=5))
+        name = random_lower_string()
+        csv_file = ('\ufeffname,description,responsible_username,assignees_usernames\n'
+                    f'{name},uploaded,{users[1].username},{users[2].username}\n').encode()
+
+        response = await api_client.post('/task_tracker/import_tasks/', params={'file_format': 'csv'},
+                                         files={'tasks_file': ('tasks.csv', csv_file, 'text/csv')},
+                                         headers={'Authorization': f'Bearer {token}'})
+
+        assert response.status_code == 200, response.text
+        assert response.json() == {'records': 1, 'imported': 1, 'already_exist': 0}
+        assert (await self.get_tasks(task_repository, [name]))[name]['assignees_ids'] == {users[2].id}
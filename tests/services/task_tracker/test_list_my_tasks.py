@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.task.repositories import TaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TasksPage
+from src.services.task_tracker.services import ListMyTasksService
+from src.utils import random_lower_string, random_email
+
+
+class TestListMyTasks:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(2)]
+        for username in usernames:
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None,
+                                                         role=UserRole.DEVELOPER))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    async def tasks_ids(self, task_repository: TaskRepository, users: list[UserBase]) -> list[int]:
+        """ users[0] is responsible for the tasks 0, 1, 2, assigned to the tasks 2, 3, 4, the task 5 is not theirs """
+        tasks = [Task(name=random_lower_string(), description=random_lower_string(),
+                      responsible_person=users[0].id if number < 3 else users[1].id,
+                      status=TaskStatus.TODO, priority=TaskPriority.LOW) for number in range(6)]
+        task_repository.session.add_all(tasks)
+        await task_repository.session.flush()
+        task_repository.session.add_all([TaskUser(task_id=task.id, user_id=users[0].id) for task in tasks[2:5]] +
+                                        [TaskUser(task_id=task.id, user_id=users[1].id) for task in tasks])
+        await task_repository.session.flush()
+        return [task.id for task in tasks]
+
+    @pytest.mark.anyio
+    async def test_list_my_tasks_pages(self, task_repository: TaskRepository, users: list[UserBase],
+                                       tasks_ids: list[int]) -> None:
+        listed_tasks = []
+        cursor = None
+
+        while True:
+            tasks_page: TasksPage = await ListMyTasksService(users[0], task_repository, cursor, 2).list_my_tasks()
+            listed_tasks.extend(tasks_page.tasks)
+            cursor = tasks_page.next_cursor
+            if not cursor:
+                break
+
+        assert [task.id for task in listed_tasks] == tasks_ids[:5]
+        assert listed_tasks[2].assignees_ids == [users[0].id, users[1].id]
+
+    @pytest.mark.anyio
+    async def test_assign_user_twice(self, task_repository: TaskRepository, users: list[UserBase],
+                                     tasks_ids: list[int]) -> None:
+        task_repository.session.add(TaskUser(task_id=tasks_ids[2], user_id=users[0].id))
+
+        with pytest.raises(IntegrityError):
+            await task_repository.session.flush()
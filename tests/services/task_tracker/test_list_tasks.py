@@ -0,0 +1,77 @@
+import pytest
+from fastapi import HTTPException
+
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.task.repositories import TaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TaskFilter, TasksPage
+from src.services.task_tracker.services import ListTasksService
+from src.utils import random_lower_string, random_email
+
+
+class TestListTasks:
+
+    @pytest.fixture
+    async def responsible_person(self, user_repository: TestUserRepository) -> UserBase:
+        username = random_lower_string()
+        await user_repository.create_user(UserCreate(username=username,
+                                                     password=random_lower_string(),
+                                                     email=random_email(),
+                                                     register_at=None,
+                                                     role=UserRole.ADMIN))
+        return await user_repository.get_user_by(username=username)
+
+    @pytest.fixture
+    async def tasks_ids(self, task_repository: TaskRepository, responsible_person: UserBase) -> list[int]:
+        tasks = [Task(name=random_lower_string(), description=random_lower_string(),
+                      responsible_person=responsible_person.id, status=status, priority=priority)
+                 for status in TaskStatus for priority in TaskPriority]
+        task_repository.session.add_all(tasks)
+        await task_repository.session.flush()
+        return [task.id for task in tasks]
+
+    @pytest.mark.anyio
+    async def test_list_tasks_pages(self, task_repository: TaskRepository, responsible_person: UserBase,
+                                    tasks_ids: list[int]) -> None:
+        task_filter = TaskFilter(responsible_person_id=responsible_person.id)
+        listed_tasks = []
+        cursor = None
+
+        while True:
+            list_tasks_service = ListTasksService(responsible_person, task_repository, task_filter, cursor, 4)
+            tasks_page: TasksPage = await list_tasks_service.list_tasks()
+            listed_tasks.extend(tasks_page.tasks)
+            cursor = tasks_page.next_cursor
+            if not cursor:
+                break
+
+        assert sorted(task.id for task in listed_tasks) == sorted(tasks_ids)
+        sort_keys = [(task.priority.name, task.status.name, task.id) for task in listed_tasks]
+        assert sort_keys == sorted(sort_keys)
+
+        # the order is the alphabetical one of the names, not the rank of the priority
+        priorities = list(dict.fromkeys(task.priority for task in listed_tasks))
+        assert priorities == [TaskPriority.HIGH, TaskPriority.LOW, TaskPriority.MEDIUM]
+        statuses = [task.status for task in listed_tasks if task.priority == TaskPriority.HIGH]
+        assert statuses == [TaskStatus.DONE, TaskStatus.IN_PROGRESS, TaskStatus.TODO]
+
+    @pytest.mark.anyio
+    async def test_list_tasks_with_filter(self, task_repository: TaskRepository, responsible_person: UserBase,
+                                          tasks_ids: list[int]) -> None:
+        task_filter = TaskFilter(responsible_person_id=responsible_person.id, status=TaskStatus.DONE)
+        list_tasks_service = ListTasksService(responsible_person, task_repository, task_filter, None, 50)
+        tasks_page: TasksPage = await list_tasks_service.list_tasks()
+
+        assert len(tasks_page.tasks) == len(TaskPriority)
+        assert all(task.status == TaskStatus.DONE for task in tasks_page.tasks)
+        assert tasks_page.next_cursor is None
+
+    @pytest.mark.anyio
+    async def test_list_tasks_with_invalid_cursor(self, task_repository: TaskRepository,
+                                                  responsible_person: UserBase) -> None:
+        with pytest.raises(HTTPException):
+            list_tasks_service = ListTasksService(responsible_person, task_repository, TaskFilter(), 'invalid', 50)
+            await list_tasks_service.list_tasks()
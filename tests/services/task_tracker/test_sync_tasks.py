@@ -0,0 +1,101 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, func
+
+from src.api.routes.task_tracker.dto import APIBulkCreateTasks, APICreateTask, APIBulkUpdateTasks, APIUpdateTask
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.task.repositories import TestTaskRepository, get_next_change_seq
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import ChangesCursor, TasksChanges
+from src.services.task_tracker.services import BulkCreateTaskService, BulkUpdateTaskService, DeleteTaskService
+from src.services.task_tracker.services import SyncTasksService, UpdateTaskService
+from src.utils import random_lower_string, random_email
+
+
+class TestSyncTasks:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(2)]
+        for username, role in zip(usernames, (UserRole.ADMIN, UserRole.DEVELOPER)):
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None, role=role))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    async def cursor(self, task_repository: TestTaskRepository) -> str:
+        """ the position of the last change made before the test """
+        last_change_seq: int = await task_repository.session.scalar(select(get_next_change_seq())) - 1
+        return ChangesCursor(change_seq=last_change_seq, task_id=2 ** 62).encode()
+
+    @pytest.fixture
+    async def tasks_ids(self, user_repository: TestUserRepository, task_repository: TestTaskRepository,
+                        notification_repository: TestNotificationRepository, users: list[UserBase],
+                        cursor: str) -> list[int]:
+        tasks = [APICreateTask(name=random_lower_string(), description=random_lower_string(),
+                               responsible_person_id=users[0].id, status=TaskStatus.TODO,
+                               priority=TaskPriority.LOW, assignees_ids=[users[1].id]) for _ in range(3)]
+        await BulkCreateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIBulkCreateTasks(tasks=tasks)).create_tasks()
+        tasks_changes: TasksChanges = await SyncTasksService(users[0], task_repository, cursor, 10).sync_tasks()
+        return [task.id for task in tasks_changes.tasks]
+
+    @pytest.mark.anyio
+    async def test_sync_returns_changes_after_cursor(self, user_repository: TestUserRepository,
+                                                     task_repository: TestTaskRepository,
+                                                     notification_repository: TestNotificationRepository,
+                                                     users: list[UserBase], cursor: str,
+                                                     tasks_ids: list[int]) -> None:
+        tasks_changes: TasksChanges = await SyncTasksService(users[0], task_repository, cursor, 10).sync_tasks()
+        assert len(tasks_ids) == 3 and tasks_changes.tasks[0].assignees_ids == [users[1].id]
+        assert not tasks_changes.has_more
+        cursor = tasks_changes.next_cursor
+
+        await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                APIUpdateTask(status=TaskStatus.DONE), tasks_ids[1]).update_task()
+        await DeleteTaskService(users[0], user_repository, task_repository, notification_repository,
+                                tasks_ids[2]).delete_task()
+
+        tasks_changes = await SyncTasksService(users[0], task_repository, cursor, 10).sync_tasks()
+        assert [(task.id, task.status) for task in tasks_changes.tasks] == [(tasks_ids[1], TaskStatus.DONE)]
+        assert tasks_changes.deleted_tasks_ids == [tasks_ids[2]]
+
+        unchanged = await SyncTasksService(users[0], task_repository, tasks_changes.next_cursor, 10).sync_tasks()
+        assert (unchanged.tasks, unchanged.deleted_tasks_ids) == ([], [])
+        assert unchanged.next_cursor == tasks_changes.next_cursor
+
+        orphan_assignees = await task_repository.session.scalar(
+            select(func.count()).select_from(TaskUser).where(TaskUser.task_id == tasks_ids[2]))
+        assert orphan_assignees == 0
+
+    @pytest.mark.anyio
+    async def test_sync_pages_through_tasks_of_the_same_change(self, user_repository: TestUserRepository,
+                                                               task_repository: TestTaskRepository,
+                                                               notification_repository: TestNotificationRepository,
+                                                               users: list[UserBase], tasks_ids: list[int]) -> None:
+        tasks_changes: TasksChanges = await SyncTasksService(users[0], task_repository, None, 1).sync_tasks()
+        while tasks_changes.has_more:
+            last_cursor = tasks_changes.next_cursor
+            tasks_changes = await SyncTasksService(users[0], task_repository, last_cursor, 1000).sync_tasks()
+
+        await BulkUpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIBulkUpdateTasks(tasks_ids=tasks_ids, status=TaskStatus.DONE)).update_tasks()
+
+        synced_ids: list[int] = []
+        cursor = tasks_changes.next_cursor
+        for _ in range(len(tasks_ids)):
+            tasks_changes = await SyncTasksService(users[0], task_repository, cursor, 1).sync_tasks()
+            synced_ids.extend(task.id for task in tasks_changes.tasks)
+            cursor = tasks_changes.next_cursor
+        assert synced_ids == sorted(tasks_ids) and not tasks_changes.has_more
+
+    @pytest.mark.anyio
+    async def test_sync_with_invalid_cursor(self, task_repository: TestTaskRepository,
+                                            users: list[UserBase]) -> None:
+        with pytest.raises(HTTPException) as exception_info:
+            await SyncTasksService(users[0], task_repository, 'not a cursor', 10).sync_tasks()
+        assert exception_info.value.status_code == 400
@@ -0,0 +1,153 @@
+import pytest
+from fastapi import HTTPException
+
+from src.api.routes.task_tracker.dto import APIUpdateTask, APIBulkUpdateTasks
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.infrastructure.implementations.task_events import TaskEventsBroker
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TaskEvent, TaskEventType
+from src.services.task_tracker.services import StreamTaskEventsService, UpdateTaskService, BulkUpdateTaskService
+from src.utils import random_lower_string, random_email
+
+
+HEARTBEAT_SECONDS = 0.01
+
+
+class TestTaskEventsBroker:
+
+    @pytest.mark.anyio
+    async def test_delivers_events_to_concerned_users(self) -> None:
+        broker = TaskEventsBroker(buffer_size=10, max_subscribers=10)
+        first_user_events = broker.listen(1, HEARTBEAT_SECONDS)
+        second_user_events = broker.listen(2, HEARTBEAT_SECONDS)
+        assert await anext(first_user_events) == [] and await anext(second_user_events) == []
+
+        broker.publish(TaskEvent(type=TaskEventType.UPDATED, task_id=1), [1])
+        broker.publish(TaskEvent(type=TaskEventType.DELETED, task_id=2), [1, 1])
+
+        events = await anext(first_user_events)
+        assert [(event.id, event.type, event.task_id) for event in events] == [
+            (1, TaskEventType.UPDATED, 1), (2, TaskEventType.DELETED, 2)]
+        assert await anext(second_user_events) == []
+
+        await first_user_events.aclose()
+        await second_user_events.aclose()
+        assert broker.stats().subscribers == 0
+
+    @pytest.mark.anyio
+    async def test_slow_subscriber_gets_resync(self) -> None:
+        broker = TaskEventsBroker(buffer_size=3, max_subscribers=10)
+        events = broker.listen(1, HEARTBEAT_SECONDS)
+        await anext(events)
+
+        for task_id in range(5):
+            broker.publish(TaskEvent(type=TaskEventType.UPDATED, task_id=task_id), [1])
+
+        assert [event.type for event in await anext(events)] == [TaskEventType.RESYNC]
+        assert broker.stats().dropped == 5
+
+        broker.publish(TaskEvent(type=TaskEventType.UPDATED, task_id=5), [1])
+        assert [event.task_id for event in await anext(events)] == [5]
+        await events.aclose()
+
+    @pytest.mark.anyio
+    async def test_too_many_subscribers(self) -> None:
+        broker = TaskEventsBroker(buffer_size=3, max_subscribers=1)
+        events = broker.listen(1, HEARTBEAT_SECONDS)
+        await anext(events)
+
+        with pytest.raises(HTTPException) as exception_info:
+            broker.check_capacity()
+        assert exception_info.value.status_code == 503
+        await events.aclose()
+
+
+class TestStreamTaskEvents:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username in usernames:
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None,
+                                                         role=UserRole.DEVELOPER))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    async def task(self, task_repository: TestTaskRepository, users: list[UserBase]) -> Task:
+        task = Task(name=random_lower_string(), description=random_lower_string(),
+                    responsible_person=users[0].id, status=TaskStatus.TODO, priority=TaskPriority.LOW)
+        task_repository.session.add(task)
+        await task_repository.session.flush()
+        task_repository.session.add(TaskUser(task_id=task.id, user_id=users[1].id))
+        await task_repository.session.flush()
+        return task
+
+    @pytest.mark.anyio
+    async def test_update_is_streamed_to_assignees(self, user_repository: TestUserRepository,
+                                                   task_repository: TestTaskRepository,
+                                                   notification_repository: TestNotificationRepository,
+                                                   users: list[UserBase], task: Task) -> None:
+        broker = TaskEventsBroker(buffer_size=10, max_subscribers=10)
+        assignee_stream = StreamTaskEventsService(users[1], broker, HEARTBEAT_SECONDS).stream_events()
+        other_user_stream = StreamTaskEventsService(users[2], broker, HEARTBEAT_SECONDS).stream_events()
+        assert (await anext(assignee_stream)).startswith('retry:')
+        assert (await anext(other_user_stream)).startswith('retry:')
+
+        await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                APIUpdateTask(status=TaskStatus.DONE), task.id,
+                                task_events_broker=broker).update_task()
+
+        assert await anext(assignee_stream) == (
+            f'id: 1\nevent: updated\ndata: {{"task_id":{task.id},"name":"{task.name}","version":2}}\n\n')
+        assert await anext(other_user_stream) == ': keepalive\n\n'
+
+        await assignee_stream.aclose()
+        await other_user_stream.aclose()
+        assert broker.stats().subscribers == 0
+
+    @pytest.mark.anyio
+    async def test_reassignment_is_streamed_to_previous_responsible_person(
+            self, user_repository: TestUserRepository, task_repository: TestTaskRepository,
+            notification_repository: TestNotificationRepository, users: list[UserBase], task: Task) -> None:
+        broker = TaskEventsBroker(buffer_size=10, max_subscribers=10)
+        first_stream = StreamTaskEventsService(users[0], broker, HEARTBEAT_SECONDS).stream_events()
+        second_stream = StreamTaskEventsService(users[2], broker, HEARTBEAT_SECONDS).stream_events()
+        assert (await anext(first_stream)).startswith('retry:')
+        assert (await anext(second_stream)).startswith('retry:')
+
+        await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                APIUpdateTask(responsible_person_id=users[2].id), task.id,
+                                task_events_broker=broker).update_task()
+        assert f'"task_id":{task.id}' in await anext(first_stream)
+        assert f'"task_id":{task.id}' in await anext(second_stream)
+
+        await BulkUpdateTaskService(users[2], user_repository, task_repository, notification_repository,
+                                    APIBulkUpdateTasks(tasks_ids=[task.id], responsible_person_id=users[1].id),
+                                    task_events_broker=broker).update_tasks()
+        assert f'"task_id":{task.id},"name":"{task.name}","version":3' in await anext(second_stream)
+        assert await anext(first_stream) == ': keepalive\n\n'
+
+        await first_stream.aclose()
+        await second_stream.aclose()
+
+    @pytest.mark.anyio
+    async def test_reconnect_starts_with_resync(self, users: list[UserBase]) -> None:
+        broker = TaskEventsBroker(buffer_size=10, max_subscribers=10)
+        stream = StreamTaskEventsService(users[1], broker, HEARTBEAT_SECONDS, last_event_id='41').stream_events()
+
+        await anext(stream)
+        assert 'event: resync' in await anext(stream)
+        await stream.aclose()
+
+    @pytest.mark.anyio
+    async def test_guest_can_not_stream_events(self, users: list[UserBase]) -> None:
+        guest = users[0].model_copy(update={'role': UserRole.GUEST})
+        with pytest.raises(HTTPException) as exception_info:
+            StreamTaskEventsService(guest, TaskEventsBroker(10, 10), HEARTBEAT_SECONDS).stream_events()
+        assert exception_info.value.status_code == 403
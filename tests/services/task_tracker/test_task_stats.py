@@ -0,0 +1,79 @@
+import pytest
+
+from src.api.routes.task_tracker.dto import APIBulkCreateTasks, APICreateTask, APIBulkUpdateTasks, APIUpdateTask
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import TaskStats, TaskFilter
+from src.services.task_tracker.services import BulkCreateTaskService, BulkUpdateTaskService, CreateTaskService
+from src.services.task_tracker.services import DeleteTaskService, UpdateTaskService, GetTaskStatsService
+from src.services.task_tracker.services import RebuildTaskCountersService
+from src.utils import random_lower_string, random_email
+
+
+class TestTaskStats:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(3)]
+        for username, role in zip(usernames, (UserRole.ADMIN, UserRole.DEVELOPER, UserRole.DEVELOPER)):
+            await user_repository.create_user(UserCreate(username=username, password=random_lower_string(),
+                                                         email=random_email(), register_at=None, role=role))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    def get_task(self, users: list[UserBase], status: TaskStatus) -> APICreateTask:
+        return APICreateTask(name=random_lower_string(), description=random_lower_string(),
+                             responsible_person_id=users[1].id, status=status, priority=TaskPriority.HIGH,
+                             assignees_ids=[users[1].id, users[2].id])
+
+    @pytest.mark.anyio
+    async def test_counters_follow_writes(self, user_repository: TestUserRepository,
+                                          task_repository: TestTaskRepository,
+                                          notification_repository: TestNotificationRepository,
+                                          users: list[UserBase]) -> None:
+        before: TaskStats = await GetTaskStatsService(users[0], task_repository).get_task_stats()
+
+        await CreateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                self.get_task(users, TaskStatus.TODO)).create_task()
+        tasks_in_progress = [self.get_task(users, TaskStatus.IN_PROGRESS) for _ in range(3)]
+        await BulkCreateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIBulkCreateTasks(tasks=tasks_in_progress)).create_tasks()
+        stats: TaskStats = await GetTaskStatsService(users[0], task_repository).get_task_stats()
+        assert stats.total == before.total + 4
+        assert stats.by_status.get(TaskStatus.IN_PROGRESS, 0) == before.by_status.get(TaskStatus.IN_PROGRESS, 0) + 3
+        assert (stats.by_responsible_person[users[1].id], stats.by_assignee[users[2].id]) == (4, 4)
+
+        task_filter = TaskFilter(assignee_id=users[2].id, status=TaskStatus.TODO)
+        await BulkUpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIBulkUpdateTasks(filter=task_filter, status=TaskStatus.DONE)).update_tasks()
+        task_id: int = (await task_repository.get_task_by({'name': tasks_in_progress[0].name})).id
+        await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                APIUpdateTask(responsible_person_id=users[2].id, assignees_ids=[users[1].id]),
+                                task_id).update_task()
+        await DeleteTaskService(users[0], user_repository, task_repository, notification_repository,
+                                task_id).delete_task()
+
+        stats = await GetTaskStatsService(users[0], task_repository).get_task_stats()
+        assert stats.total == before.total + 3
+        assert stats.by_status.get(TaskStatus.DONE, 0) == before.by_status.get(TaskStatus.DONE, 0) + 1
+        assert stats.by_status.get(TaskStatus.IN_PROGRESS, 0) == before.by_status.get(TaskStatus.IN_PROGRESS, 0) + 2
+        assert users[2].id not in stats.by_responsible_person
+        assert (stats.by_responsible_person[users[1].id], stats.by_assignee[users[2].id]) == (3, 3)
+
+        assert await RebuildTaskCountersService(task_repository).rebuild_task_counters() == stats
+
+    @pytest.mark.anyio
+    async def test_stats_of_one_user(self, user_repository: TestUserRepository,
+                                     task_repository: TestTaskRepository,
+                                     notification_repository: TestNotificationRepository,
+                                     users: list[UserBase]) -> None:
+        await CreateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                self.get_task(users, TaskStatus.TODO)).create_task()
+
+        stats: TaskStats = await GetTaskStatsService(users[0], task_repository, users[2].id).get_task_stats()
+
+        assert (stats.by_responsible_person, stats.by_assignee) == ({}, {users[2].id: 1})
+        assert stats.total >= 1 and stats.by_priority[TaskPriority.HIGH] >= 1
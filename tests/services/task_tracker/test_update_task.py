@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+
+from src.api.routes.task_tracker.dto import APIUpdateTask
+from src.db.enums import UserRole, TaskStatus, TaskPriority
+from src.db.models import Task, TaskUser, Notification
+from src.domain.auth.entities import UserBase
+from src.infrastructure.dto import UserCreate
+from src.repositories.notification.repositories import TestNotificationRepository
+from src.repositories.task.repositories import TestTaskRepository
+from src.repositories.user.repositories import TestUserRepository
+from src.services.task_tracker.dto import UpdatedTask
+from src.services.task_tracker.services import UpdateTaskService
+from src.utils import random_lower_string, random_email
+
+
+# users lookup, previous counted values, UPDATE ... RETURNING, counters upsert,
+# assignees DELETE + INSERT + counters, receivers SELECT, outbox INSERT
+UPDATE_TASK_QUERY_BUDGET = 9
+
+
+@contextmanager
+def count_statements(db_engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class TestUpdateTask:
+
+    @pytest.fixture
+    async def users(self, user_repository: TestUserRepository) -> list[UserBase]:
+        usernames = [random_lower_string() for _ in range(4)]
+        for username in usernames:
+            await user_repository.create_user(UserCreate(username=username,
+                                                         password=random_lower_string(),
+                                                         email=random_email(),
+                                                         register_at=None,
+                                                         role=UserRole.DEVELOPER))
+        return [await user_repository.get_user_by(username=username) for username in usernames]
+
+    @pytest.fixture
+    async def task(self, task_repository: TestTaskRepository, users: list[UserBase]) -> Task:
+        task = Task(name=random_lower_string(), description=random_lower_string(),
+                    responsible_person=users[0].id, status=TaskStatus.TODO, priority=TaskPriority.LOW)
+        task_repository.session.add(task)
+        await task_repository.session.flush()
+        task_repository.session.add(TaskUser(task_id=task.id, user_id=users[1].id))
+        await task_repository.session.flush()
+        return task
+
+    @pytest.mark.anyio
+    async def test_update_task_within_query_budget(self, db_engine, user_repository: TestUserRepository,
+                                                   task_repository: TestTaskRepository,
+                                                   notification_repository: TestNotificationRepository,
+                                                   users: list[UserBase], task: Task) -> None:
+        new_name = random_lower_string()
+        task_to_update = APIUpdateTask(name=new_name, status=TaskStatus.DONE, responsible_person_id=users[1].id,
+                                       assignees_ids=[users[2].id, users[3].id, -1])
+        update_task_service = UpdateTaskService(users[0], user_repository, task_repository,
+                                                notification_repository, task_to_update, task.id)
+
+        with count_statements(db_engine) as statements:
+            updated_task: UpdatedTask = await update_task_service.update_task()
+
+        assert len(statements) <= UPDATE_TASK_QUERY_BUDGET, statements
+        assert updated_task.name == new_name
+
+        assignees_ids = (await task_repository.session.execute(
+            select(TaskUser.user_id).where(TaskUser.task_id == task.id))).scalars().all()
+        assert sorted(assignees_ids) == sorted([users[2].id, users[3].id])
+
+        recipients = (await task_repository.session.execute(
+            select(Notification.recipient).where(Notification.body == f'Task: "{new_name}" updated!'))).scalars().all()
+        assert sorted(recipients) == sorted(user.email for user in users[1:])
+
+    @pytest.mark.anyio
+    async def test_update_task_with_exist_name(self, user_repository: TestUserRepository,
+                                               task_repository: TestTaskRepository,
+                                               notification_repository: TestNotificationRepository,
+                                               users: list[UserBase], task: Task) -> None:
+        other_task = Task(name=random_lower_string(), description=random_lower_string(),
+                          responsible_person=users[0].id)
+        task_repository.session.add(other_task)
+        await task_repository.session.flush()
+
+        with pytest.raises(HTTPException) as exception_info:
+            await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIUpdateTask(name=other_task.name), task.id).update_task()
+        assert exception_info.value.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_update_not_exist_task(self, user_repository: TestUserRepository,
+                                         task_repository: TestTaskRepository,
+                                         notification_repository: TestNotificationRepository,
+                                         users: list[UserBase]) -> None:
+        with pytest.raises(HTTPException) as exception_info:
+            await UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                    APIUpdateTask(status=TaskStatus.DONE), -1).update_task()
+        assert exception_info.value.status_code == 404
+
+    @pytest.mark.anyio
+    async def test_update_task_if_match(self, user_repository: TestUserRepository,
+                                        task_repository: TestTaskRepository,
+                                        notification_repository: TestNotificationRepository,
+                                        users: list[UserBase], task: Task) -> None:
+        def update_task_service(task_id: int, expected_versions: list[int]) -> UpdateTaskService:
+            return UpdateTaskService(users[0], user_repository, task_repository, notification_repository,
+                                     APIUpdateTask(status=TaskStatus.IN_PROGRESS), task_id, expected_versions)
+
+        updated_task: UpdatedTask = await update_task_service(task.id, [task.version]).update_task()
+        assert updated_task.version == task.version + 1
+
+        with pytest.raises(HTTPException) as exception_info:
+            await update_task_service(task.id, [task.version]).update_task()
+        assert exception_info.value.status_code == 412
+        assert await task_repository.get_task_version(task.id) == updated_task.version
+
+        with pytest.raises(HTTPException) as exception_info:
+            await update_task_service(-1, [1]).update_task()
+        assert exception_info.value.status_code == 404